@@ -0,0 +1,44 @@
+"""Add unique constraints on attendance (player, event) and (player, game)
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+Backs the set-based attendance initialization (INSERT ... ON CONFLICT DO
+NOTHING) and bulk upsert. Duplicate rows left behind by the old per-player
+check-then-insert loop are removed first, keeping the oldest record.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for column in ("event_id", "game_id"):
+        op.execute(f"""
+            DELETE FROM attendance
+            WHERE {column} IS NOT NULL
+              AND id NOT IN (
+                  SELECT MIN(id) FROM attendance
+                  WHERE {column} IS NOT NULL
+                  GROUP BY player_id, {column}
+              )
+        """)
+
+    op.create_unique_constraint(
+        "uq_attendance_player_event", "attendance", ["player_id", "event_id"]
+    )
+    op.create_unique_constraint(
+        "uq_attendance_player_game", "attendance", ["player_id", "game_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_attendance_player_game", "attendance", type_="unique")
+    op.drop_constraint("uq_attendance_player_event", "attendance", type_="unique")
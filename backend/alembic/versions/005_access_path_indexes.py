@@ -0,0 +1,41 @@
+"""Add indexes for the foreign keys and filters the API queries on
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+players.user_id is already covered by its unique constraint, and the
+attendance unique constraints from 004 cover lookups by player.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_players_team_id", "players", ["team_id"]),
+    ("ix_attendance_game_id", "attendance", ["game_id"]),
+    ("ix_attendance_event_id", "attendance", ["event_id"]),
+    ("ix_games_team_id_scheduled_at", "games", ["team_id", "scheduled_at"]),
+    ("ix_events_team_id_start_time", "events", ["team_id", "start_time"]),
+    ("ix_news_team_id_is_published_created_at", "news", ["team_id", "is_published", "created_at"]),
+    ("ix_parent_children_parent_id", "parent_children", ["parent_id"]),
+    ("ix_parent_children_child_id", "parent_children", ["child_id"]),
+    ("ix_user_activities_user_id_created_at", "user_activities", ["user_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
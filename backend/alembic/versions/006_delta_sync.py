@@ -0,0 +1,39 @@
+"""Add the tombstones table and attendance.updated_at for delta sync
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+Existing attendance rows take their recorded_at as updated_at.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_tombstones_deleted_at", "tombstones", ["deleted_at"])
+
+    op.add_column("attendance", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE attendance SET updated_at = COALESCE(recorded_at, CURRENT_TIMESTAMP)")
+
+
+def downgrade() -> None:
+    op.drop_column("attendance", "updated_at")
+    op.drop_index("ix_tombstones_deleted_at", table_name="tombstones")
+    op.drop_table("tombstones")
@@ -0,0 +1,32 @@
+"""Add the dashboard statistics materialized view (PostgreSQL only)
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+Read when DASHBOARD_MATERIALIZED_VIEW is enabled; the app refreshes it
+concurrently in the background. Other databases compute the counters live.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.services.dashboard_stats import create_materialized_view, drop_materialized_view
+
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        create_materialized_view(bind)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        drop_materialized_view(bind)
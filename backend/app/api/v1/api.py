@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, oauth, users, teams, players, games, events, attendance, news, parents, invitations, health, migrations, dashboard, setup
+from app.api.v1.endpoints import auth, oauth, users, teams, players, games, events, attendance, news, calendar, sync, batch, parents, invitations, health, migrations, dashboard, setup
 
 api_router = APIRouter()
 
@@ -14,6 +14,9 @@ api_router.include_router(games.router, prefix="/games", tags=["Games"])
 api_router.include_router(events.router, prefix="/events", tags=["Events"])
 api_router.include_router(attendance.router, prefix="/attendance", tags=["Attendance"])
 api_router.include_router(news.router, prefix="/news", tags=["News"])
+api_router.include_router(calendar.router, prefix="/calendar", tags=["Calendar"])
+api_router.include_router(sync.router, prefix="/sync", tags=["Sync"])
+api_router.include_router(batch.router, prefix="/batch", tags=["Batch"])
 api_router.include_router(parents.router, prefix="/parents", tags=["Parents"])
 api_router.include_router(health.router, prefix="/health", tags=["Health"])
 api_router.include_router(migrations.router, prefix="/migrations", tags=["Migrations"])
@@ -1,13 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import DateTime, and_, cast, exists, func, literal, select
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List, Optional
 
-from app.core.deps import get_db, get_current_user, require_coach_or_supervisor
+from app.core.access_scope import AccessScope, get_access_scope
+from app.core.deps import get_db, get_current_user, require_coach_or_supervisor, get_replica_db
+from app.core.domain_events import record_change
+from app.core.fieldsets import Fieldset, sparse_fields
+from app.core.pagination import paginate
+from app.db.async_session import ReadSession, get_read_db, get_read_scope, get_read_user
+from app.db.bulk import upsert_insert
 from app.models.user import User, UserRole
 from app.models.attendance import Attendance, AttendanceStatus
 from app.models.game import Game
 from app.models.event import Event
 from app.models.player import Player
+from app.models.team import Team
 from app.schemas.attendance import (
     AttendanceCreate, AttendanceUpdate, AttendanceResponse,
     AttendanceWithPlayer, BulkAttendanceUpdate
@@ -16,41 +25,53 @@ from app.schemas.common import PaginatedResponse
 
 router = APIRouter()
 
+list_fields = sparse_fields(
+    AttendanceResponse, Attendance,
+    compact=("id", "player_id", "game_id", "event_id", "status"),
+)
+
 
 @router.get("/", response_model=PaginatedResponse[AttendanceResponse])
-def get_attendance(
+async def get_attendance(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the full result set"),
+    fieldset: Optional[Fieldset] = Depends(list_fields),
     game_id: Optional[int] = None,
     event_id: Optional[int] = None,
     player_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    read_db: ReadSession = Depends(get_read_db),
+    current_user: User = Depends(get_read_user),
+    scope: AccessScope = Depends(get_read_scope)
 ):
-    query = db.query(Attendance)
-    
-    if game_id:
-        query = query.filter(Attendance.game_id == game_id)
-    
-    if event_id:
-        query = query.filter(Attendance.event_id == event_id)
-    
-    if player_id:
-        query = query.filter(Attendance.player_id == player_id)
-    
-    # Filter by role
-    if current_user.has_role(UserRole.PLAYER):
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        if current_player:
-            query = query.filter(Attendance.player_id == current_player.id)
-    elif current_user.has_role(UserRole.PARENT):
-        from app.models.parent_child import ParentChild
-        child_ids = db.query(ParentChild.child_id).filter(ParentChild.parent_id == current_user.id).subquery()
-        query = query.filter(Attendance.player_id.in_(child_ids))
-    
-    total = query.count()
-    records = query.offset(skip).limit(limit).all()
-    return {"items": records, "total": total, "skip": skip, "limit": limit}
+    def _read(db: Session):
+        query = db.query(Attendance)
+        
+        if game_id:
+            query = query.filter(Attendance.game_id == game_id)
+        
+        if event_id:
+            query = query.filter(Attendance.event_id == event_id)
+        
+        if player_id:
+            query = query.filter(Attendance.player_id == player_id)
+        
+        # Filter by role
+        if current_user.has_role(UserRole.PLAYER):
+            if scope.player_id:
+                query = query.filter(Attendance.player_id == scope.player_id)
+        elif current_user.has_role(UserRole.PARENT):
+            query = query.filter(Attendance.player_id.in_(scope.child_player_ids))
+        
+        page = paginate(
+            query, sort_key=Attendance.id, id_column=Attendance.id,
+            skip=skip, limit=limit, cursor=cursor, include_total=include_total,
+            fieldset=fieldset,
+        )
+        return page if fieldset is None else fieldset.response(page)
+
+    return await read_db.run(_read)
 
 
 @router.post("/event/{event_id}/initialize", status_code=status.HTTP_201_CREATED)
@@ -59,7 +80,12 @@ def initialize_event_attendance(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_coach_or_supervisor)
 ):
-    """Initialize attendance records for all team players for an event"""
+    """Initialize attendance records for all team players for an event.
+
+    Club-wide events (no team) initialize every player in the club. Runs as a
+    single INSERT ... SELECT that skips players who already have a record, so
+    the statement count does not grow with the roster size.
+    """
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -71,26 +97,28 @@ def initialize_event_attendance(
             if current_user.role != UserRole.ADMIN:
                 raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Get all players in the team
-    players = db.query(Player).filter(Player.team_id == event.team_id).all()
+    # Every player without a record for this event yet
+    missing_players = select(
+        Player.id,
+        literal(event_id),
+        cast(AttendanceStatus.PENDING, Attendance.status.type),
+        literal(current_user.id),
+        literal(datetime.utcnow(), DateTime()),
+    ).where(
+        ~exists().where(
+            Attendance.player_id == Player.id,
+            Attendance.event_id == event_id,
+        )
+    )
+    if event.team_id:
+        missing_players = missing_players.where(Player.team_id == event.team_id)
     
-    created_count = 0
-    for player in players:
-        # Check if record already exists
-        existing = db.query(Attendance).filter(
-            Attendance.player_id == player.id,
-            Attendance.event_id == event_id
-        ).first()
-        
-        if not existing:
-            attendance = Attendance(
-                player_id=player.id,
-                event_id=event_id,
-                status=AttendanceStatus.PENDING,
-                recorded_by=current_user.id
-            )
-            db.add(attendance)
-            created_count += 1
+    # ON CONFLICT covers a concurrent initialize racing this one
+    stmt = upsert_insert(db, Attendance).from_select(
+        ["player_id", "event_id", "status", "recorded_by", "recorded_at"],
+        missing_players,
+    ).on_conflict_do_nothing(index_elements=["player_id", "event_id"])
+    created_count = db.execute(stmt).rowcount
     
     db.commit()
     return {"message": f"Created {created_count} attendance records", "created": created_count}
@@ -147,7 +175,7 @@ def create_attendance(
 @router.get("/{attendance_id}", response_model=AttendanceWithPlayer)
 def get_attendance_record(
     attendance_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     record = db.query(Attendance).filter(Attendance.id == attendance_id).first()
@@ -217,92 +245,137 @@ def bulk_update_attendance(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_coach_or_supervisor)
 ):
-    """Bulk update attendance for multiple players"""
+    """Bulk update attendance for multiple players.
+
+    Runs as one INSERT ... ON CONFLICT DO UPDATE ... RETURNING, so a full
+    roll call costs a single round trip regardless of roster size.
+    """
     if not game_id and not event_id:
         raise HTTPException(
             status_code=400,
             detail="Either game_id or event_id must be provided"
         )
+    if game_id and event_id:
+        # The upsert conflicts on one of the two, so it cannot target both
+        raise HTTPException(
+            status_code=400,
+            detail="Provide either game_id or event_id, not both"
+        )
     
-    updated_records = []
+    # One (status, notes) per player; per-player entries override player_ids
+    updates = {pid: (bulk_data.status, bulk_data.notes) for pid in bulk_data.player_ids}
+    for entry in bulk_data.entries:
+        updates[entry.player_id] = (entry.status, entry.notes)
     
-    for player_id in bulk_data.player_ids:
-        filters = [Attendance.player_id == player_id]
-        if game_id:
-            filters.append(Attendance.game_id == game_id)
-        if event_id:
-            filters.append(Attendance.event_id == event_id)
-        record = db.query(Attendance).filter(*filters).first()
-        
-        if record:
-            record.status = bulk_data.status
-            record.notes = bulk_data.notes or record.notes
-            record.recorded_by = current_user.id
-        else:
-            # Create new record
-            record = Attendance(
-                player_id=player_id,
-                game_id=game_id,
-                event_id=event_id,
-                status=bulk_data.status,
-                notes=bulk_data.notes,
-                recorded_by=current_user.id
-            )
-            db.add(record)
-        
-        updated_records.append(record)
+    now = datetime.utcnow()
+    stmt = upsert_insert(db, Attendance).values([
+        {
+            "player_id": player_id,
+            "game_id": game_id,
+            "event_id": event_id,
+            "status": record_status,
+            "notes": notes,
+            "recorded_by": current_user.id,
+            "recorded_at": now,
+            "updated_at": now,
+        }
+        for player_id, (record_status, notes) in updates.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["player_id", "game_id" if game_id else "event_id"],
+        set_={
+            "status": stmt.excluded.status,
+            # Keep existing notes unless new ones were sent
+            "notes": func.coalesce(func.nullif(stmt.excluded.notes, ""), Attendance.notes),
+            "recorded_by": stmt.excluded.recorded_by,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    records = db.scalars(
+        stmt.returning(Attendance),
+        execution_options={"populate_existing": True},
+    ).all()
+    # Serialize before commit expires the returned rows (avoids a reload each)
+    updated_records = [AttendanceResponse.model_validate(r) for r in records]
     
+    if game_id:
+        team_id = db.query(Game.team_id).filter(Game.id == game_id).scalar()
+        record_change(db, "game_attendance", game_id, team_id)
+    else:
+        team_id = db.query(Event.team_id).filter(Event.id == event_id).scalar()
+        record_change(db, "event_attendance", event_id, team_id)
     db.commit()
     return updated_records
 
 
+SUMMARY_FIELDS = {"counts", "records", "unresponded"}
+
+
 @router.get("/event/{event_id}/summary")
 def get_event_attendance_summary(
     event_id: int,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated subset of counts,records,unresponded (default: all)",
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_coach_or_supervisor)
 ):
-    """Get attendance summary for an event (for coaches/admins)"""
-    from sqlalchemy import func
+    """Get attendance summary for an event (for coaches/admins).
+
+    Status counts are aggregated in SQL and unresponded players come from an
+    anti-join, so the cost is a fixed number of queries. Dashboards can pass
+    ``fields=counts`` to skip the per-player payloads entirely.
+    """
+    requested = SUMMARY_FIELDS if not fields else {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - SUMMARY_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {sorted(unknown)}. Allowed: {sorted(SUMMARY_FIELDS)}"
+        )
     
     # Get event info
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Get all attendance records with player info
-    attendance_records = db.query(
-        Attendance, User.first_name, User.last_name, Player.jersey_number
-    ).join(Player, Attendance.player_id == Player.id
-    ).join(User, Player.user_id == User.id
-    ).filter(Attendance.event_id == event_id).all()
+    # Status counts in one GROUP BY
+    status_counts = dict(
+        db.query(Attendance.status, func.count(Attendance.id))
+        .filter(Attendance.event_id == event_id)
+        .group_by(Attendance.status)
+        .all()
+    )
+    total = sum(status_counts.values())
+    present = status_counts.get(AttendanceStatus.PRESENT, 0)
     
-    # Get all team players (to check who hasn't responded yet)
-    team_players = []
+    # Team size (to work out who hasn't responded yet)
+    team_size = 0
     if event.team_id:
-        team_players = db.query(Player, User.first_name, User.last_name).join(
-            User, Player.user_id == User.id
-        ).filter(Player.team_id == event.team_id).all()
+        team_size = db.query(func.count(Player.id)).filter(
+            Player.team_id == event.team_id
+        ).scalar()
     
-    # Calculate summary
-    records = [r[0] for r in attendance_records]
-    total = len(records)
-    present = sum(1 for r in records if r.status == AttendanceStatus.PRESENT)
-    absent = sum(1 for r in records if r.status == AttendanceStatus.ABSENT)
-    excused = sum(1 for r in records if r.status == AttendanceStatus.EXCUSED)
-    pending = sum(1 for r in records if r.status == AttendanceStatus.PENDING)
-    
-    return {
+    summary = {
         "event_id": event_id,
         "event_title": event.title,
-        "total_players": len(team_players) if team_players else total,
+        "total_players": team_size if team_size else total,
         "responded": total,
         "present": present,
-        "absent": absent,
-        "excused": excused,
-        "pending": len(team_players) - total if team_players else pending,
-        "attendance_rate": round((present / len(team_players) * 100), 2) if team_players and len(team_players) > 0 else (round((present / total * 100), 2) if total > 0 else 0),
-        "records": [
+        "absent": status_counts.get(AttendanceStatus.ABSENT, 0),
+        "excused": status_counts.get(AttendanceStatus.EXCUSED, 0),
+        "pending": team_size - total if team_size else status_counts.get(AttendanceStatus.PENDING, 0),
+        "attendance_rate": round((present / team_size * 100), 2) if team_size else (round((present / total * 100), 2) if total > 0 else 0),
+    }
+    
+    if "records" in requested:
+        attendance_records = db.query(
+            Attendance, User.first_name, User.last_name, Player.jersey_number
+        ).join(Player, Attendance.player_id == Player.id
+        ).join(User, Player.user_id == User.id
+        ).filter(Attendance.event_id == event_id).all()
+        summary["records"] = [
             {
                 "id": r[0].id,
                 "player_id": r[0].player_id,
@@ -313,17 +386,32 @@ def get_event_attendance_summary(
                 "recorded_at": r[0].recorded_at
             }
             for r in attendance_records
-        ],
-        "unresponded": [
+        ]
+    
+    if "unresponded" in requested:
+        unresponded = []
+        if team_size:
+            # Team players without an attendance record for this event
+            unresponded = db.query(
+                Player.id, User.first_name, User.last_name, Player.jersey_number
+            ).join(User, Player.user_id == User.id
+            ).outerjoin(Attendance, and_(
+                Attendance.player_id == Player.id,
+                Attendance.event_id == event_id,
+            )).filter(
+                Player.team_id == event.team_id,
+                Attendance.id.is_(None),
+            ).all()
+        summary["unresponded"] = [
             {
-                "player_id": tp[0].id,
+                "player_id": tp[0],
                 "player_name": f"{tp[1]} {tp[2]}",
-                "jersey_number": tp[0].jersey_number
+                "jersey_number": tp[3]
             }
-            for tp in team_players
-            if tp[0].id not in [r[0].player_id for r in attendance_records]
-        ] if team_players else []
-    }
+            for tp in unresponded
+        ]
+    
+    return summary
 
 
 @router.get("/stats/player/{player_id}")
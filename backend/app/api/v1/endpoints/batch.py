@@ -0,0 +1,130 @@
+"""Batch endpoint: several GET requests in one round trip.
+
+The app start-up screen needs ``/auth/me``, the dashboard, teams, calendar,
+events and news. Sending them as one batch saves the per-request network
+latency. It also resolves the caller once: every sub-request runs through
+the normal routing stack with the batch's DB session and principal on its
+``request.state``, which ``get_db`` and ``get_current_user`` pick up.
+
+Sub-requests run one after another because they share a session, which is
+not thread-safe. Only GETs under the API prefix are allowed. Each
+sub-response carries its own status, so one failing request does not fail
+the batch; the session is rolled back after a 5xx so the next sub-request
+does not inherit an aborted transaction.
+"""
+import json
+import logging
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.deps import get_db, get_current_user
+from app.models.user import User
+from app.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+_API_PREFIX = "/api/v1/"
+_FORWARDED_HEADERS = {"if-none-match"}
+_RETURNED_HEADERS = {"etag"}
+
+
+async def _dispatch(request: Request, sub: BatchSubRequest, state: dict) -> dict:
+    url = urlsplit(sub.path)
+    headers = [(b"authorization", request.headers["authorization"].encode())]
+    headers += [
+        (name.lower().encode(), value.encode())
+        for name, value in sub.headers.items()
+        if name.lower() in _FORWARDED_HEADERS
+    ]
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.url.scheme,
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        # Each sub-request gets its own copy: route code stores per-request
+        # values (e.g. the response-cache key) on request.state
+        "state": dict(state),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    response = {"status": 500, "headers": [], "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        logger.exception("Batch sub-request %s (%s) failed", sub.id, url.path)
+        return {"id": sub.id, "status": 500, "body": {"detail": "Internal Server Error"}}
+
+    response_headers = {
+        name.decode(): value.decode()
+        for name, value in response["headers"]
+        if name.decode().lower() in _RETURNED_HEADERS
+    }
+    content_type = next(
+        (value.decode() for name, value in response["headers"] if name.lower() == b"content-type"),
+        "",
+    )
+    body = response["body"]
+    if not body:
+        parsed = None
+    elif content_type.startswith("application/json"):
+        parsed = json.loads(body)
+    else:
+        parsed = body.decode(errors="replace")
+    return {"id": sub.id, "status": response["status"], "headers": response_headers, "body": parsed}
+
+
+@router.post("/", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Run several GET requests with one session and one resolved principal"""
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} requests per batch",
+        )
+    batch_prefix = request.url.path.rstrip("/")
+    for sub in batch.requests:
+        path = urlsplit(sub.path).path
+        if not path.startswith(_API_PREFIX) or path.rstrip("/") == batch_prefix:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported batch path: {sub.path}",
+            )
+
+    state = {**request.scope.get("state", {}), "batch_db": db, "batch_user": current_user}
+    responses = []
+    for sub in batch.requests:
+        response = await _dispatch(request, sub, state)
+        if response["status"] >= 500:
+            # A failed statement aborts the shared transaction on PostgreSQL;
+            # start the next sub-request on a clean one
+            db.rollback()
+        responses.append(response)
+    return {"responses": responses}
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.core.access_scope import AccessScope, get_access_scope
+from app.core.deps import get_current_user, get_replica_db
+from app.core.permissions import can_access_team
+from app.core.response_cache import _etag_matches, _not_modified, _validator_headers
+from app.models.user import User
+from app.models.event import EventType
+from app.models.team import Team
+from app.schemas.calendar import CalendarFeed, CalendarItemKind
+from app.services import calendar as calendar_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=CalendarFeed)
+def get_calendar_feed(
+    start: Optional[datetime] = Query(None, description="Window start (default: now)"),
+    days: int = Query(30, ge=1, le=365, description="Window length from start"),
+    team_id: Optional[int] = None,
+    kind: Optional[CalendarItemKind] = Query(None, description="Only games or only events"),
+    event_type: Optional[List[EventType]] = Query(None, description="Only these event types"),
+    limit: int = Query(100, ge=1, le=500),
+    since: Optional[str] = Query(None, description="sync_token from a previous response"),
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    """Games and events in one feed, with incremental sync via ``since``"""
+    start = start or datetime.utcnow()
+    return calendar_service.calendar_feed(
+        db, current_user, scope,
+        start=start, end=start + timedelta(days=days),
+        team_id=team_id, kind=kind, event_types=event_type,
+        limit=limit, since=since,
+    )
+
+
+@router.get("/teams/{team_id}.ics", response_class=Response)
+def get_team_ics(
+    team_id: int,
+    request: Request,
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    """iCalendar export of a team's games and events"""
+    team = db.query(Team).filter(Team.id == team_id).first()
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    if not can_access_team(current_user, team_id, db, scope):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this team",
+        )
+
+    body, etag = calendar_service.team_ics(db, team)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return Response(
+        content=body,
+        media_type="text/calendar",
+        headers={**_validator_headers(etag), "Content-Disposition": f'attachment; filename="team-{team_id}.ics"'},
+    )
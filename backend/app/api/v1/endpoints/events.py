@@ -3,91 +3,107 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from app.core.deps import get_db, get_current_user, require_coach, require_coach_or_supervisor
+from app.core.access_scope import AccessScope, get_access_scope
+from app.core.deps import get_db, get_current_user, require_coach, require_coach_or_supervisor, get_replica_db
+from app.core.domain_events import record_change
+from app.core.fieldsets import Fieldset, sparse_fields
+from app.core.pagination import paginate
+from app.core.response_cache import CachedRoute, cache_response
+from app.db.async_session import ReadSession, get_read_db, get_read_scope, get_read_user
 from app.models.user import User, UserRole
 from app.models.event import Event, EventType, EventVisibility
 from app.models.team import Team
-from app.models.player import Player
 from app.schemas.event import EventCreate, EventUpdate, EventResponse, EventWithTeam
 from app.schemas.common import PaginatedResponse
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
+list_fields = sparse_fields(
+    EventResponse, Event,
+    compact=("id", "team_id", "title", "event_type", "start_time", "end_time"),
+)
 
-@router.get("/", response_model=PaginatedResponse[EventResponse])
-def get_events(
+
+@router.get("/", response_model=PaginatedResponse[EventResponse], dependencies=[
+    cache_response("events", user_dependency=get_read_user, scope_dependency=get_read_scope)
+])
+async def get_events(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the full result set"),
+    fieldset: Optional[Fieldset] = Depends(list_fields),
     team_id: Optional[int] = None,
     event_type: Optional[EventType] = None,
     visibility: Optional[EventVisibility] = None,
     upcoming: bool = Query(False),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    read_db: ReadSession = Depends(get_read_db),
+    current_user: User = Depends(get_read_user),
+    scope: AccessScope = Depends(get_read_scope)
 ):
-    from app.models.event import Event as EventModel
-    
-    query = db.query(Event)
-    
-    # Role-based filtering with visibility
-    if current_user.has_role(UserRole.PLAYER):
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        my_team_id = current_player.team_id if current_player else None
+    def _read(db: Session):
+        from app.models.event import Event as EventModel
         
-        # Players see: club-wide events + their own team events
-        if my_team_id:
-            query = query.filter(
-                ((Event.visibility == EventVisibility.CLUB_WIDE) | 
-                 ((Event.visibility == EventVisibility.TEAM) & (Event.team_id == my_team_id)))
-            )
-        else:
-            query = query.filter(Event.visibility == EventVisibility.CLUB_WIDE)
-    elif current_user.has_role(UserRole.PARENT):
-        from app.models.parent_child import ParentChild
-        child_team_ids = db.query(Player.team_id).join(
-            ParentChild, ParentChild.child_id == Player.id
-        ).filter(ParentChild.parent_id == current_user.id).distinct().subquery()
-        child_team_id_list = [tid for tid, in db.query(child_team_ids).all()]
+        query = db.query(Event)
         
-        # Parents see: club-wide events + their children's team events
-        if child_team_id_list:
-            query = query.filter(
-                ((Event.visibility == EventVisibility.CLUB_WIDE) | 
-                 ((Event.visibility == EventVisibility.TEAM) & (Event.team_id.in_(child_team_id_list))))
-            )
-        else:
-            query = query.filter(Event.visibility == EventVisibility.CLUB_WIDE)
-    elif current_user.has_role(UserRole.COACH):
-        coach_team_ids = db.query(Team.id).filter(Team.coach_id == current_user.id).subquery()
-        coach_team_id_list = [tid for tid, in db.query(coach_team_ids).all()]
+        # Role-based filtering with visibility
+        if current_user.has_role(UserRole.PLAYER):
+            my_team_id = scope.player_team_id
+            
+            # Players see: club-wide events + their own team events
+            if my_team_id:
+                query = query.filter(
+                    ((Event.visibility == EventVisibility.CLUB_WIDE) | 
+                     ((Event.visibility == EventVisibility.TEAM) & (Event.team_id == my_team_id)))
+                )
+            else:
+                query = query.filter(Event.visibility == EventVisibility.CLUB_WIDE)
+        elif current_user.has_role(UserRole.PARENT):
+            child_team_id_list = list(scope.child_team_ids)
+            
+            # Parents see: club-wide events + their children's team events
+            if child_team_id_list:
+                query = query.filter(
+                    ((Event.visibility == EventVisibility.CLUB_WIDE) | 
+                     ((Event.visibility == EventVisibility.TEAM) & (Event.team_id.in_(child_team_id_list))))
+                )
+            else:
+                query = query.filter(Event.visibility == EventVisibility.CLUB_WIDE)
+        elif current_user.has_role(UserRole.COACH):
+            coach_team_id_list = list(scope.coached_team_ids)
+            
+            # Coaches see: club-wide events + their team events
+            if coach_team_id_list:
+                query = query.filter(
+                    ((Event.visibility == EventVisibility.CLUB_WIDE) | 
+                     (Event.team_id.in_(coach_team_id_list)))
+                )
+            else:
+                query = query.filter(Event.visibility == EventVisibility.CLUB_WIDE)
+        # Admins and Supervisors see all events (no filter)
         
-        # Coaches see: club-wide events + their team events
-        if coach_team_id_list:
-            query = query.filter(
-                ((Event.visibility == EventVisibility.CLUB_WIDE) | 
-                 (Event.team_id.in_(coach_team_id_list)))
-            )
-        else:
-            query = query.filter(Event.visibility == EventVisibility.CLUB_WIDE)
-    # Admins and Supervisors see all events (no filter)
-    
-    if team_id:
-        query = query.filter(Event.team_id == team_id)
-    
-    if event_type:
-        query = query.filter(Event.event_type == event_type)
-    
-    if visibility:
-        query = query.filter(Event.visibility == visibility)
-    
-    if upcoming:
-        now = datetime.utcnow()
-        week_later = now + timedelta(days=7)
-        query = query.filter(Event.start_time >= now).filter(Event.end_time <= week_later)
-    
-    total = query.count()
-    events = query.order_by(Event.start_time).offset(skip).limit(limit).all()
-    return {"items": events, "total": total, "skip": skip, "limit": limit}
+        if team_id:
+            query = query.filter(Event.team_id == team_id)
+        
+        if event_type:
+            query = query.filter(Event.event_type == event_type)
+        
+        if visibility:
+            query = query.filter(Event.visibility == visibility)
+        
+        if upcoming:
+            now = datetime.utcnow()
+            week_later = now + timedelta(days=7)
+            query = query.filter(Event.start_time >= now).filter(Event.end_time <= week_later)
+        
+        page = paginate(
+            query, sort_key=Event.start_time, id_column=Event.id,
+            skip=skip, limit=limit, cursor=cursor, include_total=include_total,
+            fieldset=fieldset,
+        )
+        return page if fieldset is None else fieldset.response(page)
+
+    return await read_db.run(_read)
 
 
 @router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
@@ -119,16 +135,19 @@ def create_event(
     
     db_event = Event(**event_data.dict())
     db.add(db_event)
+    db.flush()
+    record_change(db, "event", db_event.id, db_event.team_id)
     db.commit()
     db.refresh(db_event)
     return db_event
 
 
-@router.get("/{event_id}", response_model=EventWithTeam)
+@router.get("/{event_id}", response_model=EventWithTeam, dependencies=[cache_response("events", "teams")])
 def get_event(
     event_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
@@ -136,15 +155,10 @@ def get_event(
     
     # Authorization
     if current_user.has_role(UserRole.PLAYER):
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        if current_player and event.team_id != current_player.team_id:
+        if scope.player_id and event.team_id != scope.player_team_id:
             raise HTTPException(status_code=403, detail="Not authorized")
     elif current_user.has_role(UserRole.PARENT):
-        from app.models.parent_child import ParentChild
-        child_team_ids = db.query(Player.team_id).join(
-            ParentChild, ParentChild.child_id == Player.id
-        ).filter(ParentChild.parent_id == current_user.id).distinct().subquery()
-        if event.team_id not in [tid for tid, in db.query(child_team_ids).all()]:
+        if event.team_id not in scope.child_team_ids:
             raise HTTPException(status_code=403, detail="Not authorized")
     
     return event
@@ -208,8 +222,9 @@ def delete_event(
 @router.get("/calendar/all", response_model=List[EventResponse])
 def get_event_calendar(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     """Get all events for calendar view with visibility filtering"""
     from app.models.event import Event as EventModel
@@ -224,8 +239,7 @@ def get_event_calendar(
     
     # Filter by role with visibility
     if current_user.has_role(UserRole.PLAYER):
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        my_team_id = current_player.team_id if current_player else None
+        my_team_id = scope.player_team_id
         
         if my_team_id:
             query = query.filter(
@@ -235,11 +249,7 @@ def get_event_calendar(
         else:
             query = query.filter(Event.visibility == EventVisibility.CLUB_WIDE)
     elif current_user.has_role(UserRole.PARENT):
-        from app.models.parent_child import ParentChild
-        child_team_ids = db.query(Player.team_id).join(
-            ParentChild, ParentChild.child_id == Player.id
-        ).filter(ParentChild.parent_id == current_user.id).distinct().subquery()
-        child_team_id_list = [tid for tid, in db.query(child_team_ids).all()]
+        child_team_id_list = list(scope.child_team_ids)
         
         if child_team_id_list:
             query = query.filter(
@@ -249,8 +259,7 @@ def get_event_calendar(
         else:
             query = query.filter(Event.visibility == EventVisibility.CLUB_WIDE)
     elif current_user.has_role(UserRole.COACH):
-        coach_team_ids = db.query(Team.id).filter(Team.coach_id == current_user.id).subquery()
-        coach_team_id_list = [tid for tid, in db.query(coach_team_ids).all()]
+        coach_team_id_list = list(scope.coached_team_ids)
         
         if coach_team_id_list:
             query = query.filter(
@@ -3,64 +3,74 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from app.core.deps import get_db, get_current_user, require_coach, require_coach_or_supervisor
+from app.core.access_scope import AccessScope, get_access_scope
+from app.core.deps import get_db, get_current_user, require_coach, require_coach_or_supervisor, get_replica_db
+from app.core.domain_events import record_change
+from app.core.fieldsets import Fieldset, sparse_fields
+from app.core.pagination import paginate
+from app.core.response_cache import CachedRoute, cache_response
+from app.db.async_session import ReadSession, get_read_db, get_read_scope, get_read_user
 from app.models.user import User, UserRole
 from app.models.game import Game, GameStatus, GameType
 from app.models.team import Team
-from app.models.player import Player
 from app.schemas.game import GameCreate, GameUpdate, GameResponse, GameWithTeam, GameResultUpdate
 from app.schemas.common import PaginatedResponse
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
+list_fields = sparse_fields(
+    GameResponse, Game,
+    compact=("id", "team_id", "opponent", "scheduled_at", "status", "is_home_game"),
+)
 
-@router.get("/", response_model=PaginatedResponse[GameResponse])
-def get_games(
+
+@router.get("/", response_model=PaginatedResponse[GameResponse], dependencies=[
+    cache_response("games", user_dependency=get_read_user, scope_dependency=get_read_scope)
+])
+async def get_games(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the full result set"),
+    fieldset: Optional[Fieldset] = Depends(list_fields),
     team_id: Optional[int] = None,
     status: Optional[GameStatus] = None,
     upcoming: bool = Query(False, description="Get only upcoming games (next 7 days)"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    read_db: ReadSession = Depends(get_read_db),
+    current_user: User = Depends(get_read_user),
+    scope: AccessScope = Depends(get_read_scope)
 ):
-    query = db.query(Game).join(Team, Game.team_id == Team.id)
-    
-    # Role-based filtering
-    if current_user.has_role(UserRole.PLAYER):
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        if current_player and current_player.team_id:
-            query = query.filter(Game.team_id == current_player.team_id)
-    elif current_user.has_role(UserRole.PARENT):
-        from app.models.parent_child import ParentChild
-        child_team_ids = db.query(Player.team_id).join(
-            ParentChild, ParentChild.child_id == Player.id
-        ).filter(ParentChild.parent_id == current_user.id).distinct().subquery()
-        query = query.filter(Game.team_id.in_(child_team_ids))
-    elif current_user.has_role(UserRole.COACH):
-        coach_team_ids = db.query(Team.id).filter(Team.coach_id == current_user.id).subquery()
-        query = query.filter(Game.team_id.in_(coach_team_ids))
-    
-    if team_id:
-        query = query.filter(Game.team_id == team_id)
-    
-    if status:
-        query = query.filter(Game.status == status)
-    
-    if upcoming:
-        now = datetime.utcnow()
-        week_later = now + timedelta(days=7)
-        query = query.filter(Game.scheduled_at >= now).filter(Game.scheduled_at <= week_later)
-    
-    total = query.count()
-    games = query.order_by(Game.scheduled_at).offset(skip).limit(limit).all()
-    
-    return {
-        "items": games,
-        "total": total,
-        "skip": skip,
-        "limit": limit
-    }
+    def _read(db: Session):
+        query = db.query(Game).join(Team, Game.team_id == Team.id)
+        
+        # Role-based filtering
+        if current_user.has_role(UserRole.PLAYER):
+            if scope.player_team_id:
+                query = query.filter(Game.team_id == scope.player_team_id)
+        elif current_user.has_role(UserRole.PARENT):
+            query = query.filter(Game.team_id.in_(scope.child_team_ids))
+        elif current_user.has_role(UserRole.COACH):
+            query = query.filter(Game.team_id.in_(scope.coached_team_ids))
+        
+        if team_id:
+            query = query.filter(Game.team_id == team_id)
+        
+        if status:
+            query = query.filter(Game.status == status)
+        
+        if upcoming:
+            now = datetime.utcnow()
+            week_later = now + timedelta(days=7)
+            query = query.filter(Game.scheduled_at >= now).filter(Game.scheduled_at <= week_later)
+        
+        page = paginate(
+            query, sort_key=Game.scheduled_at, id_column=Game.id,
+            skip=skip, limit=limit, cursor=cursor, include_total=include_total,
+            fieldset=fieldset,
+        )
+        return page if fieldset is None else fieldset.response(page)
+
+    return await read_db.run(_read)
 
 
 @router.post("/", response_model=GameResponse, status_code=status.HTTP_201_CREATED)
@@ -86,11 +96,12 @@ def create_game(
     return db_game
 
 
-@router.get("/{game_id}", response_model=GameWithTeam)
+@router.get("/{game_id}", response_model=GameWithTeam, dependencies=[cache_response("games", "teams")])
 def get_game(
     game_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     game = db.query(Game).filter(Game.id == game_id).first()
     if not game:
@@ -98,15 +109,10 @@ def get_game(
     
     # Authorization check
     if current_user.has_role(UserRole.PLAYER):
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        if current_player and game.team_id != current_player.team_id:
+        if scope.player_id and game.team_id != scope.player_team_id:
             raise HTTPException(status_code=403, detail="Not authorized")
     elif current_user.has_role(UserRole.PARENT):
-        from app.models.parent_child import ParentChild
-        child_team_ids = db.query(Player.team_id).join(
-            ParentChild, ParentChild.child_id == Player.id
-        ).filter(ParentChild.parent_id == current_user.id).distinct().subquery()
-        if game.team_id not in [tid for tid, in db.query(child_team_ids).all()]:
+        if game.team_id not in scope.child_team_ids:
             raise HTTPException(status_code=403, detail="Not authorized")
     
     return game
@@ -159,6 +165,7 @@ def update_game_result(
     game.home_score = result_data.home_score
     game.away_score = result_data.away_score
     game.status = result_data.status
+    record_change(db, "game", game.id, game.team_id)
     
     db.commit()
     db.refresh(game)
@@ -188,8 +195,9 @@ def delete_game(
 @router.get("/calendar/upcoming", response_model=List[GameResponse])
 def get_calendar(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     """Get upcoming games for calendar view"""
     now = datetime.utcnow()
@@ -202,18 +210,12 @@ def get_calendar(
     
     # Filter by role
     if current_user.has_role(UserRole.PLAYER):
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        if current_player and current_player.team_id:
-            query = query.filter(Game.team_id == current_player.team_id)
+        if scope.player_team_id:
+            query = query.filter(Game.team_id == scope.player_team_id)
     elif current_user.has_role(UserRole.PARENT):
-        from app.models.parent_child import ParentChild
-        child_team_ids = db.query(Player.team_id).join(
-            ParentChild, ParentChild.child_id == Player.id
-        ).filter(ParentChild.parent_id == current_user.id).distinct().subquery()
-        query = query.filter(Game.team_id.in_(child_team_ids))
+        query = query.filter(Game.team_id.in_(scope.child_team_ids))
     elif current_user.has_role(UserRole.COACH):
-        coach_team_ids = db.query(Team.id).filter(Team.coach_id == current_user.id).subquery()
-        query = query.filter(Game.team_id.in_(coach_team_ids))
+        query = query.filter(Game.team_id.in_(scope.coached_team_ids))
     
     games = query.order_by(Game.scheduled_at).all()
     return games
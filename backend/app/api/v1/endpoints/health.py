@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.deps import require_admin
+from app.db.pool_metrics import pool_metrics
+from app.db.session import engine, get_db
 
 router = APIRouter()
 
@@ -32,3 +34,12 @@ def readiness(db: Session = Depends(get_db)):
         "database": db_status,
         "version": settings.VERSION,
     }
+
+
+@router.get("/pool")
+def pool_status(current_user=Depends(require_admin)):
+    """Connection-pool state and checkout metrics for this worker (admin only)."""
+    return {
+        "pgbouncer_mode": settings.DB_PGBOUNCER_MODE,
+        "pool": pool_metrics.snapshot(engine.pool),
+    }
@@ -26,7 +26,7 @@ router = APIRouter()
 
 @router.post("/send", response_model=InvitationResponse)
 @limiter.limit("10/hour")
-async def send_invitation(
+def send_invitation(
     request: Request,
     invitation_data: InvitationCreate,
     background_tasks: BackgroundTasks,
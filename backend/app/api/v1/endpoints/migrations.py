@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from app.core.deps import get_db, require_admin
+from app.core.principal import principal_cache
 
 router = APIRouter()
 
@@ -32,6 +33,8 @@ def run_migrations(
             WHERE roles_data IS NULL
         """))
         db.commit()
+        # Raw UPDATE bypasses the ORM invalidation hooks
+        principal_cache.clear()
         results.append("✅ Migrated existing roles to roles_data")
     except Exception as e:
         results.append(f"⚠️ Migrate roles: {str(e)}")
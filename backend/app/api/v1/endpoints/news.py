@@ -3,64 +3,80 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import List, Optional
 
-from app.core.deps import get_db, get_current_user, require_coach_or_supervisor
+from app.core.access_scope import AccessScope, get_access_scope
+from app.core.deps import get_db, get_current_user, require_coach_or_supervisor, get_replica_db
+from app.core.domain_events import record_change
+from app.core.fieldsets import Fieldset, sparse_fields
+from app.core.pagination import paginate
+from app.core.response_cache import CachedRoute, cache_response
+from app.db.async_session import ReadSession, get_read_db, get_read_scope, get_read_user
 from app.models.user import User, UserRole
 from app.models.news import News
 from app.models.team import Team
-from app.models.player import Player
 from app.schemas.news import NewsCreate, NewsUpdate, NewsResponse, NewsWithAuthor, NewsPublish
 from app.schemas.common import PaginatedResponse
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
+list_fields = sparse_fields(
+    NewsResponse, News,
+    compact=("id", "team_id", "title", "published_at"),
+)
 
-@router.get("/", response_model=PaginatedResponse[NewsResponse])
-def get_news(
+
+@router.get("/", response_model=PaginatedResponse[NewsResponse], dependencies=[
+    cache_response("news", user_dependency=get_read_user, scope_dependency=get_read_scope)
+])
+async def get_news(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the full result set"),
+    fieldset: Optional[Fieldset] = Depends(list_fields),
     team_id: Optional[int] = None,
     only_published: bool = Query(True),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    read_db: ReadSession = Depends(get_read_db),
+    current_user: User = Depends(get_read_user),
+    scope: AccessScope = Depends(get_read_scope)
 ):
-    query = db.query(News)
-    
-    # Role-based filtering
-    if current_user.role == UserRole.PLAYER:
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        if current_player:
-            # Players see team news and global news
+    def _read(db: Session):
+        query = db.query(News)
+        
+        # Role-based filtering
+        if current_user.role == UserRole.PLAYER:
+            if scope.player_id:
+                # Players see team news and global news
+                query = query.filter(
+                    ((News.team_id == scope.player_team_id) | (News.team_id.is_(None)))
+                )
+        elif current_user.role == UserRole.PARENT:
             query = query.filter(
-                ((News.team_id == current_player.team_id) | (News.team_id.is_(None)))
+                (News.team_id.in_(scope.child_team_ids)) | (News.team_id.is_(None))
             )
-    elif current_user.role == UserRole.PARENT:
-        from app.models.parent_child import ParentChild
-        child_team_ids = db.query(Player.team_id).join(
-            ParentChild, ParentChild.child_id == Player.id
-        ).filter(ParentChild.parent_id == current_user.id).distinct().subquery()
-        query = query.filter(
-            (News.team_id.in_(child_team_ids)) | (News.team_id.is_(None))
-        )
-    elif current_user.role == UserRole.COACH:
-        # Coaches see their team news + global + their own drafts
-        coach_team_ids = db.query(Team.id).filter(Team.coach_id == current_user.id).subquery()
-        query = query.filter(
-            (News.team_id.in_(coach_team_ids)) | 
-            (News.team_id.is_(None)) |
-            (News.author_id == current_user.id)
+        elif current_user.role == UserRole.COACH:
+            # Coaches see their team news + global + their own drafts
+            query = query.filter(
+                (News.team_id.in_(scope.coached_team_ids)) | 
+                (News.team_id.is_(None)) |
+                (News.author_id == current_user.id)
+            )
+        
+        if team_id:
+            query = query.filter(News.team_id == team_id)
+        
+        if only_published and current_user.role not in [UserRole.COACH, UserRole.ADMIN, UserRole.SUPERVISOR]:
+            query = query.filter(News.is_published == True)
+        elif only_published:
+            query = query.filter(News.is_published == True)
+        
+        page = paginate(
+            query, sort_key=News.created_at, id_column=News.id, descending=True,
+            skip=skip, limit=limit, cursor=cursor, include_total=include_total,
+            fieldset=fieldset,
         )
-    
-    if team_id:
-        query = query.filter(News.team_id == team_id)
-    
-    if only_published and current_user.role not in [UserRole.COACH, UserRole.ADMIN, UserRole.SUPERVISOR]:
-        query = query.filter(News.is_published == True)
-    elif only_published:
-        query = query.filter(News.is_published == True)
-    
-    total = query.count()
-    news = query.order_by(News.created_at.desc()).offset(skip).limit(limit).all()
-    return {"items": news, "total": total, "skip": skip, "limit": limit}
+        return page if fieldset is None else fieldset.response(page)
+
+    return await read_db.run(_read)
 
 
 @router.post("/", response_model=NewsResponse, status_code=status.HTTP_201_CREATED)
@@ -90,11 +106,12 @@ def create_news(
     return db_news
 
 
-@router.get("/{news_id}", response_model=NewsWithAuthor)
+@router.get("/{news_id}", response_model=NewsWithAuthor, dependencies=[cache_response("news", "teams", "users")])
 def get_news_item(
     news_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     news = db.query(News).filter(News.id == news_id).first()
     if not news:
@@ -108,15 +125,10 @@ def get_news_item(
     # Authorization based on team visibility
     if news.team_id:
         if current_user.role == UserRole.PLAYER:
-            current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-            if current_player and news.team_id != current_player.team_id:
+            if scope.player_id and news.team_id != scope.player_team_id:
                 raise HTTPException(status_code=403, detail="Not authorized")
         elif current_user.role == UserRole.PARENT:
-            from app.models.parent_child import ParentChild
-            child_team_ids = db.query(Player.team_id).join(
-                ParentChild, ParentChild.child_id == Player.id
-            ).filter(ParentChild.parent_id == current_user.id).distinct().subquery()
-            if news.team_id not in [tid for tid, in db.query(child_team_ids).all()]:
+            if news.team_id not in scope.child_team_ids:
                 raise HTTPException(status_code=403, detail="Not authorized")
     
     return news
@@ -170,6 +182,7 @@ def publish_news(
         news.published_at = datetime.utcnow()
     else:
         news.published_at = None
+    record_change(db, "news", news.id, news.team_id)
     
     db.commit()
     db.refresh(news)
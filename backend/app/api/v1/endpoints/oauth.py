@@ -23,7 +23,7 @@ router = APIRouter()
 
 @router.post("/google", response_model=OAuthCallbackResponse)
 @limiter.limit("10/minute")
-async def google_oauth_login(
+def google_oauth_login(
     request: Request,
     oauth_request: OAuthLoginRequest,
     db: Session = Depends(get_db)
@@ -76,7 +76,7 @@ async def google_oauth_login(
 
 @router.post("/apple", response_model=OAuthCallbackResponse)
 @limiter.limit("10/minute")
-async def apple_oauth_login(
+def apple_oauth_login(
     request: Request,
     oauth_request: OAuthLoginRequest,
     db: Session = Depends(get_db)
@@ -137,7 +137,7 @@ async def apple_oauth_login(
 
 
 @router.post("/set-role")
-async def set_oauth_user_role(
+def set_oauth_user_role(
     role: UserRole,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1,15 +1,20 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
 from typing import List, Optional
 
-from app.core.deps import get_db, get_current_user, require_coach, require_admin
+from app.core.access_scope import AccessScope, get_access_scope
+from app.core.deps import get_db, get_current_user, require_coach, require_admin, get_replica_db
+from app.core.fieldsets import Fieldset, sparse_fields
+from app.core.pagination import paginate
+from app.db.async_session import ReadSession, get_read_db, get_read_scope, get_read_user
 from app.core.security import get_password_hash
 from app.models.user import User, UserRole
 from app.models.player import Player
 from app.models.team import Team
 from app.models.parent_child import ParentChild
 from app.schemas.player import PlayerCreate, PlayerUpdate, PlayerResponse, PlayerWithStats
+from app.schemas.user import UserBase
 from app.schemas.common import PaginatedResponse
 from app.services.email_service import email_service
 import secrets
@@ -19,51 +24,60 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+list_fields = sparse_fields(
+    PlayerResponse, Player,
+    compact=("id", "team_id", "jersey_number", "position", "user"),
+    relations={"user": UserBase},
+)
+
 
 @router.get("/", response_model=PaginatedResponse[PlayerResponse])
-def get_players(
+async def get_players(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the full result set"),
+    fieldset: Optional[Fieldset] = Depends(list_fields),
     team_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    read_db: ReadSession = Depends(get_read_db),
+    current_user: User = Depends(get_read_user),
+    scope: AccessScope = Depends(get_read_scope)
 ):
-    query = db.query(Player).join(User, Player.user_id == User.id)
+    def _read(db: Session):
+        query = db.query(Player)
+        if fieldset is None or "user" in fieldset:
+            # Load each player's user from the join (PlayerResponse includes it)
+            query = query.join(User, Player.user_id == User.id).options(contains_eager(Player.user))
+
+        # Role-based filtering
+        if current_user.has_role(UserRole.PLAYER):
+            # Players see themselves and teammates
+            if scope.player_team_id:
+                query = query.filter(Player.team_id == scope.player_team_id)
+        elif current_user.has_role(UserRole.PARENT):
+            # Parents see their children and their teammates
+            query = query.filter(
+                (Player.id.in_(scope.child_player_ids)) | (Player.team_id.in_(scope.child_team_ids))
+            )
+        elif current_user.has_role(UserRole.COACH):
+            # Coaches see players in their teams
+            query = query.filter(Player.team_id.in_(scope.coached_team_ids))
 
-    # Role-based filtering
-    if current_user.has_role(UserRole.PLAYER):
-        # Players see themselves and teammates
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        if current_player and current_player.team_id:
-            query = query.filter(Player.team_id == current_player.team_id)
-    elif current_user.has_role(UserRole.PARENT):
-        # Parents see their children and their teammates
-        child_ids = db.query(ParentChild.child_id).filter(ParentChild.parent_id == current_user.id).subquery()
-        child_team_ids = db.query(Player.team_id).filter(Player.id.in_(child_ids)).subquery()
-        query = query.filter(
-            (Player.id.in_(child_ids)) | (Player.team_id.in_(child_team_ids))
+        if team_id:
+            query = query.filter(Player.team_id == team_id)
+
+        page = paginate(
+            query, sort_key=Player.id, id_column=Player.id, descending=True,
+            skip=skip, limit=limit, cursor=cursor, include_total=include_total,
+            fieldset=fieldset,
         )
-    elif current_user.has_role(UserRole.COACH):
-        # Coaches see players in their teams
-        coach_team_ids = db.query(Team.id).filter(Team.coach_id == current_user.id).subquery()
-        query = query.filter(Player.team_id.in_(coach_team_ids))
+        return page if fieldset is None else fieldset.response(page)
 
-    if team_id:
-        query = query.filter(Player.team_id == team_id)
-
-    total = query.count()
-    players = query.order_by(Player.id.desc()).offset(skip).limit(limit).all()
-    
-    return {
-        "items": players,
-        "total": total,
-        "skip": skip,
-        "limit": limit
-    }
+    return await read_db.run(_read)
 
 
 @router.post("/", response_model=PlayerResponse, status_code=status.HTTP_201_CREATED)
-async def create_player(
+def create_player(
     player_data: PlayerCreate,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -167,37 +181,18 @@ async def create_player(
     return db_player
 
 
-@router.get("/{player_id}", response_model=PlayerWithStats)
-def get_player(
-    player_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    player = db.query(Player).filter(Player.id == player_id).first()
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
+def _player_detail_query(db: Session):
+    """Player query that eager-loads everything `_serialize_player_detail` reads."""
+    return db.query(Player).options(
+        joinedload(Player.user),
+        joinedload(Player.team),
+        selectinload(Player.parents).joinedload(ParentChild.parent),
+    )
 
-    # Authorization check
-    if current_user.has_role(UserRole.PLAYER):
-        # Can see themselves and teammates
-        current_player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        if current_player and player.team_id != current_player.team_id and player.id != current_player.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    elif current_user.has_role(UserRole.PARENT):
-        # Can see their children and children's teammates
-        child_ids = [pc.child_id for pc in db.query(ParentChild).filter(ParentChild.parent_id == current_user.id).all()]
-        if player.id not in child_ids:
-            child_team_ids = [db.query(Player.team_id).filter(Player.id == cid).scalar() for cid in child_ids]
-            if player.team_id not in child_team_ids:
-                raise HTTPException(status_code=403, detail="Not authorized")
-
-    # Load team name and parents
-    team = db.query(Team).filter(Team.id == player.team_id).first()
-    parents = db.query(User).join(
-        ParentChild, ParentChild.parent_id == User.id
-    ).filter(ParentChild.child_id == player_id).all()
 
-    player_data = {
+def _serialize_player_detail(player: Player) -> dict:
+    """Build the PlayerWithStats payload from an eager-loaded player."""
+    return {
         "id": player.id,
         "user_id": player.user_id,
         "team_id": player.team_id,
@@ -223,20 +218,46 @@ def get_player(
             "created_at": player.user.created_at,
             "updated_at": player.user.updated_at
         },
-        "team_name": team.name if team else None,
+        "team_name": player.team.name if player.team else None,
         "parents": [
             {
-                "id": p.id,
-                "email": p.email,
-                "first_name": p.first_name,
-                "last_name": p.last_name,
-                "phone": p.phone
+                "id": link.parent.id,
+                "email": link.parent.email,
+                "first_name": link.parent.first_name,
+                "last_name": link.parent.last_name,
+                "phone": link.parent.phone
             }
-            for p in parents
+            for link in player.parents
         ]
     }
 
-    return player_data
+
+@router.get("/{player_id}", response_model=PlayerWithStats)
+def get_player(
+    player_id: int,
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    player = _player_detail_query(db).filter(Player.id == player_id).first()
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+
+    # Authorization check
+    if current_user.has_role(UserRole.PLAYER):
+        # Can see themselves and teammates
+        if (
+            scope.player_id is not None
+            and player.team_id != scope.player_team_id
+            and player.id != scope.player_id
+        ):
+            raise HTTPException(status_code=403, detail="Not authorized")
+    elif current_user.has_role(UserRole.PARENT):
+        # Can see their children and children's teammates
+        if player.id not in scope.child_player_ids and player.team_id not in scope.child_team_ids:
+            raise HTTPException(status_code=403, detail="Not authorized")
+
+    return _serialize_player_detail(player)
 
 
 @router.put("/{player_id}", response_model=PlayerResponse)
@@ -320,7 +341,7 @@ def get_my_schedule(
 ):
     """Get logged-in player's team schedule (games and training)"""
     from app.models.game import Game
-    from app.models.event import Event
+    from app.models.event import Event, EventType
     from datetime import datetime
 
     if current_user.role != UserRole.PLAYER:
@@ -330,18 +351,18 @@ def get_my_schedule(
     if not player or not player.team_id:
         raise HTTPException(status_code=404, detail="Player or team not found")
 
-    # Get upcoming games
+    # Next 5 games and next 10 trainings, limited and filtered in SQL
     now = datetime.utcnow()
     games = db.query(Game).filter(
         Game.team_id == player.team_id,
-        Game.game_time >= now
-    ).order_by(Game.game_time).all()
+        Game.scheduled_at >= now
+    ).order_by(Game.scheduled_at).limit(5).all()
 
-    # Get upcoming training/events
-    events = db.query(Event).filter(
+    trainings = db.query(Event).filter(
         Event.team_id == player.team_id,
+        Event.event_type == EventType.TRAINING,
         Event.start_time >= now
-    ).order_by(Event.start_time).all()
+    ).order_by(Event.start_time).limit(10).all()
 
     return {
         "team_id": player.team_id,
@@ -350,11 +371,11 @@ def get_my_schedule(
             {
                 "id": g.id,
                 "opponent": g.opponent,
-                "game_time": g.game_time,
+                "game_time": g.scheduled_at,
                 "location": g.location,
-                "is_home": g.is_home
+                "is_home": g.is_home_game
             }
-            for g in games[:5]  # Limit to 5
+            for g in games
         ],
         "upcoming_training": [
             {
@@ -365,8 +386,8 @@ def get_my_schedule(
                 "end_time": e.end_time,
                 "location": e.location
             }
-            for e in events if e.event_type == "training"
-        ][:10],  # Limit to 10
+            for e in trainings
+        ],
     }
 
 
@@ -391,50 +412,9 @@ def update_my_contact_info(
         if field in allowed_fields:
             setattr(player, field, value)
 
+    player_id = player.id
     db.commit()
-    db.refresh(player)
 
-    # Return in the same format as get_player
-    team = db.query(Team).filter(Team.id == player.team_id).first()
-    parents = db.query(User).join(
-        ParentChild, ParentChild.parent_id == User.id
-    ).filter(ParentChild.child_id == player.id).all()
-
-    return {
-        "id": player.id,
-        "user_id": player.user_id,
-        "team_id": player.team_id,
-        "jersey_number": player.jersey_number,
-        "position": player.position,
-        "date_of_birth": player.date_of_birth,
-        "emergency_contact_name": player.emergency_contact_name,
-        "emergency_contact_phone": player.emergency_contact_phone,
-        "games_played": player.games_played,
-        "goals_scored": player.goals_scored,
-        "assists": player.assists,
-        "created_at": player.created_at,
-        "updated_at": player.updated_at,
-        "user": {
-            "id": player.user.id,
-            "email": player.user.email,
-            "first_name": player.user.first_name,
-            "last_name": player.user.last_name,
-            "phone": player.user.phone,
-            "role": player.user.role,
-            "is_active": player.user.is_active,
-            "is_verified": player.user.is_verified,
-            "created_at": player.user.created_at,
-            "updated_at": player.user.updated_at
-        },
-        "team_name": team.name if team else None,
-        "parents": [
-            {
-                "id": p.id,
-                "email": p.email,
-                "first_name": p.first_name,
-                "last_name": p.last_name,
-                "phone": p.phone
-            }
-            for p in parents
-        ]
-    }
+    # Reload with the relationships get_player serializes
+    player = _player_detail_query(db).filter(Player.id == player_id).one()
+    return _serialize_player_detail(player)
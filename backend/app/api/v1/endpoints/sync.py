@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.access_scope import AccessScope, get_access_scope
+from app.core.deps import get_db, get_current_user
+from app.models.user import User
+from app.schemas.sync import SyncEntity, SyncResponse
+from app.services import sync as sync_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SyncResponse)
+def get_changes(
+    since: Optional[str] = Query(None, description="sync_token from the previous sync"),
+    entity: Optional[List[SyncEntity]] = Query(None, description="Only these entities (default: all)"),
+    # Always the primary: a lagging replica could hide changes older than the token
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    """Created/updated and deleted ids per entity since the last sync"""
+    entities = [e.value for e in entity] if entity else [e.value for e in SyncEntity]
+    return sync_service.changes_since(db, current_user, scope, since, entities)
@@ -2,7 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.core.deps import get_db, get_current_user, require_admin, require_coach, require_coach_or_supervisor
+from app.core.deps import get_db, get_current_user, require_admin, require_coach, require_coach_or_supervisor, get_replica_db
+from app.core.fieldsets import Fieldset, sparse_fields
+from app.core.pagination import paginate
+from app.core.response_cache import CachedRoute, cache_response
+from app.core.access_scope import AccessScope, get_access_scope
 from app.core.permissions import can_access_team
 from app.models.user import User, UserRole
 from app.models.team import Team
@@ -11,19 +15,29 @@ from app.models.game import Game
 from app.models.event import Event
 from app.models.news import News
 from app.models.invitation import Invitation
+from app.services.sync import record_bulk_deletions
 from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse, TeamWithPlayers
 from app.schemas.common import PaginatedResponse
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+list_fields = sparse_fields(
+    TeamResponse, Team,
+    compact=("id", "name", "age_group"),
+)
 
 
 @router.get("/", response_model=PaginatedResponse[TeamResponse])
 def get_teams(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the full result set"),
+    fieldset: Optional[Fieldset] = Depends(list_fields),
     age_group: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     query = db.query(Team)
     
@@ -36,31 +50,24 @@ def get_teams(
         query = query.filter(Team.coach_id == current_user.id)
     elif current_user.has_role(UserRole.PLAYER):
         # Players see only their team
-        player = db.query(Player).filter(Player.user_id == current_user.id).first()
-        if player and player.team_id:
-            query = query.filter(Team.id == player.team_id)
+        if scope.player_team_id:
+            query = query.filter(Team.id == scope.player_team_id)
         else:
             # Player not assigned to any team - show empty list or all teams for discovery
             # For now, show all teams so they can find a team to join
             pass
     elif current_user.has_role(UserRole.PARENT):
         # Parents see teams of their children
-        from app.models.parent_child import ParentChild
-        child_player_ids = db.query(ParentChild.child_id).filter(ParentChild.parent_id == current_user.id).subquery()
-        child_team_ids = db.query(Player.team_id).filter(Player.id.in_(child_player_ids)).subquery()
-        query = query.filter(Team.id.in_(child_team_ids))
+        query = query.filter(Team.id.in_(scope.child_team_ids))
     if age_group:
         query = query.filter(Team.age_group == age_group)
 
-    total = query.count()
-    teams = query.offset(skip).limit(limit).all()
-
-    return {
-        "items": teams,
-        "total": total,
-        "skip": skip,
-        "limit": limit
-    }
+    page = paginate(
+        query, sort_key=Team.id, id_column=Team.id,
+        skip=skip, limit=limit, cursor=cursor, include_total=include_total,
+        fieldset=fieldset,
+    )
+    return page if fieldset is None else fieldset.response(page)
 
 
 @router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
@@ -82,11 +89,12 @@ def create_team(
     return db_team
 
 
-@router.get("/{team_id}", response_model=TeamWithPlayers)
+@router.get("/{team_id}", response_model=TeamWithPlayers, dependencies=[cache_response("teams", "players", "users")])
 def get_team(
     team_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     from sqlalchemy.orm import joinedload
     team = db.query(Team).options(
@@ -94,7 +102,7 @@ def get_team(
     ).filter(Team.id == team_id).first()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    if not can_access_team(current_user, team_id, db):
+    if not can_access_team(current_user, team_id, db, scope):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this team",
@@ -146,8 +154,11 @@ def delete_team(
     if current_user.role == UserRole.COACH and team.coach_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this team")
 
-    # Handle related records before deleting team
+    # Handle related records before deleting team; bulk deletes skip the
+    # ORM delete events, so tombstone those rows for delta sync first
     db.query(Player).filter(Player.team_id == team_id).update({"team_id": None})
+    for model in (Game, Event, News):
+        record_bulk_deletions(db, model, model.team_id == team_id)
     db.query(Game).filter(Game.team_id == team_id).delete()
     db.query(Event).filter(Event.team_id == team_id).delete()
     db.query(News).filter(News.team_id == team_id).delete()
@@ -4,7 +4,9 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 
 from app.core import security
-from app.core.deps import get_db, get_current_user, require_admin, require_coach
+from app.core.deps import get_db, get_current_user, require_admin, require_coach, get_replica_db
+from app.core.fieldsets import Fieldset, sparse_fields
+from app.core.pagination import paginate
 from app.models.user import User, UserRole
 from app.models.player import Player
 from app.models.user_activity import UserActivity
@@ -13,26 +15,32 @@ from app.schemas.common import PaginatedResponse
 
 router = APIRouter()
 
+list_fields = sparse_fields(
+    UserResponse, User,
+    compact=("id", "first_name", "last_name", "role"),
+)
+
 
 @router.get("/", response_model=PaginatedResponse[UserResponse])
 def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Set to false to skip counting the full result set"),
+    fieldset: Optional[Fieldset] = Depends(list_fields),
     role: Optional[UserRole] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(require_coach)
 ):
     query = db.query(User)
     if role:
         query = query.filter(User.role == role)
-    total = query.count()
-    users = query.offset(skip).limit(limit).all()
-    return {
-        "items": users,
-        "total": total,
-        "skip": skip,
-        "limit": limit
-    }
+    page = paginate(
+        query, sort_key=User.id, id_column=User.id,
+        skip=skip, limit=limit, cursor=cursor, include_total=include_total,
+        fieldset=fieldset,
+    )
+    return page if fieldset is None else fieldset.response(page)
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -98,7 +106,7 @@ def get_my_activity(
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     user = db.query(User).filter(User.id == user_id).first()
@@ -0,0 +1,153 @@
+"""Per-user access scope shared by the role-filtered endpoints.
+
+Every list endpoint used to rebuild the caller's team memberships with its
+own ``Player`` / ``ParentChild`` / ``Team.coach_id`` subqueries. The
+``AccessScope`` resolves those relationships once, is cached per user, and is
+injected with ``Depends(get_access_scope)`` so FastAPI resolves it at most
+once per request.
+
+The scope only records *facts* (which player profile, which children, which
+coached teams). Role checks stay in the endpoints, so the existing per-role
+visibility rules are unchanged.
+"""
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, List, Optional
+
+from fastapi import Depends
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.db.session import get_db, primary_reads
+from app.models.user import User
+from app.models.player import Player
+from app.models.team import Team
+from app.models.parent_child import ParentChild
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    user_id: int
+    # The caller's own player profile (if any) and its team
+    player_id: Optional[int] = None
+    player_team_id: Optional[int] = None
+    # Players linked to the caller as a parent, and the teams they play in
+    child_player_ids: FrozenSet[int] = frozenset()
+    child_team_ids: FrozenSet[int] = frozenset()
+    # Teams the caller is the coach of
+    coached_team_ids: FrozenSet[int] = frozenset()
+
+    @property
+    def visible_team_ids(self) -> FrozenSet[int]:
+        """Union of every team the caller is related to."""
+        own = {self.player_team_id} if self.player_team_id is not None else set()
+        return frozenset(own) | self.child_team_ids | self.coached_team_ids
+
+
+scope_cache = TTLCache(
+    maxsize=settings.ACCESS_SCOPE_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_SCOPE_CACHE_TTL_SECONDS,
+)
+
+_PENDING_KEY = "access_scope_invalidation"
+
+# Called after a commit that changed memberships, e.g. to re-authorize open
+# WebSocket subscriptions
+_invalidation_listeners: List[Callable[[], None]] = []
+
+
+def add_invalidation_listener(listener: Callable[[], None]) -> None:
+    """Call ``listener()`` after every commit that invalidated the scopes."""
+    _invalidation_listeners.append(listener)
+
+
+def resolve_access_scope(user: User, db: Session) -> AccessScope:
+    """Return the cached scope for ``user``, resolving it on a miss."""
+    scope = scope_cache.get(user.id)
+    if scope is not None:
+        return scope
+
+    # The scope is cached for every later request, so never resolve it from a
+    # replica that may not have the membership write that cleared the cache
+    with primary_reads(db):
+        own = db.query(Player.id, Player.team_id).filter(Player.user_id == user.id).first()
+        children = (
+            db.query(Player.id, Player.team_id)
+            .join(ParentChild, ParentChild.child_id == Player.id)
+            .filter(ParentChild.parent_id == user.id)
+            .all()
+        )
+        coached = db.query(Team.id).filter(Team.coach_id == user.id).all()
+
+    scope = AccessScope(
+        user_id=user.id,
+        player_id=own.id if own else None,
+        player_team_id=own.team_id if own else None,
+        child_player_ids=frozenset(pid for pid, _ in children),
+        child_team_ids=frozenset(tid for _, tid in children if tid is not None),
+        coached_team_ids=frozenset(tid for tid, in coached),
+    )
+    scope_cache.set(user.id, scope)
+    return scope
+
+
+def get_access_scope(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> AccessScope:
+    return resolve_access_scope(current_user, db)
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+#
+# Membership changes are rare compared to reads, so any write that can move a
+# user in or out of a team drops the whole cache instead of working out which
+# parents / coaches / players are affected.
+# ---------------------------------------------------------------------------
+
+
+def _invalidate(target) -> None:
+    scope_cache.clear()
+    session = object_session(target)
+    if session is not None:
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Player, "after_insert")
+@event.listens_for(Player, "after_delete")
+@event.listens_for(ParentChild, "after_insert")
+@event.listens_for(ParentChild, "after_update")
+@event.listens_for(ParentChild, "after_delete")
+@event.listens_for(Team, "after_insert")
+@event.listens_for(Team, "after_delete")
+def _on_membership_write(mapper, connection, target):
+    _invalidate(target)
+
+
+@event.listens_for(Player, "after_update")
+def _on_player_update(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.team_id.history.has_changes() or state.attrs.user_id.history.has_changes():
+        _invalidate(target)
+
+
+@event.listens_for(Team, "after_update")
+def _on_team_update(mapper, connection, target):
+    if inspect(target).attrs.coach_id.history.has_changes():
+        _invalidate(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop(_PENDING_KEY, False):
+        scope_cache.clear()
+        for listener in _invalidation_listeners:
+            listener()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
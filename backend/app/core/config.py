@@ -14,6 +14,33 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "postgresql://postgres:postgres@db:5432/handball_manager"
+    # Connection pool (PostgreSQL). Each worker holds up to
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Behind PgBouncer (transaction pooling) / on serverless: no app-side pool
+    # (NullPool) and no server-side prepared statements.
+    DB_PGBOUNCER_MODE: bool = False
+    # Comma-separated read-replica URLs. GET list/detail endpoints and the
+    # dashboard read from them round-robin; writes stay on DATABASE_URL.
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_HEALTH_CHECK_SECONDS: int = 15
+    DB_REPLICA_RETRY_SECONDS: int = 30
+    # After a write, the user reads from the primary for this long. The
+    # marker is shared through Redis when REDIS_URL is set; without Redis it
+    # is per process, so a follow-up request served by another worker or
+    # instance may still read a lagging replica.
+    DB_REPLICA_STICKY_SECONDS: int = 5
+    # Threads for blocking DB calls made from async code (WebSocket handler).
+    # Keep it at or below the connection pool size (pool_size + max_overflow).
+    DB_EXECUTOR_MAX_WORKERS: int = 10
+    # Opt-in async engine for the hot read endpoints (see app.db.async_session).
+    # ASYNC_DATABASE_URL defaults to DATABASE_URL with the asyncpg driver.
+    ASYNC_DATABASE_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
 
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -40,6 +67,42 @@ class Settings(BaseSettings):
     # Redis (for caching and WebSocket pub/sub in production)
     REDIS_URL: Optional[str] = None
 
+    # WebSocket clients that cannot accept a message within this many seconds
+    # are disconnected instead of holding up the broadcast.
+    WEBSOCKET_SEND_TIMEOUT_SECONDS: float = 5.0
+
+    # Principal cache: authenticated users resolved by get_current_user are
+    # cached per worker, keyed by JWT subject. A TTL of 0 disables the cache.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
+
+    # Access-scope cache: per-user team memberships used for role filtering.
+    ACCESS_SCOPE_CACHE_TTL_SECONDS: int = 60
+    ACCESS_SCOPE_CACHE_MAX_SIZE: int = 4096
+
+    # Dashboard statistics are served from a per-worker snapshot that is
+    # recomputed at most every DASHBOARD_SNAPSHOT_TTL_SECONDS (0 disables).
+    # On PostgreSQL the snapshot can be read from a materialized view (created
+    # by migration 007) that one worker at a time refreshes concurrently, at
+    # most every DASHBOARD_MATERIALIZED_VIEW_REFRESH_SECONDS.
+    DASHBOARD_SNAPSHOT_TTL_SECONDS: int = 30
+    DASHBOARD_MATERIALIZED_VIEW: bool = False
+    DASHBOARD_MATERIALIZED_VIEW_REFRESH_SECONDS: int = 60
+
+    # HTTP response cache (ETag / 304) for the hot GET endpoints. Entries are
+    # invalidated by commits touching their tables; the TTL bounds responses
+    # that depend on the clock. Uses Redis when REDIS_URL is set. 0 disables.
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    RESPONSE_CACHE_MAX_SIZE: int = 2048
+
+    # Rendered team .ics exports, re-rendered after any write to games,
+    # events or teams.
+    CALENDAR_ICS_CACHE_TTL_SECONDS: int = 300
+    CALENDAR_ICS_CACHE_MAX_SIZE: int = 256
+
+    # Maximum number of sub-requests in one POST /batch/ call.
+    BATCH_MAX_REQUESTS: int = 20
+
     # OAuth (optional)
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
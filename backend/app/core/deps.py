@@ -1,40 +1,84 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.db.session import get_db
+from app.db.session import get_db, primary_reads, recent_writers, replica_router
 from app.core.security import decode_token
+from app.core.principal import cache_principal, load_cached_principal
 from app.models.user import User, UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def token_subject(token: str) -> str:
+    """The email an access token was issued for; raises 401 otherwise."""
     payload = decode_token(token)
     if payload is None or payload.get("type") != "access":
-        raise credentials_exception
+        raise _credentials_exception()
     
     email: Optional[str] = payload.get("sub")
     if email is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
+        raise _credentials_exception()
+    return email
+
+
+def load_active_user(db: Session, email: str) -> User:
+    """The active user behind ``email``, from the principal cache if possible."""
+    user = load_cached_principal(email, db)
+    if user is None:
+        with primary_reads(db):
+            user = db.query(User).filter(User.email == email).first()
+        if user is not None and user.is_active:
+            cache_principal(user)
     if user is None or not user.is_active:
-        raise credentials_exception
+        raise _credentials_exception()
     
+    # Lets commits on this session mark the user as a recent writer
+    db.info["user_id"] = user.id
     return user
 
 
+def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    # Sub-requests of a batch reuse the principal the batch resolved
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return batch_user
+
+    return load_active_user(db, token_subject(token))
+
+
+def get_replica_db(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Session:
+    """Request session for read-only endpoints: SELECTs may go to a replica.
+
+    Users who wrote recently stay on the primary (read-your-writes), and so
+    does a response-cache miss, whose response is stored for other requests.
+    """
+    filling_cache = getattr(request.state, "response_cache_key", None) is not None
+    if replica_router.enabled and not filling_cache and recent_writers.get(current_user.id) is None:
+        db.info["use_replica"] = True
+    else:
+        # A batch shares one session between sub-requests; reset the flag
+        db.info.pop("use_replica", None)
+    return db
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
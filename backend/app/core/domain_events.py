@@ -0,0 +1,63 @@
+"""Post-commit change notifications pushed to WebSocket subscribers.
+
+Mutating endpoints call ``record_change`` with the entity they touched. The
+change is kept on the session and only published once the transaction
+commits (a rollback drops it), as a compact message clients can use to
+invalidate exactly what changed instead of polling:
+
+    {"type": "change", "entity": "game", "id": 12, "team_id": 3, "version": 1718...}
+
+``version`` is the change time in epoch milliseconds. Changes without a team
+(club-wide events and news) go to every connected client.
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.websocket.manager import manager
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "domain_changes"
+
+
+def record_change(db: Session, entity: str, entity_id: int, team_id: Optional[int]) -> None:
+    """Queue a change notification to publish when ``db`` commits."""
+    db.info.setdefault(_PENDING_KEY, []).append({
+        "type": "change",
+        "entity": entity,
+        "id": entity_id,
+        "team_id": team_id,
+        "version": time.time_ns() // 1_000_000,
+    })
+
+
+async def publish_change(change: dict) -> None:
+    if change["team_id"] is None:
+        await manager.broadcast(change)
+    else:
+        await manager.broadcast_to_team(change, change["team_id"])
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes:
+        return
+    # Sync endpoints commit on a threadpool worker; hand the sends to the
+    # event loop the WebSocket manager runs on.
+    loop = manager.loop
+    if loop is None or loop.is_closed():
+        logger.debug("No running WebSocket manager; dropping %d change(s)", len(changes))
+        return
+    for change in changes:
+        asyncio.run_coroutine_threadsafe(publish_change(change), loop)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,100 @@
+"""Sparse fieldsets (``fields=``) and ``compact=true`` for list endpoints.
+
+List responses serialize every column of every row, e.g. a player page
+carries emergency contacts, stats and timestamps that a roster dropdown
+never shows. With ``fields=id,jersey_number,position`` (or the endpoint's
+``compact`` set) ``paginate`` loads only those columns via ``load_only`` and
+the endpoint returns the trimmed rows with ``Fieldset.response``, a ready
+``JSONResponse`` that FastAPI does not validate against the full response
+model.
+
+Only column attributes of the response schema (plus an endpoint's declared
+relations) can be selected. ``id`` is always included.
+"""
+from typing import Callable, Dict, Iterable, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query as ORMQuery, load_only
+
+
+class Fieldset:
+    """The attributes one request asked for."""
+
+    def __init__(self, model, columns: Tuple[str, ...], relations: Dict[str, Type[BaseModel]]):
+        self.model = model
+        self.columns = columns
+        self.relations = relations
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns or name in self.relations
+
+    def apply(self, query: ORMQuery, *required) -> ORMQuery:
+        """Restrict ``query`` to the selected columns plus ``required`` ones."""
+        columns = [getattr(self.model, name) for name in self.columns]
+        columns += [column for column in required if column.key not in self.columns]
+        return query.options(load_only(*columns))
+
+    def dump(self, row) -> dict:
+        item = {name: getattr(row, name) for name in self.columns}
+        for name, schema in self.relations.items():
+            related = getattr(row, name)
+            if related is not None:
+                related = schema.model_validate(related, from_attributes=True).model_dump()
+            item[name] = related
+        return item
+
+    def response(self, page: dict) -> JSONResponse:
+        page = {**page, "items": [self.dump(row) for row in page["items"]]}
+        return JSONResponse(content=jsonable_encoder(page))
+
+
+def sparse_fields(
+    schema: Type[BaseModel],
+    model,
+    *,
+    compact: Iterable[str],
+    relations: Optional[Dict[str, Type[BaseModel]]] = None,
+) -> Callable[..., Optional[Fieldset]]:
+    """Build the ``fields``/``compact`` dependency for a list endpoint.
+
+    ``relations`` maps relationship names the schema nests (e.g. a player's
+    ``user``) to the schema they are serialized with. The dependency yields
+    None when neither parameter is given, i.e. the full response.
+    """
+    relations = relations or {}
+    mapped = {attr.key for attr in inspect(model).column_attrs}
+    selectable = [name for name in schema.model_fields if name in mapped or name in relations]
+    compact = tuple(compact)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return: " + ", ".join(selectable)
+        ),
+        compact_mode: bool = Query(
+            False, alias="compact", description="Return only " + ", ".join(compact)
+        ),
+    ) -> Optional[Fieldset]:
+        if fields is not None:
+            names = [name.strip() for name in fields.split(",") if name.strip()]
+        elif compact_mode:
+            names = list(compact)
+        else:
+            return None
+
+        unknown = sorted(set(names) - set(selectable))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}",
+            )
+        # Keep the schema's field order so responses are stable
+        requested = {"id", *names}
+        columns = tuple(n for n in selectable if n in requested and n not in relations)
+        chosen = {n: relations[n] for n in selectable if n in requested and n in relations}
+        return Fieldset(model, columns, chosen)
+
+    return dependency
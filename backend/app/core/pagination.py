@@ -0,0 +1,103 @@
+"""Offset and keyset (cursor) pagination for list endpoints.
+
+Every ``PaginatedResponse`` endpoint funnels its filtered query through
+``paginate``. Callers keep the classic ``skip``/``limit`` behaviour by
+default; passing the ``next_cursor`` of a previous page switches to keyset
+pagination, which seeks directly past the last row instead of scanning and
+discarding ``skip`` rows. ``include_total=false`` additionally skips the
+``COUNT(*)`` so infinite-scroll clients page in O(limit).
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from app.core.fieldsets import Fieldset
+
+
+def encode_cursor(value: Any, row_id: int) -> str:
+    """Build an opaque cursor from the sort-key value and row id."""
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key) -> Tuple[Any, int]:
+    """Inverse of ``encode_cursor``; raises 400 on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        python_type = sort_key.type.python_type
+        if value is not None and python_type in (datetime, date):
+            value = python_type.fromisoformat(value)
+        return value, int(row_id)
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def paginate(
+    query: Query,
+    *,
+    sort_key,
+    id_column,
+    descending: bool = False,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fieldset: Optional[Fieldset] = None,
+) -> dict:
+    """Order ``query`` by (sort_key, id) and return one page as a response dict.
+
+    ``id_column`` is the tie-breaker that makes the order total, so a cursor
+    always identifies a unique position. When ``cursor`` is given ``skip`` is
+    ignored. ``next_cursor`` is set whenever more rows follow this page.
+
+    With a ``fieldset`` only its columns (and the keyset columns) are loaded;
+    the caller turns the page into a response with ``fieldset.response``.
+    """
+    total = query.count() if include_total else None
+    if fieldset is not None:
+        query = fieldset.apply(query, sort_key, id_column)
+
+    is_id_sort = sort_key is id_column
+    if cursor is not None:
+        value, last_id = decode_cursor(cursor, sort_key)
+        if descending:
+            after_id = id_column < last_id
+            after_key = sort_key < value
+        else:
+            after_id = id_column > last_id
+            after_key = sort_key > value
+        if is_id_sort:
+            query = query.filter(after_id)
+        else:
+            query = query.filter(or_(after_key, and_(sort_key == value, after_id)))
+        skip = 0
+
+    columns = [sort_key] if is_id_sort else [sort_key, id_column]
+    order = [c.desc() for c in columns] if descending else columns
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.order_by(*order).offset(skip).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_key.key), getattr(last, id_column.key))
+
+    return {
+        "items": rows,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+    }
@@ -1,11 +1,16 @@
 """Reusable role-based authorization dependencies."""
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from app.core.access_scope import AccessScope, resolve_access_scope
 from app.core.deps import get_current_user
 from app.models.user import User, UserRole
 
 
-def can_access_team(user: User, team_id: int, db: Session) -> bool:
+def can_access_team(
+    user: User, team_id: int, db: Session, scope: Optional[AccessScope] = None
+) -> bool:
     """Return True if ``user`` may access the team ``team_id``.
 
     Mirrors the role-based filtering applied by ``GET /teams/`` so that the
@@ -22,37 +27,24 @@ def can_access_team(user: User, team_id: int, db: Session) -> bool:
     with no team assignment is NOT granted blanket access to all teams here:
     the "discovery" allowance is acceptable for a filtered list but would be a
     data leak on a by-id detail lookup.
-    """
-    from app.models.team import Team
-    from app.models.player import Player
-    from app.models.parent_child import ParentChild
 
+    Memberships come from the caller's ``AccessScope``; pass ``scope`` when
+    the caller already resolved it to skip the cache lookup.
+    """
     if user.has_role(UserRole.ADMIN) or user.has_role(UserRole.SUPERVISOR):
         return True
 
-    if user.has_role(UserRole.COACH):
-        team = db.query(Team).filter(Team.id == team_id).first()
-        if team and team.coach_id == user.id:
-            return True
-
-    if user.has_role(UserRole.PLAYER):
-        player = db.query(Player).filter(Player.user_id == user.id).first()
-        if player and player.team_id == team_id:
-            return True
-
-    if user.has_role(UserRole.PARENT):
-        child_player_ids = (
-            db.query(ParentChild.child_id)
-            .filter(ParentChild.parent_id == user.id)
-            .subquery()
-        )
-        match = (
-            db.query(Player.id)
-            .filter(Player.id.in_(child_player_ids), Player.team_id == team_id)
-            .first()
-        )
-        if match:
-            return True
+    if scope is None:
+        scope = resolve_access_scope(user, db)
+
+    if user.has_role(UserRole.COACH) and team_id in scope.coached_team_ids:
+        return True
+
+    if user.has_role(UserRole.PLAYER) and scope.player_team_id == team_id:
+        return True
+
+    if user.has_role(UserRole.PARENT) and team_id in scope.child_team_ids:
+        return True
 
     return False
 
@@ -0,0 +1,88 @@
+"""Per-worker cache of authenticated principals.
+
+``get_current_user`` resolves the JWT subject (the user's email) to a User on
+every authenticated request. The cache keeps a snapshot of the user's column
+values keyed by that subject, so a hit rebuilds a session-bound User without
+touching the users table.
+
+Entries are dropped whenever the ORM writes the row (profile updates, role
+changes, password changes, deactivation), both at flush time and again after
+commit so a concurrent request cannot re-cache the pre-commit row. Other
+workers only see such changes once their own entry expires, which bounds
+staleness to ``PRINCIPAL_CACHE_TTL_SECONDS``.
+"""
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+_USER_COLUMNS = tuple(attr.key for attr in inspect(User).column_attrs)
+_PENDING_KEY = "principal_invalidations"
+
+# Called with the affected emails after a commit that wrote users
+_invalidation_listeners: List[Callable[[Set[str]], None]] = []
+
+
+def cache_principal(user: User) -> None:
+    """Store a column snapshot of ``user`` under its JWT subject."""
+    principal_cache.set(user.email, {key: getattr(user, key) for key in _USER_COLUMNS})
+
+
+def load_cached_principal(email: str, db: Session) -> Optional[User]:
+    """Return the cached user for ``email`` attached to ``db``, or None.
+
+    The snapshot is rebuilt as a detached instance and merged with
+    ``load=False``, which attaches it to the request session without emitting
+    a SELECT. Lazy relationships and writes then behave exactly as they do for
+    a freshly queried user.
+    """
+    snapshot = principal_cache.get(email)
+    if snapshot is None:
+        return None
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def invalidate_principal(email: str) -> None:
+    principal_cache.delete(email)
+
+
+def add_invalidation_listener(listener: Callable[[Set[str]], None]) -> None:
+    """Call ``listener(emails)`` after every commit that wrote those users."""
+    _invalidation_listeners.append(listener)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_write(mapper, connection, target):
+    emails = {target.email, *inspect(target).attrs.email.history.deleted}
+    for email in emails:
+        invalidate_principal(email)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).update(emails)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    emails = session.info.pop(_PENDING_KEY, set())
+    for email in emails:
+        invalidate_principal(email)
+    if emails:
+        for listener in _invalidation_listeners:
+            listener(emails)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,348 @@
+"""HTTP response cache with strong ETags for the hot GET endpoints.
+
+Cached routes declare the tables their response is built from:
+
+    router = APIRouter(route_class=CachedRoute)
+
+    @router.get("/", dependencies=[cache_response("games")])
+
+The ``cache_response`` dependency runs after the caller's principal and
+access scope are resolved (both cached themselves) and looks the response up
+under the request path, query string, the caller's user / roles / scope and
+the current version of each table. On a hit the endpoint never runs: the
+stored body is returned, or ``304 Not Modified`` when ``If-None-Match``
+already carries its ETag. On a miss ``CachedRoute`` stores the serialized
+200 response after the endpoint returns.
+
+Invalidation is by version: every commit that wrote to a table bumps that
+table's version, so keys built before the write are simply never looked up
+again and age out of the LRU / TTL. Responses that depend on the clock (e.g.
+``upcoming=true``) are bounded by ``RESPONSE_CACHE_TTL_SECONDS``.
+
+The in-process backend only sees writes made by its own worker; with
+``REDIS_URL`` set, entries and table versions are shared through Redis.
+"""
+import abc
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from fastapi import Depends, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.access_scope import AccessScope, get_access_scope
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_STATE_KEY = "response_cache_key"
+_PENDING_KEY = "response_cache_tables"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    media_type: Optional[str] = None
+
+
+class ResponseCacheBackend(abc.ABC):
+    """Stores serialized responses and per-table write versions."""
+
+    enabled = True
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """The stored response for ``key``, or None."""
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """Store ``entry`` under ``key``."""
+
+    @abc.abstractmethod
+    def versions(self, tables: Sequence[str]) -> List[int]:
+        """Current write version of each table, in order."""
+
+    @abc.abstractmethod
+    def bump(self, tables: Iterable[str]) -> None:
+        """Advance the version of each table after a write."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop every entry and version."""
+
+
+class MemoryResponseCache(ResponseCacheBackend):
+    """Per-worker LRU; only this worker's commits invalidate it."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: dict = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._entries.enabled
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        self._entries.set(key, entry)
+
+    def versions(self, tables: Sequence[str]) -> List[int]:
+        return [self._versions.get(table, 0) for table in tables]
+
+    def bump(self, tables: Iterable[str]) -> None:
+        for table in tables:
+            # Only ever compared for equality, so a lost race between two
+            # threads still leaves the version changed
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._versions.clear()
+
+
+class RedisResponseCache(ResponseCacheBackend):
+    """Entries and table versions shared by every worker through Redis.
+
+    Redis errors are logged and treated as a miss, so an outage degrades to
+    uncached responses instead of failing requests.
+    """
+
+    def __init__(self, url: str, ttl: float, prefix: str = "handball:http:"):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._error = redis.RedisError
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = self._redis.get(self.prefix + key)
+        except self._error as exc:
+            logger.warning("Response cache read failed: %s", exc)
+            return None
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CachedResponse(data["body"].encode(), data["etag"], data["media_type"])
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        raw = json.dumps({
+            "body": entry.body.decode(),
+            "etag": entry.etag,
+            "media_type": entry.media_type,
+        })
+        try:
+            self._redis.setex(self.prefix + key, self.ttl, raw)
+        except self._error as exc:
+            logger.warning("Response cache write failed: %s", exc)
+
+    def versions(self, tables: Sequence[str]) -> List[int]:
+        try:
+            values = self._redis.mget([f"{self.prefix}version:{table}" for table in tables])
+        except self._error as exc:
+            # Without versions no key is safe to use; the caller skips caching
+            logger.warning("Response cache version read failed: %s", exc)
+            raise
+        return [int(value or 0) for value in values]
+
+    def bump(self, tables: Iterable[str]) -> None:
+        try:
+            pipe = self._redis.pipeline()
+            for table in tables:
+                pipe.incr(f"{self.prefix}version:{table}")
+            pipe.execute()
+        except self._error as exc:
+            logger.error("Response cache invalidation failed for %s: %s", tables, exc)
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(match=self.prefix + "*"):
+            self._redis.delete(key)
+
+
+def create_response_cache() -> ResponseCacheBackend:
+    """Redis when REDIS_URL is set, otherwise an in-process LRU."""
+    if settings.REDIS_URL:
+        return RedisResponseCache(settings.REDIS_URL, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+    return MemoryResponseCache(
+        maxsize=settings.RESPONSE_CACHE_MAX_SIZE,
+        ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    )
+
+
+response_cache = create_response_cache()
+
+
+# ---------------------------------------------------------------------------
+# Request path
+# ---------------------------------------------------------------------------
+
+
+class _CacheHit(Exception):
+    """Raised by the cache dependency to skip the endpoint on a hit."""
+
+    def __init__(self, entry: CachedResponse):
+        self.entry = entry
+
+
+def _scope_fingerprint(user: User, scope: AccessScope) -> str:
+    # Endpoints filter on the primary role, the role set, the user id (e.g.
+    # own drafts) and the scope's memberships, so all of them go in the key.
+    return "|".join([
+        str(user.id),
+        str(user.role),
+        str(user.role_mask),
+        str(scope.player_id),
+        str(scope.player_team_id),
+        ",".join(map(str, sorted(scope.child_player_ids))),
+        ",".join(map(str, sorted(scope.child_team_ids))),
+        ",".join(map(str, sorted(scope.coached_team_ids))),
+    ])
+
+
+def _cache_key(request: Request, user: User, scope: AccessScope, tables: Sequence[str]) -> str:
+    query = sorted(request.query_params.multi_items())
+    versions = response_cache.versions(tables)
+    raw = json.dumps([
+        request.url.path,
+        query,
+        _scope_fingerprint(user, scope),
+        list(zip(tables, versions)),
+    ])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def cache_response(
+    *tables: str,
+    user_dependency: Callable = get_current_user,
+    scope_dependency: Callable = get_access_scope,
+):
+    """Route dependency caching the response, invalidated by writes to ``tables``.
+
+    Pass the endpoint's own principal and scope dependencies (e.g.
+    ``get_read_user``) so FastAPI resolves each only once per request.
+    """
+    tables = tuple(sorted(tables))
+
+    def dependency(
+        request: Request,
+        current_user: User = Depends(user_dependency),
+        scope: AccessScope = Depends(scope_dependency),
+    ) -> None:
+        if not response_cache.enabled:
+            return
+        try:
+            key = _cache_key(request, current_user, scope, tables)
+        except Exception:
+            logger.exception("Response cache lookup failed for %s", request.url.path)
+            return
+        entry = response_cache.get(key)
+        if entry is not None:
+            raise _CacheHit(entry)
+        setattr(request.state, _STATE_KEY, key)
+
+    return Depends(dependency)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _validator_headers(etag: str) -> dict:
+    # Per-user content: browsers may keep it but must revalidate every time
+    return {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=_validator_headers(etag))
+
+
+class CachedRoute(APIRoute):
+    """Route class serving and storing responses for ``cache_response``."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def cached_handler(request: Request) -> Response:
+            try:
+                response = await handler(request)
+            except _CacheHit as hit:
+                entry = hit.entry
+                if _etag_matches(request, entry.etag):
+                    return _not_modified(entry.etag)
+                return Response(
+                    content=entry.body,
+                    media_type=entry.media_type,
+                    headers=_validator_headers(entry.etag),
+                )
+
+            key = getattr(request.state, _STATE_KEY, None)
+            if key is None or response.status_code != 200 or not hasattr(response, "body"):
+                return response
+            etag = make_etag(response.body)
+            await run_in_threadpool(
+                response_cache.set, key, CachedResponse(response.body, etag, response.media_type)
+            )
+            if _etag_matches(request, etag):
+                return _not_modified(etag)
+            response.headers.update(_validator_headers(etag))
+            return response
+
+        return cached_handler
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    tables = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table is not None:
+            tables.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_dml_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            orm_execute_state.session.info.setdefault(_PENDING_KEY, set()).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session):
+    tables = session.info.pop(_PENDING_KEY, None)
+    if tables:
+        response_cache.bump(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
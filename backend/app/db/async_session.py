@@ -0,0 +1,134 @@
+"""Opt-in async database access for the hot read endpoints.
+
+With ``ASYNC_DATABASE_ENABLED`` the list endpoints and the dashboard read
+through an ``AsyncSession`` (asyncpg on PostgreSQL), so they run on the event
+loop instead of occupying one of FastAPI's threadpool workers per request.
+Without it they keep using the sync session and the threadpool, which makes
+the two modes easy to benchmark against each other.
+
+Endpoints are written once against the sync ORM API and handed to
+``ReadSession.run``. In async mode that code runs through
+``AsyncSession.run_sync``, so every query goes through the async driver. In
+sync mode it runs in the threadpool on the request's regular session.
+
+The caller's principal and access scope come from ``get_read_user`` and
+``get_read_scope``. In async mode they resolve on the same ``AsyncSession``
+(both are usually cache hits), so a read request does not need a threadpool
+worker at all; in sync mode they are the regular ``get_current_user`` and
+``get_access_scope``.
+"""
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar, Union
+
+from fastapi import Depends, Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.access_scope import AccessScope, get_access_scope, resolve_access_scope
+from app.core.config import settings
+from app.core.deps import get_current_user, get_replica_db, load_active_user, oauth2_scheme, token_subject
+from app.db.session import engine_options
+from app.models.user import User
+
+T = TypeVar("T")
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in ``url`` for its async counterpart."""
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def create_engine_for(url: str) -> AsyncEngine:
+    kwargs = engine_options(url)
+    if settings.DB_PGBOUNCER_MODE and url.startswith("postgresql+asyncpg"):
+        # PgBouncer may hand each statement a different server connection, so
+        # neither asyncpg nor SQLAlchemy may cache prepared statements
+        url = make_url(url).update_query_dict({"prepared_statement_cache_size": "0"})
+        kwargs["connect_args"] = {"statement_cache_size": 0}
+    return create_async_engine(url, **kwargs)
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """The process-wide async engine, created on first use."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+        _async_engine = create_engine_for(url)
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    get_async_engine()
+    async with _async_session_factory() as session:
+        yield session
+
+
+class ReadSession:
+    """Runs sync ORM read code against the request's sync or async session."""
+
+    def __init__(self, session: Union[Session, AsyncSession]):
+        self.session = session
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call ``fn(session, *args)`` and return its result.
+
+        Whatever ``fn`` returns is serialized after it completes, so it must
+        eager-load any relationship the response model reads.
+        """
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args)
+        return await run_in_threadpool(fn, self.session, *args)
+
+
+def _get_sync_read_db(db: Session = Depends(get_replica_db)) -> ReadSession:
+    return ReadSession(db)
+
+
+def _get_async_read_db(session: AsyncSession = Depends(get_async_db)) -> ReadSession:
+    return ReadSession(session)
+
+
+async def get_current_user_async(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """``get_current_user`` resolved on the request's ``AsyncSession``."""
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return batch_user
+    return await db.run_sync(load_active_user, token_subject(token))
+
+
+async def get_access_scope_async(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> AccessScope:
+    """``get_access_scope`` resolved on the request's ``AsyncSession``."""
+    return await db.run_sync(lambda session: resolve_access_scope(current_user, session))
+
+
+get_read_db = _get_async_read_db if settings.ASYNC_DATABASE_ENABLED else _get_sync_read_db
+get_read_user = get_current_user_async if settings.ASYNC_DATABASE_ENABLED else get_current_user
+get_read_scope = get_access_scope_async if settings.ASYNC_DATABASE_ENABLED else get_access_scope
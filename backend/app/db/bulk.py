@@ -0,0 +1,18 @@
+"""Dialect-aware INSERT helpers for set-based writes.
+
+Postgres (production) and SQLite (tests) both support
+``INSERT ... ON CONFLICT``; SQLAlchemy exposes it through dialect-specific
+``insert`` constructs, so callers ask for the one matching their session.
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert_insert(db: Session, model):
+    """Return an INSERT construct for ``model`` that supports ON CONFLICT."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect}")
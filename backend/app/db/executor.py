@@ -0,0 +1,30 @@
+"""Bounded thread pool for blocking database work called from async code.
+
+The ORM session is synchronous. Async handlers (the WebSocket endpoint)
+hand their DB calls to this pool instead of running them on the event loop.
+The pool is separate from the default executor, and it is sized to the
+connection pool, so a burst of socket traffic cannot take every thread
+FastAPI uses for sync endpoints.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_EXECUTOR_MAX_WORKERS,
+    thread_name_prefix="db-executor",
+)
+
+
+async def run_in_db_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``func(*args, **kwargs)`` on the DB pool and await its result."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(db_executor, call)
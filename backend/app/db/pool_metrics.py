@@ -0,0 +1,112 @@
+"""Connection-pool instrumentation.
+
+``InstrumentedQueuePool`` counts the checkouts it serves, times those that
+found the pool exhausted and had to wait for a connection, and counts
+checkout timeouts; pool events count checkouts,
+checkins, new connections and invalidations. ``pool_metrics.snapshot``
+combines those counters with the pool's live state for the admin
+``/health/pool`` endpoint.
+"""
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+
+class PoolMetrics:
+    """Process-wide counters fed by pool events (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.pool_checkouts = 0
+            self.wait_count = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def _incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def record_checkout(self) -> None:
+        self._incr("pool_checkouts")
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def attach(self, engine: Engine) -> None:
+        """Listen to ``engine``'s pool events."""
+        event.listen(engine, "checkout", lambda *a: self._incr("checkouts"))
+        event.listen(engine, "checkin", lambda *a: self._incr("checkins"))
+        event.listen(engine, "connect", lambda *a: self._incr("connects"))
+        event.listen(engine, "invalidate", lambda *a: self._incr("invalidations"))
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            counters = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait": {
+                    # Checkouts through InstrumentedQueuePool, waiting or not
+                    "checkouts": self.pool_checkouts,
+                    "count": self.wait_count,
+                    "total_seconds": round(self.wait_total, 6),
+                    "max_seconds": round(self.wait_max, 6),
+                    "avg_seconds": round(self.wait_total / self.wait_count, 6) if self.wait_count else 0.0,
+                },
+            }
+        state = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            state.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        return {**state, **counters}
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long checkouts wait for a connection."""
+
+    def _exhausted(self) -> bool:
+        if self._max_overflow < 0:  # unlimited overflow never waits
+            return False
+        return self.checkedout() >= self.size() + self._max_overflow
+
+    def _do_get(self):
+        pool_metrics.record_checkout()
+        # Only a checkout that finds every connection in use waits; the rest
+        # are served from the idle queue or by opening an overflow connection
+        if not self._exhausted():
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - started)
+        return connection
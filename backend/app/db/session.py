@@ -1,25 +1,245 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.dml import UpdateBase
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool, pool_metrics
+
+logger = logging.getLogger(__name__)
+
+
+def engine_options(url: str) -> dict:
+    """Pool keyword arguments for ``url``, built from the DB_POOL_* settings.
 
-_engine_kwargs: dict = {}
-if settings.DATABASE_URL.startswith("postgresql"):
-    _engine_kwargs.update(
-        pool_size=5,
-        max_overflow=10,
-        pool_timeout=30,
-        pool_recycle=1800,
-        pool_pre_ping=True,
+    In PgBouncer mode the app keeps no pool of its own (NullPool) and leaves
+    pooling to PgBouncer.
+    """
+    if not url.startswith("postgresql"):
+        return {}
+    if settings.DB_PGBOUNCER_MODE:
+        return {"poolclass": NullPool, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    return dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
     )
 
+
+_engine_kwargs = engine_options(settings.DATABASE_URL)
+if _engine_kwargs and "poolclass" not in _engine_kwargs:
+    _engine_kwargs["poolclass"] = InstrumentedQueuePool
+
 engine = create_engine(settings.DATABASE_URL, **_engine_kwargs)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+pool_metrics.attach(engine)
+
+
+# ---------------------------------------------------------------------------
+# Read replicas
+#
+# With DATABASE_REPLICA_URLS set, sessions flagged by ``get_replica_db`` send
+# their SELECTs to a replica picked round-robin per session. Flushes and DML
+# always go to the primary. A replica that fails a connection or a health
+# check is skipped for DB_REPLICA_RETRY_SECONDS; with no healthy replica,
+# reads fall back to the primary.
+# ---------------------------------------------------------------------------
+
+
+class ReplicaRouter:
+    def __init__(self, urls: List[str], retry_after: float):
+        self.engines: List[Engine] = [create_engine(url, **engine_options(url)) for url in urls]
+        self.retry_after = retry_after
+        self._unhealthy_until: dict = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        for replica in self.engines:
+            event.listen(replica, "handle_error", self._on_error)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def is_healthy(self, replica: Engine) -> bool:
+        return self._unhealthy_until.get(replica, 0.0) <= time.monotonic()
+
+    def mark_unhealthy(self, replica: Engine) -> None:
+        logger.warning("Read replica %s unavailable; routing reads elsewhere", replica.url)
+        self._unhealthy_until[replica] = time.monotonic() + self.retry_after
+
+    def choose(self) -> Optional[Engine]:
+        """Next healthy replica in round-robin order, or None."""
+        with self._lock:
+            start = next(self._counter)
+        for offset in range(len(self.engines)):
+            replica = self.engines[(start + offset) % len(self.engines)]
+            if self.is_healthy(replica):
+                return replica
+        return None
+
+    def _on_error(self, context) -> None:
+        if context.is_disconnect and context.engine is not None:
+            self.mark_unhealthy(context.engine)
+
+    def check_health(self) -> None:
+        for replica in self.engines:
+            try:
+                with replica.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                self._unhealthy_until.pop(replica, None)
+            except Exception:
+                self.mark_unhealthy(replica)
+
+    async def check_health_forever(self, interval: float) -> None:
+        """Background task: re-check every replica every ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.check_health)
+
+    def dispose(self) -> None:
+        for replica in self.engines:
+            replica.dispose()
+
+
+replica_router = ReplicaRouter(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    retry_after=settings.DB_REPLICA_RETRY_SECONDS,
+)
+
+
+class RoutingSession(Session):
+    """Session that can serve its reads from a replica (see ``use_replica``)."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.info.get("use_replica")
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            # Stay on one replica for the whole request
+            if "replica" not in self.info:
+                self.info["replica"] = replica_router.choose()
+            if self.info["replica"] is not None:
+                return self.info["replica"]
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@contextmanager
+def primary_reads(db: Session) -> Iterator[Session]:
+    """Send ``db``'s reads to the primary for the duration of the block.
+
+    Code that fills a cache shared across requests reads through this: a
+    replica that has not caught up would otherwise be stored as the state
+    after the write that just invalidated the cache.
+    """
+    use_replica = db.info.pop("use_replica", None)
+    try:
+        yield db
+    finally:
+        if use_replica:
+            db.info["use_replica"] = use_replica
+
+
+# Read-your-writes: users who committed a write in the last
+# DB_REPLICA_STICKY_SECONDS keep reading from the primary, so they never see
+# a replica that has not caught up with their own change yet. The follow-up
+# GET may land on another worker or instance, so the marker lives in Redis
+# when REDIS_URL is set.
+
+
+class RedisRecentWriters:
+    """``recent_writers`` shared by every worker through Redis.
+
+    On a Redis error ``get`` reports a recent write, so reads fall back to
+    the primary instead of risking a stale replica.
+    """
+
+    def __init__(self, url: str, ttl: int, prefix: str = "handball:writer:"):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._error = redis.RedisError
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def get(self, user_id: int) -> Optional[bool]:
+        if self.ttl <= 0:
+            return None
+        try:
+            return True if self._redis.exists(f"{self.prefix}{user_id}") else None
+        except self._error as exc:
+            logger.warning("Recent-writer lookup failed: %s", exc)
+            return True
+
+    def set(self, user_id: int, value: bool) -> None:
+        if self.ttl <= 0:
+            return
+        try:
+            self._redis.setex(f"{self.prefix}{user_id}", self.ttl, 1)
+        except self._error as exc:
+            logger.warning("Recent-writer update failed: %s", exc)
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(match=self.prefix + "*"):
+            self._redis.delete(key)
+
+
+def create_recent_writers():
+    """Redis when REDIS_URL is set, otherwise a per-process TTL cache."""
+    if settings.REDIS_URL:
+        return RedisRecentWriters(settings.REDIS_URL, ttl=settings.DB_REPLICA_STICKY_SECONDS)
+    return TTLCache(maxsize=10000, ttl=settings.DB_REPLICA_STICKY_SECONDS)
+
+
+recent_writers = create_recent_writers()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session):
+    wrote = session.info.pop("wrote", False)
+    if wrote and replica_router.enabled and session.info.get("user_id") is not None:
+        recent_writers.set(session.info["user_id"], True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
+
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
 
 Base = declarative_base()
 
 
-def get_db() -> Session:
+def get_db(request: Request) -> Session:
+    # Sub-requests of a batch share the batch's session (see endpoints/batch.py)
+    shared = getattr(request.state, "batch_db", None)
+    if shared is not None:
+        yield shared
+        return
     db = SessionLocal()
     try:
         yield db
@@ -1,10 +1,11 @@
+import asyncio
 import json
 import logging
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.responses import JSONResponse
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
@@ -12,11 +13,14 @@ from app.core.config import settings
 from app.core.logging_config import setup_logging
 from app.core.rate_limit import limiter
 from app.api.v1.api import api_router
-from app.db.session import engine, Base, SessionLocal
+from app.db.session import engine, Base, replica_router
+from app.db.async_session import dispose_async_engine
 from app.models import *
 from app.core.deps import get_current_user
 from app.websocket.manager import manager
+from app.websocket import auth as ws_auth
 from app.core.security import decode_token
+from app.services import dashboard_stats
 
 # Configure structured logging before anything else
 setup_logging()
@@ -29,10 +33,31 @@ async def lifespan(app: FastAPI):
     # Startup
     settings.validate_required_secrets()
     logger.info("Starting up Handball Manager API...")
+    await manager.start()
+    refresh_task = None
+    if settings.DASHBOARD_MATERIALIZED_VIEW and engine.dialect.name == "postgresql":
+        # The view itself is created by the 007 migration
+        refresh_task = asyncio.create_task(
+            dashboard_stats.refresh_materialized_view_forever(engine)
+        )
+    health_task = None
+    if replica_router.enabled:
+        health_task = asyncio.create_task(
+            replica_router.check_health_forever(settings.DB_REPLICA_HEALTH_CHECK_SECONDS)
+        )
     yield
+    # Wait for the background tasks to stop before their engines are disposed
+    for task in (refresh_task, health_task):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    await manager.stop()
     # Shutdown - dispose of the DB engine to release all pooled connections
     logger.info("Shutting down Handball Manager API - disposing DB engine...")
     engine.dispose()
+    replica_router.dispose()
+    await dispose_async_engine()
     logger.info("Handball Manager API shut down complete.")
 
 
@@ -82,6 +107,7 @@ def health_check():
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
+    connection_id = None
 
     # Wait for authentication
     try:
@@ -113,9 +139,19 @@ async def websocket_endpoint(websocket: WebSocket):
             await websocket.close()
             return
 
+        ws_user = await ws_auth.authenticate(user_id)
+        if ws_user is None:
+            await websocket.send_text(json.dumps({"type": "error", "message": "Invalid token"}))
+            await websocket.close()
+            return
+
         # Connect the user
-        await manager.connect(websocket, user_id)
-        await websocket.send_text(json.dumps({"type": "connected", "user_id": user_id}))
+        connection_id = await manager.connect(websocket, ws_user.id)
+        await websocket.send_text(json.dumps({
+            "type": "connected",
+            "user_id": user_id,
+            "connection_id": connection_id
+        }))
 
         # Keep connection alive and handle messages
         while True:
@@ -128,19 +164,8 @@ async def websocket_endpoint(websocket: WebSocket):
                     team_id = message.get("team_id")
                     if team_id:
                         # Authorize the subscription with the same role-based
-                        # rules as the REST endpoints. user_id is the JWT
-                        # subject (email); resolve the actual User to check.
-                        from app.core.permissions import can_access_team
-                        db = SessionLocal()
-                        try:
-                            ws_user = db.query(User).filter(
-                                User.email == user_id
-                            ).first()
-                            allowed = ws_user is not None and can_access_team(
-                                ws_user, team_id, db
-                            )
-                        finally:
-                            db.close()
+                        # rules as the REST endpoints, from the cached scope.
+                        allowed = await ws_auth.can_subscribe(ws_auth.current_user(ws_user), team_id)
 
                         if not allowed:
                             await websocket.send_text(json.dumps({
@@ -149,7 +174,7 @@ async def websocket_endpoint(websocket: WebSocket):
                                 "team_id": team_id
                             }))
                         else:
-                            manager.subscribe_to_team(user_id, team_id)
+                            manager.subscribe_to_team(ws_user.id, team_id)
                             await websocket.send_text(json.dumps({
                                 "type": "subscribed",
                                 "team_id": team_id
@@ -158,7 +183,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 elif message.get("action") == "unsubscribe_team":
                     team_id = message.get("team_id")
                     if team_id:
-                        manager.unsubscribe_from_team(user_id, team_id)
+                        manager.unsubscribe_from_team(ws_user.id, team_id)
                         await websocket.send_text(json.dumps({
                             "type": "unsubscribed",
                             "team_id": team_id
@@ -179,8 +204,9 @@ async def websocket_endpoint(websocket: WebSocket):
         pass
     finally:
         # Clean up on disconnect
-        if 'user_id' in locals():
-            manager.disconnect(user_id)
+        if connection_id is not None:
+            manager.disconnect(ws_user.id, connection_id)
+            ws_auth.release(ws_user.id)
 
 
 if __name__ == "__main__":
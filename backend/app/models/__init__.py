@@ -10,6 +10,7 @@ from app.models.news import News
 from app.models.oauth_account import OAuthAccount, OAuthProvider
 from app.models.invitation import Invitation, InvitationStatus
 from app.models.user_activity import UserActivity, ActivityType
+from app.models.tombstone import Tombstone
 
 __all__ = [
     "Base",
@@ -34,4 +35,5 @@ __all__ = [
     "InvitationStatus",
     "UserActivity",
     "ActivityType",
+    "Tombstone",
 ]
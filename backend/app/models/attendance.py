@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, ForeignKey, Enum, String
+from sqlalchemy import Column, DateTime, Integer, ForeignKey, Enum, String, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -14,6 +14,16 @@ class AttendanceStatus(str, enum.Enum):
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    # One record per player per game / event. NULLs are distinct, so a game
+    # record (event_id NULL) never collides with an event record.
+    __table_args__ = (
+        UniqueConstraint("player_id", "event_id", name="uq_attendance_player_event"),
+        UniqueConstraint("player_id", "game_id", name="uq_attendance_player_game"),
+        # The unique constraints cover lookups by player; these cover the
+        # per-game / per-event attendance lists
+        Index("ix_attendance_game_id", "game_id"),
+        Index("ix_attendance_event_id", "event_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
@@ -23,6 +33,7 @@ class Attendance(Base):
     notes = Column(String, nullable=True)
     recorded_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     recorded_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     player = relationship("Player", back_populates="attendance_records")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Enum, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -21,6 +21,9 @@ class GameType(str, enum.Enum):
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        Index("ix_games_team_id_scheduled_at", "team_id", "scheduled_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
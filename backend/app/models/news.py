@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
@@ -6,6 +6,9 @@ from app.db.session import Base
 
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        Index("ix_news_team_id_is_published_created_at", "team_id", "is_published", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
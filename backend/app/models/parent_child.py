@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
@@ -6,6 +6,10 @@ from app.db.session import Base
 
 class ParentChild(Base):
     __tablename__ = "parent_children"
+    __table_args__ = (
+        Index("ix_parent_children_parent_id", "parent_id"),
+        Index("ix_parent_children_child_id", "child_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     parent_id = Column(Integer, ForeignKey("users.id"), nullable=False)
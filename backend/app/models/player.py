@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Date, Enum
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Date, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -18,6 +18,9 @@ class Position(str, enum.Enum):
 
 class Player(Base):
     __tablename__ = "players"
+    __table_args__ = (
+        Index("ix_players_team_id", "team_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True)
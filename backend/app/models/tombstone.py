@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Integer, String, Index
+from datetime import datetime
+
+from app.db.session import Base
+
+
+class Tombstone(Base):
+    """Record of a deleted row, so delta sync can report the deletion."""
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_deleted_at", "deleted_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Table name of the deleted row (teams, players, games, ...)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    # Team the row belonged to, for visibility; NULL for club-wide rows
+    team_id = Column(Integer, nullable=True)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -53,31 +53,74 @@ class User(Base):
         Reads roles_data JSON if populated; falls back to [self.role] for
         users created before multi-role support landed.
         """
+        return list(self._resolved_roles()[0])
+
+    @property
+    def roles_list(self):
+        """Backwards-compatible alias for `roles`."""
+        return self.roles
+
+    @property
+    def role_mask(self) -> int:
+        """Bitmask of this user's roles (see `role_bits`)."""
+        return self._resolved_roles()[1]
+
+    def _resolved_roles(self) -> tuple:
+        """Parse roles_data once and memoize (roles, mask) on the instance.
+
+        The memo is keyed by the (roles_data, role) values it was built from,
+        so assigning either attribute, or reloading the row, re-parses.
+        """
+        source = (self.roles_data, self.role)
+        memo = getattr(self, "_roles_memo", None)
+        if memo is not None and memo[0] == source:
+            return memo[1]
+
+        roles = None
         if self.roles_data:
             try:
                 raw = json.loads(self.roles_data)
-                parsed = [UserRole(v) for v in raw if v in UserRole._value2member_map_]
+                parsed = tuple(UserRole(v) for v in raw if v in UserRole._value2member_map_)
                 if parsed:
-                    return parsed
+                    roles = parsed
             except (ValueError, TypeError):
                 pass
-        return [self.role]
+        if roles is None:
+            roles = (self.role,)
 
-    @property
-    def roles_list(self):
-        """Backwards-compatible alias for `roles`."""
-        return self.roles
+        resolved = (roles, role_bits(roles))
+        self._roles_memo = (source, resolved)
+        return resolved
 
     def has_role(self, check_role):
         """Check if user has the specified role (matches against any role in `roles`)."""
-        if isinstance(check_role, UserRole):
-            return check_role in self.roles
-        return any(r.value == check_role for r in self.roles)
+        bit = _ROLE_BITS.get(check_role, 0)
+        return bool(self.role_mask & bit)
 
     def has_any_role(self, roles):
         """Check if user has any of the specified roles."""
-        return any(self.has_role(r) for r in roles)
+        return bool(self.role_mask & role_bits(roles))
 
     def has_all_roles(self, roles):
         """Check if user has all specified roles."""
-        return all(self.has_role(r) for r in roles)
+        roles = list(roles)
+        if not all(r in _ROLE_BITS for r in roles):
+            return False
+        wanted = role_bits(roles)
+        return self.role_mask & wanted == wanted
+
+
+# One bit per role. UserRole is a str enum, so members and their plain string
+# values hash alike and both resolve through this mapping.
+_ROLE_BITS = {role: 1 << i for i, role in enumerate(UserRole)}
+
+
+def role_bits(roles) -> int:
+    """Combine ``roles`` (UserRole members or values) into a bitmask.
+
+    Unknown values contribute no bits.
+    """
+    mask = 0
+    for role in roles:
+        mask |= _ROLE_BITS.get(role, 0)
+    return mask
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, ForeignKey, String, Text, Enum
+from sqlalchemy import Column, DateTime, Integer, ForeignKey, String, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -19,6 +19,9 @@ class ActivityType(str, enum.Enum):
 
 class UserActivity(Base):
     __tablename__ = "user_activities"
+    __table_args__ = (
+        Index("ix_user_activities_user_id_created_at", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -52,7 +52,27 @@ class AttendanceWithPlayer(AttendanceResponse):
 
 
 # Bulk update
-class BulkAttendanceUpdate(BaseModel):
-    player_ids: List[int] = Field(..., min_length=1)
+class BulkAttendanceEntry(BaseModel):
+    player_id: int
     status: AttendanceStatus
     notes: Optional[str] = Field(None, max_length=500)
+
+
+class BulkAttendanceUpdate(BaseModel):
+    """Apply one status to ``player_ids`` and/or per-player ``entries``.
+
+    ``entries`` lets a coach submit a whole roll call in one request; an entry
+    wins over ``player_ids`` for the same player.
+    """
+    player_ids: List[int] = []
+    status: Optional[AttendanceStatus] = None
+    notes: Optional[str] = Field(None, max_length=500)
+    entries: List[BulkAttendanceEntry] = []
+
+    @model_validator(mode="after")
+    def check_targets(self):
+        if not self.player_ids and not self.entries:
+            raise ValueError("Either player_ids or entries must be provided")
+        if self.player_ids and self.status is None:
+            raise ValueError("status is required when player_ids is provided")
+        return self
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
+
+
+class BatchSubRequest(BaseModel):
+    # Echoed back so the client can match responses to requests
+    id: str = Field(..., min_length=1, max_length=100)
+    # API path including the query string, e.g. "/api/v1/games/?upcoming=true"
+    path: str = Field(..., min_length=1, max_length=2000)
+    # Only If-None-Match is forwarded
+    headers: Dict[str, str] = {}
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+
+class BatchSubResponse(BaseModel):
+    id: str
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
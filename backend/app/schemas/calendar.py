@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from enum import Enum
+
+
+class CalendarItemKind(str, Enum):
+    GAME = "game"
+    EVENT = "event"
+
+
+class CalendarItem(BaseModel):
+    kind: CalendarItemKind
+    id: int
+    team_id: Optional[int] = None
+    # game_type for games, event_type for events
+    type: str
+    title: str
+    location: Optional[str] = None
+    start: datetime
+    end: datetime
+    status: Optional[str] = None
+    updated_at: datetime
+
+
+class CalendarDeletion(BaseModel):
+    kind: CalendarItemKind
+    id: int
+
+
+class CalendarFeed(BaseModel):
+    """One page of the calendar.
+
+    Pass ``sync_token`` back as ``since`` to receive only the items created or
+    changed after this response, and in ``deleted`` the items removed since.
+    Items near the token may be repeated. ``has_more`` means the page hit
+    ``limit``; request again with the new token (or a later window) for the
+    rest.
+    """
+    items: List[CalendarItem]
+    deleted: List[CalendarDeletion] = []
+    sync_token: Optional[str] = None
+    has_more: bool = False
@@ -12,14 +12,22 @@ class PaginationParams(BaseModel):
     """Query parameters for pagination."""
     skip: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=1000)
+    cursor: Optional[str] = None
+    include_total: bool = True
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    """Base paginated response model."""
+    """Base paginated response model.
+
+    ``total`` is null when the caller passed ``include_total=false``.
+    ``next_cursor`` is set while more rows follow; pass it back as
+    ``cursor`` to fetch the next page by keyset instead of offset.
+    """
     items: List[T]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
     
     class Config:
         from_attributes = True
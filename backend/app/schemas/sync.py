@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from enum import Enum
+
+
+class SyncEntity(str, Enum):
+    TEAMS = "teams"
+    PLAYERS = "players"
+    GAMES = "games"
+    EVENTS = "events"
+    NEWS = "news"
+    ATTENDANCE = "attendance"
+
+
+class EntityChanges(BaseModel):
+    upserted: List[int] = []
+    deleted: List[int] = []
+
+
+class SyncResponse(BaseModel):
+    """Ids changed since the ``since`` token, per entity.
+
+    Pass ``sync_token`` back as ``since`` on the next sync. ``full`` is true
+    when no token was sent: ``upserted`` then lists every visible id.
+    """
+    sync_token: str
+    full: bool
+    changes: Dict[str, EntityChanges]
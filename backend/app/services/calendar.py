@@ -0,0 +1,424 @@
+"""Unified calendar of games and events.
+
+``calendar_feed`` merges both tables in one ``UNION ALL`` so ordering, the
+kind / event-type filters and the page limit are applied by the database
+instead of loading every upcoming row and slicing in Python.
+
+Passing a response's ``sync_token`` back as ``since`` returns every visible
+item created or changed after it, regardless of the date window, so a client
+can tell when an item moved out of the range it displays, plus the games and
+events deleted since (from ``tombstones``). As in ``app.services.sync``, a
+token from a finished sync is the server time and the next sync re-reads a
+short overlap before it, because ``updated_at`` is set at flush and a
+transaction may commit after a sync that started later. While a sync pages
+(``has_more``) the token is the keyset position ``(updated_at, kind, id)`` of
+the last item returned. Clients may therefore see an item twice.
+
+``team_ics`` renders a team's iCalendar export. Renders are cached per team
+and keyed by the response-cache table versions, so any committed write to
+games, events or teams produces a fresh render on the next request.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, String, and_, cast, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.access_scope import AccessScope
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import make_etag, response_cache
+from app.db.session import primary_reads
+from app.models.event import Event, EventType, EventVisibility
+from app.models.game import Game, GameStatus, GameType
+from app.models.team import Team
+from app.models.tombstone import Tombstone
+from app.models.user import User, UserRole
+from app.schemas.calendar import CalendarItemKind
+
+# Games only store their throw-off time
+GAME_DURATION = timedelta(minutes=90)
+# How far back the .ics export reaches
+ICS_HISTORY = timedelta(days=30)
+
+_ICS_TABLES = ("events", "games", "teams")
+
+# Same re-read window as app.services.sync
+_OVERLAP = timedelta(seconds=5)
+
+_TOMBSTONE_KINDS = {"games": CalendarItemKind.GAME, "events": CalendarItemKind.EVENT}
+
+ics_cache = TTLCache(
+    maxsize=settings.CALENDAR_ICS_CACHE_MAX_SIZE,
+    ttl=settings.CALENDAR_ICS_CACHE_TTL_SECONDS,
+)
+
+
+# ---------------------------------------------------------------------------
+# Sync tokens
+# ---------------------------------------------------------------------------
+
+
+def encode_sync_token(at: datetime, position: Optional[Tuple[str, int]] = None) -> str:
+    """Token for a finished sync at ``at``, or for the page ending at ``position``."""
+    raw = json.dumps([at.isoformat(), *(position or ())], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Tuple[datetime, Optional[Tuple[str, int]]]:
+    """Inverse of ``encode_sync_token``; raises 400 on a malformed token."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        at, *position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not position:
+            return datetime.fromisoformat(at), None
+        kind, item_id = position
+        return datetime.fromisoformat(at), (str(kind), int(item_id))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token",
+        )
+
+
+# ---------------------------------------------------------------------------
+# Feed
+# ---------------------------------------------------------------------------
+
+
+def game_visibility(user: User, scope: AccessScope):
+    """Filter for the games ``user`` may see, or None for everything.
+
+    Same rules as the games calendar, except that a player without a team
+    sees no games.
+    """
+    if user.has_role(UserRole.PLAYER):
+        return Game.team_id == scope.player_team_id
+    elif user.has_role(UserRole.PARENT):
+        return Game.team_id.in_(scope.child_team_ids)
+    elif user.has_role(UserRole.COACH):
+        return Game.team_id.in_(scope.coached_team_ids)
+    return None
+
+
+def event_visibility(user: User, scope: AccessScope):
+    """Filter for the events ``user`` may see (events calendar rules), or None."""
+    club_wide = Event.visibility == EventVisibility.CLUB_WIDE
+    team_only = Event.visibility == EventVisibility.TEAM
+    if user.has_role(UserRole.PLAYER):
+        if scope.player_team_id:
+            return club_wide | (team_only & (Event.team_id == scope.player_team_id))
+        return club_wide
+    elif user.has_role(UserRole.PARENT):
+        if scope.child_team_ids:
+            return club_wide | (team_only & Event.team_id.in_(scope.child_team_ids))
+        return club_wide
+    elif user.has_role(UserRole.COACH):
+        if scope.coached_team_ids:
+            return club_wide | Event.team_id.in_(scope.coached_team_ids)
+        return club_wide
+    return None
+
+
+def _games(user: User, scope: AccessScope):
+    stmt = select(
+        literal(CalendarItemKind.GAME.value).label("kind"),
+        Game.id.label("id"),
+        Game.team_id.label("team_id"),
+        cast(Game.game_type, String).label("type"),
+        Game.opponent.label("title"),
+        Game.location.label("location"),
+        Game.scheduled_at.label("starts_at"),
+        cast(null(), DateTime).label("ends_at"),
+        cast(Game.status, String).label("status"),
+        Game.updated_at.label("updated_at"),
+    )
+    visible = game_visibility(user, scope)
+    return stmt if visible is None else stmt.where(visible)
+
+
+def _events(user: User, scope: AccessScope):
+    stmt = select(
+        literal(CalendarItemKind.EVENT.value).label("kind"),
+        Event.id.label("id"),
+        Event.team_id.label("team_id"),
+        cast(Event.event_type, String).label("type"),
+        Event.title.label("title"),
+        Event.location.label("location"),
+        Event.start_time.label("starts_at"),
+        Event.end_time.label("ends_at"),
+        cast(null(), String).label("status"),
+        Event.updated_at.label("updated_at"),
+    )
+    visible = event_visibility(user, scope)
+    return stmt if visible is None else stmt.where(visible)
+
+
+def _visible_items(
+    user: User,
+    scope: AccessScope,
+    *,
+    team_id: Optional[int],
+    kind: Optional[CalendarItemKind],
+    event_types: Optional[Sequence[EventType]],
+    window: Optional[Tuple[datetime, datetime]],
+):
+    selects = []
+    if kind != CalendarItemKind.EVENT:
+        games = _games(user, scope)
+        if team_id:
+            games = games.where(Game.team_id == team_id)
+        if window:
+            games = games.where(Game.scheduled_at >= window[0], Game.scheduled_at <= window[1])
+        selects.append(games)
+    if kind != CalendarItemKind.GAME:
+        events = _events(user, scope)
+        if team_id:
+            events = events.where(Event.team_id == team_id)
+        if event_types:
+            events = events.where(Event.event_type.in_(event_types))
+        if window:
+            events = events.where(Event.start_time >= window[0], Event.start_time <= window[1])
+        selects.append(events)
+    merged = selects[0] if len(selects) == 1 else union_all(*selects)
+    return merged.subquery("calendar_items")
+
+
+def _to_item(row) -> dict:
+    if row.kind == CalendarItemKind.GAME.value:
+        item_type = GameType[row.type].value
+        item_status = GameStatus[row.status].value if row.status else None
+        ends_at = row.starts_at + GAME_DURATION
+    else:
+        item_type = EventType[row.type].value
+        item_status = None
+        ends_at = row.ends_at
+    return {
+        "kind": row.kind,
+        "id": row.id,
+        "team_id": row.team_id,
+        "type": item_type,
+        "title": row.title,
+        "location": row.location,
+        "start": row.starts_at,
+        "end": ends_at,
+        "status": item_status,
+        "updated_at": row.updated_at,
+    }
+
+
+def _deleted_since(
+    db: Session,
+    user: User,
+    scope: AccessScope,
+    cutoff: datetime,
+    *,
+    team_id: Optional[int],
+    kind: Optional[CalendarItemKind],
+) -> List[dict]:
+    """Games and events deleted since ``cutoff`` that the caller could see.
+
+    Visibility is by the deleted row's team, so the list may name items the
+    caller never had (e.g. filtered out by event type); clients ignore those.
+    """
+    entities = [entity for entity, k in _TOMBSTONE_KINDS.items() if kind in (None, k)]
+    stmt = select(Tombstone.entity, Tombstone.entity_id).where(
+        Tombstone.entity.in_(entities),
+        Tombstone.deleted_at >= cutoff,
+    )
+    if team_id:
+        stmt = stmt.where(Tombstone.team_id == team_id)
+    if user.has_any_role([UserRole.PLAYER, UserRole.PARENT, UserRole.COACH]):
+        stmt = stmt.where(or_(
+            Tombstone.team_id.in_(scope.visible_team_ids),
+            Tombstone.team_id.is_(None),
+        ))
+    rows = db.execute(stmt.order_by(Tombstone.deleted_at, Tombstone.id))
+    return [{"kind": _TOMBSTONE_KINDS[entity].value, "id": entity_id} for entity, entity_id in rows]
+
+
+def calendar_feed(
+    db: Session,
+    user: User,
+    scope: AccessScope,
+    *,
+    start: datetime,
+    end: datetime,
+    team_id: Optional[int] = None,
+    kind: Optional[CalendarItemKind] = None,
+    event_types: Optional[Sequence[EventType]] = None,
+    limit: int = 100,
+    since: Optional[str] = None,
+) -> dict:
+    """Return one ``CalendarFeed`` page as a response dict.
+
+    Without ``since`` the items start inside ``[start, end]`` and are ordered
+    by start time. With ``since`` only items changed after that token are
+    returned, ordered by change, and the window is ignored.
+    """
+    now = datetime.utcnow()
+    filters = dict(team_id=team_id, kind=kind, event_types=event_types)
+
+    if since is None:
+        items = _visible_items(user, scope, window=(start, end), **filters)
+        page = db.execute(
+            select(items)
+            .order_by(items.c.starts_at, items.c.kind, items.c.id)
+            .limit(limit + 1)
+        ).all()
+        return {
+            "items": [_to_item(row) for row in page[:limit]],
+            "deleted": [],
+            "sync_token": encode_sync_token(now),
+            "has_more": len(page) > limit,
+        }
+
+    at, position = decode_sync_token(since)
+    items = _visible_items(user, scope, window=None, **filters)
+    if position is None:
+        # A new sync: re-read the overlap before the token (see module docs)
+        changed = items.c.updated_at >= at - _OVERLAP
+    else:
+        # The next page of a sync: seek past the last item returned
+        last_kind, last_id = position
+        changed = or_(
+            items.c.updated_at > at,
+            and_(items.c.updated_at == at, items.c.kind > last_kind),
+            and_(items.c.updated_at == at, items.c.kind == last_kind, items.c.id > last_id),
+        )
+    page = db.execute(
+        select(items)
+        .where(changed)
+        .order_by(items.c.updated_at, items.c.kind, items.c.id)
+        .limit(limit + 1)
+    ).all()
+
+    has_more = len(page) > limit
+    if has_more:
+        last = page[limit - 1]
+        token = encode_sync_token(last.updated_at, (last.kind, last.id))
+    else:
+        token = encode_sync_token(now)
+
+    return {
+        "items": [_to_item(row) for row in page[:limit]],
+        "deleted": _deleted_since(db, user, scope, at - _OVERLAP, team_id=team_id, kind=kind),
+        "sync_token": token,
+        "has_more": has_more,
+    }
+
+
+# ---------------------------------------------------------------------------
+# iCalendar export
+# ---------------------------------------------------------------------------
+
+
+def _ics_escape(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_time(value: datetime) -> str:
+    # Times are stored as naive UTC
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _fold(line: str) -> List[str]:
+    """Split a content line into 75-octet chunks (RFC 5545, 3.1)."""
+    chunks, current = [], ""
+    for char in line:
+        if len((current + char).encode()) > 75:
+            chunks.append(current)
+            current = " " + char
+        else:
+            current += char
+    chunks.append(current)
+    return chunks
+
+
+def _vevent(uid: str, start: datetime, end: datetime, stamp: datetime,
+            summary: str, location: Optional[str], description: Optional[str]) -> List[str]:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{_ics_time(stamp)}",
+        f"DTSTART:{_ics_time(start)}",
+        f"DTEND:{_ics_time(end)}",
+        f"SUMMARY:{_ics_escape(summary)}",
+    ]
+    if location:
+        lines.append(f"LOCATION:{_ics_escape(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{_ics_escape(description)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def render_team_ics(db: Session, team: Team) -> str:
+    since = datetime.utcnow() - ICS_HISTORY
+    games = (
+        db.query(Game)
+        .filter(Game.team_id == team.id, Game.scheduled_at >= since)
+        .order_by(Game.scheduled_at)
+        .all()
+    )
+    events = (
+        db.query(Event)
+        .filter(
+            (Event.team_id == team.id) | (Event.visibility == EventVisibility.CLUB_WIDE),
+            Event.start_time >= since,
+        )
+        .order_by(Event.start_time)
+        .all()
+    )
+
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{settings.PROJECT_NAME}//Team Calendar//EN",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_ics_escape(team.name)}",
+    ]
+    for game in games:
+        if game.status == GameStatus.CANCELLED:
+            continue
+        summary = f"{team.name} vs {game.opponent}" if game.is_home_game else f"{game.opponent} vs {team.name}"
+        lines += _vevent(
+            f"game-{game.id}@handball-manager",
+            game.scheduled_at, game.scheduled_at + GAME_DURATION,
+            game.updated_at or game.created_at,
+            summary, game.location, game.notes,
+        )
+    for event in events:
+        lines += _vevent(
+            f"event-{event.id}@handball-manager",
+            event.start_time, event.end_time,
+            event.updated_at or event.created_at,
+            event.title, event.location, event.description,
+        )
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(chunk for line in lines for chunk in _fold(line)) + "\r\n"
+
+
+def team_ics(db: Session, team: Team) -> Tuple[str, str]:
+    """Return ``(body, etag)`` for the team's .ics, rendering on a miss."""
+    key = (team.id, tuple(response_cache.versions(_ICS_TABLES)))
+    cached = ics_cache.get(key)
+    if cached is not None:
+        return cached
+    # Shared by every caller under the current versions; read the primary
+    with primary_reads(db):
+        body = render_team_ics(db, team)
+    rendered = (body, make_etag(body.encode()))
+    ics_cache.set(key, rendered)
+    return rendered
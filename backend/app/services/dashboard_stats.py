@@ -0,0 +1,204 @@
+"""Aggregated dashboard statistics.
+
+All dashboard counters are computed by a single SELECT: one single-row
+``FILTER``-aggregate subquery per table, cross-joined together. The result
+is kept in a per-worker snapshot for ``DASHBOARD_SNAPSHOT_TTL_SECONDS`` so
+a dashboard page load costs at most one query per worker per TTL.
+
+On PostgreSQL the same SELECT can back a materialized view
+(``DASHBOARD_MATERIALIZED_VIEW``). It is created by migration ``007`` and
+refreshed by a background task, and snapshot misses then read one
+precomputed row.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import DateTime, func, literal_column, select, text, true
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User, UserRole
+from app.models.team import Team
+from app.models.player import Player
+from app.models.game import Game, GameStatus
+from app.models.event import Event
+
+logger = logging.getLogger(__name__)
+
+MATERIALIZED_VIEW = "dashboard_stats_mv"
+# pg_advisory_xact_lock key serializing refreshes across workers
+_REFRESH_LOCK_KEY = 0x68626473  # "hbds"
+
+_ACTIVE_GAME_STATUSES = (GameStatus.SCHEDULED, GameStatus.IN_PROGRESS)
+
+snapshot_cache = TTLCache(maxsize=1, ttl=settings.DASHBOARD_SNAPSHOT_TTL_SECONDS)
+
+
+def _role_column(role: UserRole) -> str:
+    return f"role_{role.name.lower()}"
+
+
+def build_stats_query(now, week_ago, in_30_days):
+    """Return the one-row SELECT holding every dashboard counter.
+
+    The time bounds are passed in so the live path can bind Python datetimes
+    while the materialized view evaluates them at refresh time.
+    """
+    teams = select(
+        func.count(Team.id).label("teams"),
+        func.count(Team.id).filter(Team.coach_id.is_(None)).label("teams_without_coach"),
+    ).subquery("t")
+
+    players = select(
+        func.count(Player.id).label("players"),
+        func.count(Player.id).filter(Player.team_id.is_(None)).label("players_without_team"),
+    ).subquery("p")
+
+    users = select(
+        func.count(User.id).label("users"),
+        func.count(User.id).filter(User.is_active.is_(True)).label("active_users"),
+        func.count(User.id).filter(User.created_at >= week_ago).label("new_users_7d"),
+        *(
+            func.count(User.id).filter(User.role == role).label(_role_column(role))
+            for role in UserRole
+        ),
+    ).subquery("u")
+
+    upcoming_game = (Game.scheduled_at >= now) & (Game.scheduled_at <= in_30_days)
+    games = select(
+        func.count(Game.id).label("games"),
+        func.count(Game.id).filter(Game.status.in_(_ACTIVE_GAME_STATUSES)).label("active_games"),
+        func.count(Game.id).filter(upcoming_game).label("games_30d"),
+        func.count(Game.id)
+        .filter(upcoming_game, Game.status.in_(_ACTIVE_GAME_STATUSES))
+        .label("upcoming_games"),
+    ).subquery("g")
+
+    events = select(
+        func.count(Event.id).label("events"),
+        func.count(Event.id)
+        .filter(Event.start_time >= now, Event.start_time <= in_30_days)
+        .label("events_30d"),
+    ).subquery("e")
+
+    return select(teams, players, users, games, events).select_from(
+        teams.join(players, true()).join(users, true()).join(games, true()).join(events, true())
+    )
+
+
+def _live_stats(db: Session) -> dict:
+    now = datetime.utcnow()
+    query = build_stats_query(now, now - timedelta(days=7), now + timedelta(days=30))
+    return dict(db.execute(query).mappings().one())
+
+
+def _materialized_view_enabled(db: Session) -> bool:
+    return (
+        settings.DASHBOARD_MATERIALIZED_VIEW
+        and db.get_bind().dialect.name == "postgresql"
+    )
+
+
+def get_dashboard_stats(db: Session) -> dict:
+    """Return the current counters, from the snapshot when it is fresh."""
+    stats = snapshot_cache.get("stats")
+    if stats is not None:
+        return stats
+
+    stats = None
+    if _materialized_view_enabled(db):
+        row = db.execute(text(f"SELECT * FROM {MATERIALIZED_VIEW}")).mappings().first()
+        if row is not None:
+            stats = dict(row)
+            stats.pop("refreshed_at")
+    if stats is None:
+        stats = _live_stats(db)
+
+    snapshot_cache.set("stats", stats)
+    return stats
+
+
+def users_by_role(stats: dict) -> dict:
+    """Per-role user counts, omitting roles nobody holds."""
+    return {
+        str(role): stats[_role_column(role)]
+        for role in UserRole
+        if stats[_role_column(role)]
+    }
+
+
+# ---------------------------------------------------------------------------
+# Materialized view (PostgreSQL only)
+# ---------------------------------------------------------------------------
+
+
+def create_materialized_view(conn: Connection) -> None:
+    """Create the dashboard materialized view and its unique index.
+
+    Called from the ``007`` migration. The view captures
+    ``build_stats_query`` as it is when the migration runs, so a change to
+    the query needs a migration that drops and recreates the view.
+    """
+    now = func.timezone("utc", func.now(), type_=DateTime())
+    query = build_stats_query(
+        now,
+        now - literal_column("interval '7 days'"),
+        now + literal_column("interval '30 days'"),
+    )
+    ddl = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    # One row; refreshed_at doubles as the unique key REFRESH ... CONCURRENTLY needs
+    conn.execute(text(
+        f"CREATE MATERIALIZED VIEW {MATERIALIZED_VIEW} AS "
+        f"SELECT timezone('utc', now()) AS refreshed_at, stats.* FROM ({ddl}) AS stats"
+    ))
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX ix_{MATERIALIZED_VIEW}_refreshed_at "
+        f"ON {MATERIALIZED_VIEW} (refreshed_at)"
+    ))
+
+
+def drop_materialized_view(conn: Connection) -> None:
+    conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {MATERIALIZED_VIEW}"))
+
+
+def refresh_materialized_view(engine: Engine, max_age: float) -> bool:
+    """Refresh the view unless another worker is doing it or just did.
+
+    Every worker runs the refresh task. The transaction-scoped advisory lock
+    (safe behind PgBouncer) lets one of them refresh at a time, and a view
+    younger than ``max_age`` seconds is left alone. CONCURRENTLY keeps the
+    view readable while it refreshes.
+    """
+    with engine.begin() as conn:
+        if not conn.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _REFRESH_LOCK_KEY}):
+            return False
+        age = conn.scalar(text(
+            f"SELECT EXTRACT(EPOCH FROM timezone('utc', now()) - refreshed_at) FROM {MATERIALIZED_VIEW}"
+        ))
+        if age is not None and age < max_age:
+            return False
+        conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {MATERIALIZED_VIEW}"))
+        return True
+
+
+async def refresh_materialized_view_forever(engine: Engine, interval: Optional[float] = None) -> None:
+    """Background task: keep the view at most about ``interval`` seconds old."""
+    interval = interval or settings.DASHBOARD_MATERIALIZED_VIEW_REFRESH_SECONDS
+    while True:
+        await asyncio.sleep(interval)
+        # Half the interval, so the first worker to wake after that refreshes
+        refresh = asyncio.ensure_future(
+            asyncio.to_thread(refresh_materialized_view, engine, interval / 2)
+        )
+        try:
+            await asyncio.shield(refresh)
+        except asyncio.CancelledError:
+            # Let a running refresh finish before shutdown disposes the engine
+            await asyncio.wait([refresh])
+            raise
+        except Exception as exc:
+            logger.warning("Dashboard materialized view refresh failed: %s", exc)
@@ -0,0 +1,246 @@
+"""Delta sync: which rows changed since a client's last sync.
+
+For every synced entity the caller gets the ids that were created or
+updated (``updated_at`` past the token) and the ids that were deleted
+(``tombstones`` past the token), limited to what the caller may see. Clients
+then fetch only the upserted rows, so a sync costs bytes proportional to the
+change set rather than to the data set.
+
+Deletes are recorded by ``after_delete`` mapper listeners. Bulk
+``query(...).delete()`` bypasses those, so such call sites tombstone the rows
+first with ``record_bulk_deletions``.
+
+Tokens are the server time the sync started. A row's ``updated_at`` is set
+at flush, so a transaction that flushed before a sync may commit after it;
+each sync therefore re-reads a short overlap before the token. Upserts are
+idempotent, so clients may see a few ids twice but never miss one.
+
+Rows that leave the caller's visibility (e.g. after a team change) are not
+reported as deleted; clients should run a full sync when their memberships
+change.
+"""
+import base64
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, event, insert, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.access_scope import AccessScope
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.game import Game
+from app.models.news import News
+from app.models.player import Player
+from app.models.team import Team
+from app.models.tombstone import Tombstone
+from app.models.user import User, UserRole
+from app.services.calendar import event_visibility, game_visibility
+
+SYNC_MODELS = {
+    "teams": Team,
+    "players": Player,
+    "games": Game,
+    "events": Event,
+    "news": News,
+    "attendance": Attendance,
+}
+
+_OVERLAP = timedelta(seconds=5)
+
+
+def encode_sync_token(at: datetime) -> str:
+    return base64.urlsafe_b64encode(at.isoformat().encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> datetime:
+    """Inverse of ``encode_sync_token``; raises 400 on a malformed token."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return datetime.fromisoformat(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token",
+        )
+
+
+# ---------------------------------------------------------------------------
+# Tombstones
+# ---------------------------------------------------------------------------
+
+
+def _team_of(connection, target) -> Optional[int]:
+    if isinstance(target, Team):
+        return target.id
+    if isinstance(target, Attendance):
+        if target.game_id:
+            return connection.scalar(select(Game.team_id).where(Game.id == target.game_id))
+        if target.event_id:
+            return connection.scalar(select(Event.team_id).where(Event.id == target.event_id))
+        return None
+    return target.team_id
+
+
+def _record_tombstone(mapper, connection, target):
+    connection.execute(insert(Tombstone).values(
+        entity=mapper.local_table.name,
+        entity_id=target.id,
+        team_id=_team_of(connection, target),
+        deleted_at=datetime.utcnow(),
+    ))
+
+
+for _model in SYNC_MODELS.values():
+    event.listen(_model, "after_delete", _record_tombstone)
+
+
+def record_bulk_deletions(db: Session, model, *criteria) -> None:
+    """Tombstone the rows a bulk ``query(model).filter(*criteria).delete()`` removes.
+
+    ``model`` must have a ``team_id`` column.
+    """
+    db.execute(insert(Tombstone).from_select(
+        ["entity", "entity_id", "team_id", "deleted_at"],
+        select(
+            literal(model.__tablename__),
+            model.id,
+            model.team_id,
+            literal(datetime.utcnow(), DateTime()),
+        ).where(*criteria),
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Visibility
+# ---------------------------------------------------------------------------
+
+
+def _visibility(entity: str, user: User, scope: AccessScope):
+    """Filter for the rows of ``entity`` the caller may see, or None for all."""
+    if entity == "games":
+        return game_visibility(user, scope)
+    if entity == "events":
+        return event_visibility(user, scope)
+
+    if entity == "news":
+        # Same rules as the news list; only staff sync unpublished drafts
+        if user.role == UserRole.PLAYER:
+            return (
+                ((News.team_id == scope.player_team_id) | News.team_id.is_(None))
+                & (News.is_published == True)
+            )
+        elif user.role == UserRole.PARENT:
+            return (
+                (News.team_id.in_(scope.child_team_ids) | News.team_id.is_(None))
+                & (News.is_published == True)
+            )
+        elif user.role == UserRole.COACH:
+            return (
+                News.team_id.in_(scope.coached_team_ids)
+                | News.team_id.is_(None)
+                | (News.author_id == user.id)
+            )
+        return None
+
+    if user.has_role(UserRole.PLAYER):
+        if entity == "teams":
+            return Team.id == scope.player_team_id
+        if entity == "players":
+            return (Player.team_id == scope.player_team_id) | (Player.id == scope.player_id)
+        return Attendance.player_id == scope.player_id
+    elif user.has_role(UserRole.PARENT):
+        if entity == "teams":
+            return Team.id.in_(scope.child_team_ids)
+        if entity == "players":
+            return Player.id.in_(scope.child_player_ids) | Player.team_id.in_(scope.child_team_ids)
+        return Attendance.player_id.in_(scope.child_player_ids)
+    elif user.has_role(UserRole.COACH):
+        if entity == "teams":
+            return Team.coach_id == user.id
+        if entity == "players":
+            return Player.team_id.in_(scope.coached_team_ids)
+        return Attendance.player_id.in_(
+            select(Player.id).where(Player.team_id.in_(scope.coached_team_ids))
+        )
+    return None
+
+
+def _unpublished_news(user: User, scope: AccessScope):
+    """News a non-staff caller must drop because it was unpublished."""
+    if user.role == UserRole.PLAYER:
+        teams = News.team_id == scope.player_team_id
+    elif user.role == UserRole.PARENT:
+        teams = News.team_id.in_(scope.child_team_ids)
+    else:
+        return None
+    return (teams | News.team_id.is_(None)) & (News.is_published == False)
+
+
+# ---------------------------------------------------------------------------
+# Sync
+# ---------------------------------------------------------------------------
+
+
+def changes_since(
+    db: Session,
+    user: User,
+    scope: AccessScope,
+    since: Optional[str],
+    entities: Sequence[str],
+) -> dict:
+    """Return a ``SyncResponse`` as a response dict.
+
+    Without ``since`` this is a full sync: ``upserted`` lists every visible
+    id and the client should drop anything else it holds.
+    """
+    now = datetime.utcnow()
+    cutoff = decode_sync_token(since) - _OVERLAP if since else None
+    changes = {entity: {"upserted": [], "deleted": []} for entity in entities}
+
+    selects = []
+    for entity in entities:
+        model = SYNC_MODELS[entity]
+        stmt = select(literal(entity).label("entity"), literal("upserted").label("op"), model.id.label("id"))
+        visible = _visibility(entity, user, scope)
+        if visible is not None:
+            stmt = stmt.where(visible)
+        if cutoff is not None:
+            stmt = stmt.where(model.updated_at >= cutoff)
+        selects.append(stmt)
+
+        if entity == "news" and cutoff is not None:
+            unpublished = _unpublished_news(user, scope)
+            if unpublished is not None:
+                selects.append(
+                    select(literal(entity), literal("deleted"), News.id)
+                    .where(unpublished, News.updated_at >= cutoff)
+                )
+
+    if cutoff is not None:
+        tombstones = select(Tombstone.entity, literal("deleted"), Tombstone.entity_id).where(
+            Tombstone.entity.in_(entities),
+            Tombstone.deleted_at >= cutoff,
+        )
+        if user.has_any_role([UserRole.PLAYER, UserRole.PARENT, UserRole.COACH]):
+            tombstones = tombstones.where(or_(
+                Tombstone.team_id.in_(scope.visible_team_ids),
+                Tombstone.team_id.is_(None),
+            ))
+        selects.append(tombstones)
+
+    if selects:
+        merged = selects[0] if len(selects) == 1 else union_all(*selects)
+        for entity, op, row_id in db.execute(merged):
+            changes[entity][op].append(row_id)
+
+    for lists in changes.values():
+        lists["upserted"] = sorted(set(lists["upserted"]))
+        lists["deleted"] = sorted(set(lists["deleted"]) - set(lists["upserted"]))
+
+    return {
+        "sync_token": encode_sync_token(now),
+        "full": since is None,
+        "changes": changes,
+    }
@@ -1,3 +1,4 @@
 from app.websocket.manager import manager, ConnectionManager
+from app.websocket.broker import Broker, InMemoryBroker, RedisBroker, create_broker
 
-__all__ = ["manager", "ConnectionManager"]
+__all__ = ["manager", "ConnectionManager", "Broker", "InMemoryBroker", "RedisBroker", "create_broker"]
@@ -0,0 +1,129 @@
+"""Authorization helpers for the ``/ws`` endpoint.
+
+The socket's user is resolved at authentication time. Team subscriptions are
+then checked against the user's cached ``AccessScope``, which the
+access-scope invalidation listeners drop whenever memberships change. Only a
+cache miss touches the database, and that work runs on the DB thread pool so
+the event loop keeps serving other sockets.
+
+Open sockets outlive the checks made when they subscribed. After a commit
+that changes memberships or writes a user, every process is told (over the
+broker's ``access`` channel) to reload the affected users, close the sockets
+of those that were deactivated or deleted, and drop team subscriptions they
+no longer pass.
+"""
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Dict, Iterable, List, Optional
+
+from app.core import access_scope, principal
+from app.core.access_scope import AccessScope, resolve_access_scope, scope_cache
+from app.core.permissions import can_access_team
+from app.db.executor import run_in_db_thread
+from app.db.session import SessionLocal
+from app.models.user import User, UserRole
+from app.websocket.manager import manager
+
+logger = logging.getLogger(__name__)
+
+# Users behind this process's open sockets, keyed by user id and replaced by
+# ``revalidate`` with a freshly loaded copy
+_users: Dict[int, User] = {}
+
+
+def _load_user(email: str) -> Optional[User]:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if user is None or not user.is_active:
+            return None
+        # Detach with its loaded columns; only role fields are read later
+        db.expunge(user)
+        return user
+    finally:
+        db.close()
+
+
+def _resolve_scope(user: User) -> AccessScope:
+    db = SessionLocal()
+    try:
+        return resolve_access_scope(user, db)
+    finally:
+        db.close()
+
+
+async def authenticate(email: str) -> Optional[User]:
+    """Resolve the active user behind a JWT subject, or None."""
+    user = await run_in_db_thread(_load_user, email)
+    if user is None:
+        return None
+    if not user.has_any_role([UserRole.ADMIN, UserRole.SUPERVISOR]):
+        # Warm the scope so the first subscriptions are answered from memory
+        await run_in_db_thread(_resolve_scope, user)
+    _users[user.id] = user
+    return user
+
+
+def current_user(user: User) -> User:
+    """The latest revalidated copy of a connected ``user``."""
+    return _users.get(user.id, user)
+
+
+def release(user_id: int) -> None:
+    """Forget ``user_id`` once its last socket on this process is gone."""
+    if user_id not in manager.active_connections:
+        _users.pop(user_id, None)
+
+
+async def can_subscribe(user: User, team_id: int) -> bool:
+    """Same rules as ``can_access_team``, without blocking the event loop."""
+    if user.has_any_role([UserRole.ADMIN, UserRole.SUPERVISOR]):
+        return True
+    scope = scope_cache.get(user.id)
+    if scope is None:
+        scope = await run_in_db_thread(_resolve_scope, user)
+    return can_access_team(user, team_id, None, scope)
+
+
+async def revalidate(emails: Optional[List[str]] = None) -> None:
+    """Re-authorize the local sockets of ``emails``, or of every user."""
+    stale = [user for user in list(_users.values()) if emails is None or user.email in emails]
+    for old in stale:
+        # Reload by the JWT subject, so an email change drops the socket just
+        # like it invalidates the token for the REST API
+        user = await run_in_db_thread(_load_user, old.email)
+        if old.id not in manager.active_connections:
+            continue
+        if user is None or user.id != old.id:
+            logger.info("Closing WebSocket connections of deactivated user_id=%s", old.id)
+            sockets = list(manager.active_connections[old.id].values())
+            manager.disconnect(old.id)
+            _users.pop(old.id, None)
+            for websocket in sockets:
+                with suppress(Exception):
+                    await websocket.close(code=1008)  # policy violation
+            continue
+
+        _users[user.id] = user
+        for team_id in sorted(manager.user_subscriptions.get(user.id, ())):
+            if not await can_subscribe(user, team_id):
+                manager.unsubscribe_from_team(user.id, team_id)
+                await manager.send_local(
+                    {"type": "unsubscribed", "team_id": team_id, "reason": "access_revoked"},
+                    user.id,
+                )
+
+
+def _publish_access_change(emails: Optional[Iterable[str]] = None) -> None:
+    # Invalidations fire after commit on whichever thread committed; hand the
+    # publish to the event loop the WebSocket manager runs on.
+    loop = manager.loop
+    if loop is None or loop.is_closed():
+        return
+    asyncio.run_coroutine_threadsafe(manager.publish_access_change(emails), loop)
+
+
+manager.access_handler = revalidate
+access_scope.add_invalidation_listener(_publish_access_change)
+principal.add_invalidation_listener(_publish_access_change)
@@ -0,0 +1,125 @@
+"""Message brokers that fan WebSocket messages out across processes.
+
+A ``ConnectionManager`` only knows the sockets connected to its own process.
+Instead of writing to sockets directly, it publishes each message once to a
+broker channel (``team:<id>``, ``user:<id>``, ``all``, or ``access`` to
+re-authorize sockets after a membership or user change); every process
+subscribed to the broker receives it and delivers it to its local sockets.
+
+``InMemoryBroker`` is the single-process default. It also serves as the fake
+in tests: attaching several managers to one instance simulates several
+workers. ``RedisBroker`` uses Redis pub/sub and is selected when
+``REDIS_URL`` is configured.
+"""
+import abc
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, str], Awaitable[None]]
+
+
+class Broker(abc.ABC):
+    """Publish/subscribe interface used by the ConnectionManager."""
+
+    def __init__(self):
+        self._handlers: List[Handler] = []
+
+    def add_handler(self, handler: Handler) -> None:
+        """Register a coroutine called with (channel, payload) for every message."""
+        self._handlers.append(handler)
+
+    async def _dispatch(self, channel: str, payload: str) -> None:
+        for handler in self._handlers:
+            try:
+                await handler(channel, payload)
+            except Exception as exc:
+                logger.error("WebSocket delivery failed on %s: %s", channel, exc, exc_info=True)
+
+    @abc.abstractmethod
+    async def publish(self, channel: str, payload: str) -> None:
+        """Send ``payload`` to every process subscribed to ``channel``."""
+
+    @abc.abstractmethod
+    async def start(self) -> None:
+        """Start receiving messages (called from the app lifespan)."""
+
+    @abc.abstractmethod
+    async def stop(self) -> None:
+        """Stop receiving messages and release connections."""
+
+
+class InMemoryBroker(Broker):
+    """Delivers published messages straight to the handlers of this process."""
+
+    async def publish(self, channel: str, payload: str) -> None:
+        await self._dispatch(channel, payload)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class RedisBroker(Broker):
+    """Redis pub/sub broker: publish once, every subscribed process delivers."""
+
+    def __init__(self, url: str, prefix: str = "handball:ws:", reconnect_delay: float = 1.0):
+        super().__init__()
+        import redis.asyncio as aioredis
+
+        self.prefix = prefix
+        self.reconnect_delay = reconnect_delay
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, channel: str, payload: str) -> None:
+        try:
+            await self._redis.publish(self.prefix + channel, payload)
+        except Exception as exc:
+            logger.warning("Redis publish to %s failed: %s", channel, exc)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._redis.aclose()
+
+    async def _listen(self) -> None:
+        # Keep the subscription alive across Redis restarts
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(self.prefix + "*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    channel = message["channel"][len(self.prefix):]
+                    await self._dispatch(channel, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Redis subscription lost, reconnecting: %s", exc)
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                await pubsub.aclose()
+
+
+def create_broker() -> Broker:
+    """Redis pub/sub when REDIS_URL is set, otherwise in-process delivery."""
+    if settings.REDIS_URL:
+        return RedisBroker(settings.REDIS_URL)
+    return InMemoryBroker()
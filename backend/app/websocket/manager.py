@@ -1,75 +1,183 @@
+import asyncio
 import json
 import logging
-from typing import Dict, Set
+import uuid
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
 from fastapi import WebSocket
+from starlette.websockets import WebSocketState
+
+from app.core.config import settings
+from app.websocket.broker import Broker, InMemoryBroker, create_broker
 
 logger = logging.getLogger(__name__)
 
 
 class ConnectionManager:
-    def __init__(self):
-        # active_connections: {user_id: WebSocket}
-        self.active_connections: Dict[int, WebSocket] = {}
+    """Tracks this process's sockets and delivers broker messages to them.
+
+    Sends go through ``broker``: the message is published once and every
+    process (including this one) delivers it to its own local sockets.
+    """
+
+    def __init__(self, broker: Optional[Broker] = None, send_timeout: Optional[float] = None):
+        # active_connections: {user_id: {connection_id: WebSocket}} - one
+        # entry per open tab / device
+        self.active_connections: Dict[int, Dict[str, WebSocket]] = {}
         # team_subscriptions: {team_id: set(user_ids)}
         self.team_subscriptions: Dict[int, Set[int]] = {}
+        # user_subscriptions: {user_id: set(team_ids)} - reverse index so
+        # disconnect/unsubscribe only touch that user's teams
+        self.user_subscriptions: Dict[int, Set[int]] = {}
+        # A socket that cannot take a message within send_timeout is dropped,
+        # so one slow client never stalls the fan-out to everyone else.
+        self.send_timeout = (
+            send_timeout if send_timeout is not None else settings.WEBSOCKET_SEND_TIMEOUT_SECONDS
+        )
+        self.broker = broker or InMemoryBroker()
+        self.broker.add_handler(self._deliver)
+        # Event loop the manager was started on, so threadpool code can
+        # schedule sends onto it
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Pending closes of dropped slow sockets; the loop only keeps weak
+        # references to tasks, so hold them until they finish
+        self._close_tasks: Set[asyncio.Task] = set()
+        # Re-authorizes this process's sockets when an ``access`` message
+        # arrives; called with the affected emails, or None for every user
+        self.access_handler: Optional[Callable[[Optional[List[str]]], Awaitable[None]]] = None
 
-    async def connect(self, websocket: WebSocket, user_id: int):
-        await websocket.accept()
-        self.active_connections[user_id] = websocket
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        await self.broker.start()
 
-    def disconnect(self, user_id: int):
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
+    async def stop(self):
+        await self.broker.stop()
+        self.loop = None
 
-        # Remove from all team subscriptions
-        for team_id, users in self.team_subscriptions.items():
-            users.discard(user_id)
+    @property
+    def connection_count(self) -> int:
+        """Open sockets on this process, counting every device of a user."""
+        return sum(len(connections) for connections in self.active_connections.values())
+
+    async def connect(self, websocket: WebSocket, user_id: int) -> str:
+        """Register ``websocket`` for ``user_id`` and return its connection id."""
+        if websocket.client_state == WebSocketState.CONNECTING:
+            await websocket.accept()
+        return self.add_connection(websocket, user_id)
+
+    def add_connection(self, websocket: WebSocket, user_id: int) -> str:
+        connection_id = uuid.uuid4().hex
+        self.active_connections.setdefault(user_id, {})[connection_id] = websocket
+        return connection_id
+
+    def disconnect(self, user_id: int, connection_id: Optional[str] = None):
+        """Drop one connection, or all of them when ``connection_id`` is None.
+
+        Team subscriptions belong to the user and are removed once their
+        last connection is gone.
+        """
+        connections = self.active_connections.get(user_id)
+        if connections is not None and connection_id is not None:
+            connections.pop(connection_id, None)
+            if connections:
+                return
+        self.active_connections.pop(user_id, None)
+
+        # Remove from the user's team subscriptions
+        for team_id in self.user_subscriptions.pop(user_id, set()):
+            self._discard_subscriber(team_id, user_id)
 
     def subscribe_to_team(self, user_id: int, team_id: int):
-        if team_id not in self.team_subscriptions:
-            self.team_subscriptions[team_id] = set()
-        self.team_subscriptions[team_id].add(user_id)
+        self.team_subscriptions.setdefault(team_id, set()).add(user_id)
+        self.user_subscriptions.setdefault(user_id, set()).add(team_id)
 
     def unsubscribe_from_team(self, user_id: int, team_id: int):
-        if team_id in self.team_subscriptions:
-            self.team_subscriptions[team_id].discard(user_id)
+        self._discard_subscriber(team_id, user_id)
+        teams = self.user_subscriptions.get(user_id)
+        if teams is not None:
+            teams.discard(team_id)
+            if not teams:
+                del self.user_subscriptions[user_id]
+
+    def _discard_subscriber(self, team_id: int, user_id: int):
+        users = self.team_subscriptions.get(team_id)
+        if users is not None:
+            users.discard(user_id)
+            # Prune empty teams so long-running workers don't accumulate them
+            if not users:
+                del self.team_subscriptions[team_id]
 
     async def send_personal_message(self, message: dict, user_id: int):
-        if user_id in self.active_connections:
-            await self.active_connections[user_id].send_text(json.dumps(message))
+        await self.broker.publish(f"user:{user_id}", json.dumps(message))
 
     async def broadcast_to_team(self, message: dict, team_id: int):
-        if team_id in self.team_subscriptions:
-            disconnected = []
-            for user_id in self.team_subscriptions[team_id]:
-                if user_id in self.active_connections:
-                    try:
-                        await self.active_connections[user_id].send_text(json.dumps(message))
-                    except (ConnectionError, RuntimeError) as exc:
-                        logger.warning(
-                            "Failed to send to user_id=%s on team_id=%s: %s",
-                            user_id, team_id, exc,
-                        )
-                        disconnected.append(user_id)
-
-            # Clean up disconnected users
-            for user_id in disconnected:
-                self.disconnect(user_id)
+        await self.broker.publish(f"team:{team_id}", json.dumps(message))
 
     async def broadcast(self, message: dict):
         """Broadcast to all connected clients"""
-        disconnected = []
-        for user_id, connection in self.active_connections.items():
-            try:
-                await connection.send_text(json.dumps(message))
-            except (ConnectionError, RuntimeError) as exc:
-                logger.warning("Broadcast failed for user_id=%s: %s", user_id, exc)
-                disconnected.append(user_id)
+        await self.broker.publish("all", json.dumps(message))
+
+    async def publish_access_change(self, emails: Optional[Iterable[str]] = None):
+        """Ask every process to re-authorize the sockets of ``emails`` (or all users)."""
+        await self.broker.publish("access", json.dumps(sorted(emails) if emails is not None else None))
+
+    async def send_local(self, message: dict, user_id: int):
+        """Send to ``user_id``'s sockets on this process only."""
+        await self._deliver(f"user:{user_id}", json.dumps(message))
+
+    # ------------------------------------------------------------------
+    # Local delivery (called by the broker in every process)
+    # ------------------------------------------------------------------
+
+    async def _deliver(self, channel: str, payload: str):
+        kind, _, key = channel.partition(":")
+        if kind == "team":
+            recipients = self.team_subscriptions.get(int(key), set())
+        elif kind == "user":
+            recipients = [int(key)]
+        elif kind == "all":
+            recipients = self.active_connections.keys()
+        elif kind == "access":
+            if self.access_handler is not None:
+                await self.access_handler(json.loads(payload))
+            return
+        else:
+            logger.warning("Ignoring message on unknown channel %s", channel)
+            return
+
+        targets = [
+            (user_id, connection_id, websocket)
+            for user_id in list(recipients)
+            for connection_id, websocket in list(self.active_connections.get(user_id, {}).items())
+        ]
+        # payload is already serialized; send to every socket concurrently
+        results = await asyncio.gather(
+            *(self._send(websocket, payload) for _, _, websocket in targets),
+            return_exceptions=True,
+        )
+
+        # Clean up disconnected and slow connections
+        for (user_id, connection_id, websocket), result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Dropping user_id=%s connection=%s on %s: %s",
+                    user_id, connection_id, channel, repr(result),
+                )
+                self.disconnect(user_id, connection_id)
+                if isinstance(result, asyncio.TimeoutError):
+                    task = asyncio.create_task(self._close_quietly(websocket))
+                    self._close_tasks.add(task)
+                    task.add_done_callback(self._close_tasks.discard)
+
+    async def _send(self, websocket: WebSocket, payload: str):
+        await asyncio.wait_for(websocket.send_text(payload), timeout=self.send_timeout)
 
-        # Clean up disconnected users
-        for user_id in disconnected:
-            self.disconnect(user_id)
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # try again later
+        except Exception:
+            pass
 
 
 # Global connection manager instance
-manager = ConnectionManager()
+manager = ConnectionManager(create_broker())
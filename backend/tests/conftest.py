@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 os.environ["SECRET_KEY"] = "test-secret-key-not-for-production-use"
 os.environ["FRONTEND_URL"] = "http://localhost:3000"
+os.environ["REDIS_URL"] = ""  # WebSocket fan-out stays in-process
 
 from sqlalchemy import create_engine, event as sa_event
 from sqlalchemy.orm import sessionmaker
@@ -15,6 +16,11 @@ from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
 from app.db.session import Base, get_db
+from app.core.principal import principal_cache
+from app.core.access_scope import scope_cache
+from app.services.dashboard_stats import snapshot_cache
+from app.core.response_cache import response_cache
+from app.services.calendar import ics_cache
 from app.core.security import create_access_token, create_refresh_token, get_password_hash
 from app.models.user import User, UserRole
 from app.models.team import Team
@@ -55,6 +61,12 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_
 @pytest.fixture(autouse=True)
 def db():
     """Create a clean database for every test."""
+    # Row ids are reused across tests, so cached principals must not leak.
+    principal_cache.clear()
+    scope_cache.clear()
+    snapshot_cache.clear()
+    response_cache.clear()
+    ics_cache.clear()
     Base.metadata.create_all(bind=test_engine)
     session = TestingSessionLocal()
     try:
@@ -80,6 +92,32 @@ def client(db):
     app.dependency_overrides.clear()
 
 
+class _StatementLog:
+    """Records the SQL sent to the test engine inside a ``with`` block."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        self.statements = []
+        sa_event.listen(test_engine, "before_cursor_execute", self._record)
+        return self.statements
+
+    def __exit__(self, *exc):
+        sa_event.remove(test_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@pytest.fixture()
+def statement_log():
+    """``with statement_log as statements:`` collects the SQL run in the block."""
+    log = _StatementLog()
+    yield log
+    if sa_event.contains(test_engine, "before_cursor_execute", log._record):
+        sa_event.remove(test_engine, "before_cursor_execute", log._record)
+
 # ---------------------------------------------------------------------------
 # User helpers
 # ---------------------------------------------------------------------------
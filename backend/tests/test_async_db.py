@@ -0,0 +1,134 @@
+"""Tests for the opt-in async read path (app.db.async_session)."""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Depends
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.access_scope import get_access_scope
+from app.core.deps import get_current_user
+from app.db.async_session import (
+    ReadSession,
+    async_database_url,
+    create_engine_for,
+    get_access_scope_async,
+    get_async_db,
+    get_current_user_async,
+    get_read_db,
+)
+from app.db.session import Base, get_db
+from app.main import app
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.event import Event, EventType
+from app.models.game import Game, GameStatus, GameType
+from app.models.news import News
+from app.models.player import Player
+from app.models.team import Team
+from app.models.user import UserRole
+from tests.conftest import _auth_header, _make_user
+
+
+class TestAsyncDatabaseUrl:
+    def test_swaps_driver(self):
+        assert async_database_url("postgresql://u:p@db:5432/hm") == "postgresql+asyncpg://u:p@db:5432/hm"
+        assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+        assert async_database_url("postgresql+asyncpg://db/hm") == "postgresql+asyncpg://db/hm"
+
+
+class TestAsyncReadEndpoints:
+    @pytest.fixture()
+    def async_client(self, client, tmp_path):
+        """Serve reads, principal and scope through an AsyncSession on a file database shared with get_db."""
+        url = f"sqlite:///{tmp_path / 'async.db'}"
+        sync_engine = create_engine(url)
+        Base.metadata.create_all(bind=sync_engine)
+        session = sessionmaker(bind=sync_engine)()
+        async_engine = create_engine_for(async_database_url(url))
+        factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def _async_db():
+            async with factory() as async_session:
+                yield async_session
+
+        def _async_read_db(async_session=Depends(get_async_db)):
+            return ReadSession(async_session)
+
+        app.dependency_overrides[get_db] = lambda: session
+        app.dependency_overrides[get_async_db] = _async_db
+        app.dependency_overrides[get_read_db] = _async_read_db
+        # In sync mode get_read_user / get_read_scope are these two
+        app.dependency_overrides[get_current_user] = get_current_user_async
+        app.dependency_overrides[get_access_scope] = get_access_scope_async
+        yield client, session
+        session.close()
+        client.portal.call(async_engine.dispose)
+        sync_engine.dispose()
+
+    def _seed(self, db):
+        coach = _make_user(db, email="async.coach@test.com", role=UserRole.COACH)
+        player_user = _make_user(db, email="async.player@test.com", role=UserRole.PLAYER)
+        team = Team(name="Async FC", age_group="U18", coach_id=coach.id)
+        db.add(team)
+        db.commit()
+        player = Player(user_id=player_user.id, team_id=team.id, jersey_number=9)
+        game = Game(
+            team_id=team.id,
+            opponent="Await United",
+            location="Event Loop Arena",
+            scheduled_at=datetime.utcnow() + timedelta(days=2),
+            game_type=GameType.LEAGUE,
+            status=GameStatus.SCHEDULED,
+            is_home_game=True,
+        )
+        db.add_all([player, game])
+        db.commit()
+        db.add_all([
+            Event(
+                title="Async Training",
+                team_id=team.id,
+                event_type=EventType.TRAINING,
+                location="Event Loop Arena",
+                start_time=datetime.utcnow() + timedelta(days=1),
+                end_time=datetime.utcnow() + timedelta(days=1, hours=2),
+            ),
+            News(
+                title="Awaited Win",
+                content="Non-blocking all game long.",
+                team_id=team.id,
+                author_id=coach.id,
+                is_published=True,
+                published_at=datetime.utcnow(),
+            ),
+            Attendance(player_id=player.id, game_id=game.id, status=AttendanceStatus.PRESENT),
+        ])
+        db.commit()
+        return coach
+
+    def test_lists_and_dashboard(self, async_client):
+        client, db = async_client
+        coach = self._seed(db)
+        coach_id = coach.id
+        headers = _auth_header(coach)
+
+        players = client.get("/api/v1/players/", headers=headers).json()
+        assert players["total"] == 1
+        assert players["items"][0]["user"]["email"] == "async.player@test.com"
+
+        games = client.get("/api/v1/games/", headers=headers).json()
+        assert [g["opponent"] for g in games["items"]] == ["Await United"]
+
+        events = client.get("/api/v1/events/", headers=headers).json()
+        assert [(e["title"], e["event_type"]) for e in events["items"]] == [("Async Training", "training")]
+
+        news = client.get("/api/v1/news/", headers=headers).json()
+        assert [(n["title"], n["author_id"]) for n in news["items"]] == [("Awaited Win", coach_id)]
+
+        attendance = client.get("/api/v1/attendance/", headers=headers).json()
+        assert attendance["total"] == 1
+        assert attendance["items"][0]["status"] == "present"
+
+        stats = client.get("/api/v1/dashboard/stats", headers=headers).json()
+        assert stats["total_players"] == 1
+        assert stats["upcoming_games"] == 1
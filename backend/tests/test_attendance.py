@@ -1,6 +1,7 @@
 """Tests for Attendance endpoints."""
 from tests.conftest import _make_user, _auth_header
 from app.models.user import UserRole
+from app.models.attendance import Attendance
 
 
 class TestGetAttendance:
@@ -87,6 +88,58 @@ class TestBulkAttendance:
         assert resp.status_code == 200
         assert len(resp.json()) == 1
 
+    def test_bulk_update_upserts_existing(self, client, coach_headers, attendance_record, player_profile, game):
+        resp = client.post(
+            f"/api/v1/attendance/bulk-update?game_id={game.id}",
+            headers=coach_headers,
+            json={"player_ids": [player_profile.id], "status": "absent", "notes": "ill"},
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body) == 1
+        assert body[0]["id"] == attendance_record.id
+        assert body[0]["status"] == "absent"
+        assert body[0]["notes"] == "ill"
+
+    def test_bulk_update_per_player_entries(self, client, db, coach_headers, team, player_profile, event_obj):
+        from app.models.player import Player
+
+        teammate = _make_user(db, email="rollcall@test.com", role=UserRole.PLAYER)
+        other = Player(user_id=teammate.id, team_id=team.id)
+        db.add(other)
+        db.commit()
+        db.refresh(other)
+
+        resp = client.post(
+            f"/api/v1/attendance/bulk-update?event_id={event_obj.id}",
+            headers=coach_headers,
+            json={"entries": [
+                {"player_id": player_profile.id, "status": "present"},
+                {"player_id": other.id, "status": "excused", "notes": "school trip"},
+            ]},
+        )
+        assert resp.status_code == 200
+        by_player = {r["player_id"]: r for r in resp.json()}
+        assert by_player[player_profile.id]["status"] == "present"
+        assert by_player[other.id]["status"] == "excused"
+
+    def test_bulk_update_requires_targets(self, client, coach_headers, game):
+        resp = client.post(
+            f"/api/v1/attendance/bulk-update?game_id={game.id}",
+            headers=coach_headers,
+            json={"status": "present"},
+        )
+        assert resp.status_code == 422
+
+    def test_bulk_update_rejects_game_and_event(self, client, db, coach_headers, player_profile, game, event_obj):
+        resp = client.post(
+            f"/api/v1/attendance/bulk-update?game_id={game.id}&event_id={event_obj.id}",
+            headers=coach_headers,
+            json={"player_ids": [player_profile.id], "status": "present"},
+        )
+        assert resp.status_code == 400
+        assert db.query(Attendance).count() == 0
+
     def test_player_cannot_bulk_update(self, client, player_headers, player_profile, game):
         resp = client.post(
             f"/api/v1/attendance/bulk-update?game_id={game.id}",
@@ -99,6 +152,85 @@ class TestBulkAttendance:
         assert resp.status_code == 403
 
 
+class TestInitializeEventAttendance:
+    def test_creates_pending_records_once(self, client, db, coach_headers, team, event_obj, player_profile):
+        from app.models.player import Player
+
+        teammate = _make_user(db, email="teammate@test.com", role=UserRole.PLAYER)
+        db.add(Player(user_id=teammate.id, team_id=team.id))
+        db.commit()
+
+        url = f"/api/v1/attendance/event/{event_obj.id}/initialize"
+        resp = client.post(url, headers=coach_headers)
+        assert resp.status_code == 201
+        assert resp.json()["created"] == 2
+
+        # Re-running skips players who already have a record
+        resp = client.post(url, headers=coach_headers)
+        assert resp.json()["created"] == 0
+
+        records = client.get(
+            f"/api/v1/attendance/?event_id={event_obj.id}", headers=coach_headers
+        ).json()["items"]
+        assert {r["status"] for r in records} == {"pending"}
+
+    def test_other_coach_denied(self, client, db, team, event_obj):
+        other = _make_user(db, email="other.coach@test.com", role=UserRole.COACH)
+        resp = client.post(
+            f"/api/v1/attendance/event/{event_obj.id}/initialize",
+            headers=_auth_header(other),
+        )
+        assert resp.status_code == 403
+
+
+class TestEventAttendanceSummary:
+    def _seed(self, db, team, event_obj, player_profile):
+        from app.models.attendance import Attendance, AttendanceStatus
+        from app.models.player import Player
+
+        silent = _make_user(db, email="silent@test.com", role=UserRole.PLAYER, first_name="Silent")
+        silent_player = Player(user_id=silent.id, team_id=team.id, jersey_number=9)
+        db.add(silent_player)
+        db.add(Attendance(
+            player_id=player_profile.id, event_id=event_obj.id, status=AttendanceStatus.PRESENT
+        ))
+        db.commit()
+        return silent_player
+
+    def test_summary_counts_and_unresponded(self, client, db, coach_headers, team, event_obj, player_profile):
+        silent_player = self._seed(db, team, event_obj, player_profile)
+        resp = client.get(
+            f"/api/v1/attendance/event/{event_obj.id}/summary", headers=coach_headers
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total_players"] == 2
+        assert body["responded"] == 1
+        assert body["present"] == 1
+        assert body["pending"] == 1
+        assert body["attendance_rate"] == 50.0
+        assert [r["player_id"] for r in body["records"]] == [player_profile.id]
+        assert [u["player_id"] for u in body["unresponded"]] == [silent_player.id]
+
+    def test_counts_only(self, client, db, coach_headers, team, event_obj, player_profile):
+        self._seed(db, team, event_obj, player_profile)
+        resp = client.get(
+            f"/api/v1/attendance/event/{event_obj.id}/summary?fields=counts",
+            headers=coach_headers,
+        )
+        body = resp.json()
+        assert body["present"] == 1
+        assert "records" not in body
+        assert "unresponded" not in body
+
+    def test_unknown_field(self, client, coach_headers, event_obj):
+        resp = client.get(
+            f"/api/v1/attendance/event/{event_obj.id}/summary?fields=bogus",
+            headers=coach_headers,
+        )
+        assert resp.status_code == 400
+
+
 class TestAttendanceStats:
     def test_get_player_stats(self, client, coach_headers, attendance_record, player_profile):
         resp = client.get(
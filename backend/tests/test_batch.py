@@ -0,0 +1,125 @@
+"""Tests for the POST /batch/ endpoint."""
+from types import SimpleNamespace
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core import deps
+from app.core.access_scope import get_access_scope
+from app.core.config import settings
+from app.db.session import get_db
+from app.main import app
+
+
+def _batch(client, headers, *requests):
+    return client.post("/api/v1/batch/", json={"requests": list(requests)}, headers=headers)
+
+
+class TestBatch:
+    def test_app_start_requests(self, client, coach_headers, coach_user, team, game, event_obj, news_item):
+        resp = _batch(
+            client, coach_headers,
+            {"id": "me", "path": "/api/v1/auth/me"},
+            {"id": "teams", "path": "/api/v1/teams/"},
+            {"id": "calendar", "path": "/api/v1/games/calendar/upcoming"},
+            {"id": "events", "path": "/api/v1/events/?upcoming=true"},
+            {"id": "news", "path": "/api/v1/news/"},
+        )
+        assert resp.status_code == 200
+        results = {r["id"]: r for r in resp.json()["responses"]}
+        assert [r["id"] for r in resp.json()["responses"]] == ["me", "teams", "calendar", "events", "news"]
+        assert all(r["status"] == 200 for r in results.values())
+        assert results["me"]["body"]["email"] == coach_user.email
+        assert results["teams"]["body"]["items"][0]["id"] == team.id
+        assert results["calendar"]["body"][0]["id"] == game.id
+        assert results["news"]["body"]["items"][0]["id"] == news_item.id
+
+    def test_sub_request_errors_are_isolated(self, client, coach_headers, team):
+        resp = _batch(
+            client, coach_headers,
+            {"id": "missing", "path": "/api/v1/games/999"},
+            {"id": "team", "path": f"/api/v1/teams/{team.id}"},
+        )
+        assert resp.status_code == 200
+        missing, found = resp.json()["responses"]
+        assert missing["status"] == 404
+        assert missing["body"] == {"detail": "Game not found"}
+        assert found["status"] == 200
+
+    def test_server_error_rolls_back_shared_session(self, client, coach_headers, team, game, monkeypatch):
+        rollbacks = []
+        real_rollback = Session.rollback
+
+        def rollback(session):
+            rollbacks.append(session)
+            real_rollback(session)
+
+        def broken_scope():
+            app.dependency_overrides.pop(get_access_scope)
+            raise OperationalError("SELECT 1", {}, Exception("current transaction is aborted"))
+
+        monkeypatch.setattr(Session, "rollback", rollback)
+        app.dependency_overrides[get_access_scope] = broken_scope
+        resp = _batch(
+            client, coach_headers,
+            {"id": "broken", "path": f"/api/v1/games/{game.id}"},
+            {"id": "missing", "path": "/api/v1/games/999"},
+            {"id": "team", "path": f"/api/v1/teams/{team.id}"},
+        )
+        app.dependency_overrides.pop(get_access_scope, None)
+        assert [r["status"] for r in resp.json()["responses"]] == [500, 404, 200]
+        assert len(rollbacks) == 1
+
+    def test_sub_requests_keep_caller_permissions(self, client, parent_headers, team):
+        resp = _batch(client, parent_headers, {"id": "team", "path": f"/api/v1/teams/{team.id}"})
+        assert resp.json()["responses"][0]["status"] == 403
+
+    def test_etag_revalidation(self, client, coach_headers, game):
+        first = _batch(client, coach_headers, {"id": "g", "path": f"/api/v1/games/{game.id}"})
+        etag = first.json()["responses"][0]["headers"]["etag"]
+
+        again = _batch(
+            client, coach_headers,
+            {"id": "g", "path": f"/api/v1/games/{game.id}", "headers": {"If-None-Match": etag}},
+        )
+        sub = again.json()["responses"][0]
+        assert sub["status"] == 304
+        assert sub["body"] is None
+
+    def test_cache_key_does_not_leak_between_sub_requests(self, client, coach_headers, team, game):
+        # games/ is cached; teams/ is on a cached router but not cached itself
+        _batch(
+            client, coach_headers,
+            {"id": "games", "path": "/api/v1/games/"},
+            {"id": "teams", "path": "/api/v1/teams/"},
+        )
+        resp = client.get("/api/v1/games/", headers=coach_headers)
+        assert resp.json()["items"][0]["id"] == game.id
+        assert resp.json()["items"][0]["opponent"] == "Rival FC"
+
+    def test_requires_auth(self, client):
+        resp = client.post("/api/v1/batch/", json={"requests": [{"id": "me", "path": "/api/v1/auth/me"}]})
+        assert resp.status_code == 401
+
+    def test_rejects_foreign_and_recursive_paths(self, client, coach_headers):
+        for path in ("/health", "/api/v1/batch/", "/api/v1/batch"):
+            resp = _batch(client, coach_headers, {"id": "x", "path": path})
+            assert resp.status_code == 400, path
+
+    def test_request_limit(self, client, coach_headers, monkeypatch):
+        monkeypatch.setattr(settings, "BATCH_MAX_REQUESTS", 2)
+        resp = _batch(client, coach_headers, *[{"id": str(i), "path": "/api/v1/auth/me"} for i in range(3)])
+        assert resp.status_code == 400
+
+
+class TestBatchSharedState:
+    def test_get_db_reuses_batch_session(self):
+        shared = object()
+        request = SimpleNamespace(state=SimpleNamespace(batch_db=shared))
+        gen = get_db(request)
+        assert next(gen) is shared
+
+    def test_get_current_user_reuses_batch_principal(self):
+        user = object()
+        request = SimpleNamespace(state=SimpleNamespace(batch_user=user))
+        assert deps.get_current_user(request, token="ignored", db=None) is user
@@ -0,0 +1,239 @@
+"""Tests for the unified calendar feed, sync tokens and .ics export."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.event import Event, EventType, EventVisibility
+from app.models.game import Game
+from app.models.team import Team
+from app.services import calendar as calendar_service
+
+
+@pytest.fixture()
+def no_overlap(monkeypatch):
+    # Fixtures are created moments before the first sync; without the overlap
+    # only changes made after the token show up
+    monkeypatch.setattr(calendar_service, "_OVERLAP", timedelta(0))
+
+
+class TestCalendarFeed:
+    def test_merges_games_and_events_by_start(self, client, coach_headers, game, event_obj):
+        resp = client.get("/api/v1/calendar/", headers=coach_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [(i["kind"], i["id"]) for i in data["items"]] == [
+            ("event", event_obj.id), ("game", game.id),
+        ]
+        game_item = data["items"][1]
+        assert game_item["type"] == "league"
+        assert game_item["status"] == "scheduled"
+        assert game_item["title"] == "Rival FC"
+        assert data["sync_token"]
+        assert data["has_more"] is False
+
+    def test_kind_and_event_type_filters(self, client, db, coach_headers, team, game, event_obj):
+        db.add(Event(
+            title="Board Meeting", team_id=team.id, event_type=EventType.MEETING,
+            start_time=datetime.utcnow() + timedelta(days=2),
+            end_time=datetime.utcnow() + timedelta(days=2, hours=1),
+        ))
+        db.commit()
+
+        games = client.get("/api/v1/calendar/?kind=game", headers=coach_headers).json()
+        assert [i["kind"] for i in games["items"]] == ["game"]
+
+        trainings = client.get(
+            "/api/v1/calendar/?kind=event&event_type=training", headers=coach_headers
+        ).json()
+        assert [i["title"] for i in trainings["items"]] == ["Morning Training"]
+
+    def test_limit_applied_in_sql(self, client, coach_headers, game, event_obj):
+        data = client.get("/api/v1/calendar/?limit=1", headers=coach_headers).json()
+        assert len(data["items"]) == 1
+        assert data["has_more"] is True
+
+    def test_window(self, client, coach_headers, game, event_obj):
+        data = client.get("/api/v1/calendar/?days=2", headers=coach_headers).json()
+        assert [i["kind"] for i in data["items"]] == ["event"]
+
+    def test_role_visibility(self, client, db, parent_headers, parent_child_link, game, event_obj):
+        other = Event(
+            title="Other team", team_id=None, event_type=EventType.OTHER,
+            visibility=EventVisibility.TEAM,
+            start_time=datetime.utcnow() + timedelta(days=1),
+            end_time=datetime.utcnow() + timedelta(days=1, hours=1),
+        )
+        db.add(other)
+        db.commit()
+        data = client.get("/api/v1/calendar/", headers=parent_headers).json()
+        assert {(i["kind"], i["id"]) for i in data["items"]} == {
+            ("game", game.id), ("event", event_obj.id),
+        }
+
+    def test_player_without_team_sees_no_games(self, client, player_headers, game):
+        assert client.get("/api/v1/calendar/", headers=player_headers).json()["items"] == []
+
+
+@pytest.mark.usefixtures("no_overlap")
+class TestCalendarSync:
+    def test_since_returns_only_changes(self, client, db, coach_headers, game, event_obj):
+        token = client.get("/api/v1/calendar/", headers=coach_headers).json()["sync_token"]
+
+        unchanged = client.get(f"/api/v1/calendar/?since={token}", headers=coach_headers).json()
+        assert unchanged["items"] == []
+        assert unchanged["deleted"] == []
+        assert unchanged["sync_token"]
+
+        game.opponent = "Renamed FC"
+        db.commit()
+
+        changed = client.get(f"/api/v1/calendar/?since={token}", headers=coach_headers).json()
+        assert [(i["kind"], i["title"]) for i in changed["items"]] == [("game", "Renamed FC")]
+        assert changed["sync_token"] != token
+
+    def test_sync_includes_items_moved_out_of_window(self, client, db, coach_headers, game):
+        token = client.get("/api/v1/calendar/", headers=coach_headers).json()["sync_token"]
+        game.scheduled_at = datetime.utcnow() + timedelta(days=300)
+        db.commit()
+
+        changed = client.get(f"/api/v1/calendar/?since={token}", headers=coach_headers).json()
+        assert [i["id"] for i in changed["items"]] == [game.id]
+
+    def test_sync_pages_through_changes(self, client, db, coach_headers, team, game):
+        token = client.get("/api/v1/calendar/", headers=coach_headers).json()["sync_token"]
+        for i in range(3):
+            db.add(Game(
+                team_id=team.id, opponent=f"Team {i}", location="Away",
+                scheduled_at=datetime.utcnow() + timedelta(days=i + 1),
+            ))
+        db.commit()
+
+        seen = []
+        while True:
+            page = client.get(
+                f"/api/v1/calendar/?limit=2&since={token}", headers=coach_headers
+            ).json()
+            seen += [i["title"] for i in page["items"]]
+            token = page["sync_token"]
+            if not page["has_more"]:
+                break
+        assert sorted(seen) == ["Team 0", "Team 1", "Team 2"]
+
+    def test_invalid_token(self, client, coach_headers):
+        resp = client.get("/api/v1/calendar/?since=not-a-token", headers=coach_headers)
+        assert resp.status_code == 400
+
+    def test_reports_deletions(self, client, db, coach_headers, game, event_obj):
+        token = client.get("/api/v1/calendar/", headers=coach_headers).json()["sync_token"]
+        db.delete(game)
+        db.delete(event_obj)
+        db.commit()
+
+        synced = client.get(f"/api/v1/calendar/?since={token}", headers=coach_headers).json()
+        assert synced["items"] == []
+        assert {(d["kind"], d["id"]) for d in synced["deleted"]} == {
+            ("game", game.id), ("event", event_obj.id),
+        }
+
+        kind_only = client.get(f"/api/v1/calendar/?since={token}&kind=event", headers=coach_headers).json()
+        assert kind_only["deleted"] == [{"kind": "event", "id": event_obj.id}]
+
+    def test_deletions_limited_to_visible_teams(self, client, db, parent_headers, parent_child_link, admin_user):
+        other = Team(name="Other Club", coach_id=admin_user.id)
+        db.add(other)
+        db.commit()
+        token = client.get("/api/v1/calendar/", headers=parent_headers).json()["sync_token"]
+        hidden = Game(
+            team_id=other.id, opponent="Hidden", location="Away",
+            scheduled_at=datetime.utcnow() + timedelta(days=1),
+        )
+        db.add(hidden)
+        db.commit()
+        db.delete(hidden)
+        db.commit()
+
+        synced = client.get(f"/api/v1/calendar/?since={token}", headers=parent_headers).json()
+        assert synced["deleted"] == []
+
+
+class TestCalendarSyncOverlap:
+    def test_rereads_changes_flushed_before_the_token(self, client, db, coach_headers, game):
+        token = client.get("/api/v1/calendar/", headers=coach_headers).json()["sync_token"]
+        # A transaction that flushed before the sync but committed after it
+        game.opponent = "Late Commit"
+        game.updated_at = datetime.utcnow() - timedelta(seconds=2)
+        db.commit()
+
+        synced = client.get(f"/api/v1/calendar/?since={token}", headers=coach_headers).json()
+        assert [i["title"] for i in synced["items"]] == ["Late Commit"]
+
+    def test_paging_does_not_repeat_the_overlap(self, client, db, coach_headers, team):
+        token = client.get("/api/v1/calendar/", headers=coach_headers).json()["sync_token"]
+        for i in range(5):
+            db.add(Game(
+                team_id=team.id, opponent=f"Team {i}", location="Away",
+                scheduled_at=datetime.utcnow() + timedelta(days=i + 1),
+            ))
+        db.commit()
+
+        seen = []
+        for _ in range(10):
+            page = client.get(
+                f"/api/v1/calendar/?limit=2&since={token}", headers=coach_headers
+            ).json()
+            seen += [i["title"] for i in page["items"]]
+            token = page["sync_token"]
+            if not page["has_more"]:
+                break
+        assert sorted(seen) == [f"Team {i}" for i in range(5)]
+
+
+class TestTeamIcs:
+    def test_export(self, client, coach_headers, team, game, event_obj):
+        resp = client.get(f"/api/v1/calendar/teams/{team.id}.ics", headers=coach_headers)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/calendar")
+        body = resp.text
+        assert body.startswith("BEGIN:VCALENDAR\r\n")
+        assert f"UID:game-{game.id}@handball-manager" in body
+        assert "SUMMARY:Test Handball FC vs Rival FC" in body
+        assert "SUMMARY:Morning Training" in body
+
+    def test_render_cached_until_write(self, client, db, coach_headers, team, game, statement_log):
+        url = f"/api/v1/calendar/teams/{team.id}.ics"
+        first = client.get(url, headers=coach_headers)
+
+        with statement_log as statements:
+            again = client.get(url, headers={**coach_headers, "If-None-Match": first.headers["etag"]})
+        assert again.status_code == 304
+        assert not any("FROM games" in s for s in statements)
+        assert first.headers["vary"] == "Authorization"
+
+        weak = client.get(url, headers={**coach_headers, "If-None-Match": f'"x", W/{first.headers["etag"]}'})
+        assert weak.status_code == 304
+
+        game.opponent = "Renamed FC"
+        db.commit()
+        updated = client.get(url, headers=coach_headers)
+        assert "Renamed FC" in updated.text
+        assert updated.headers["etag"] != first.headers["etag"]
+
+    def test_requires_team_access(self, client, parent_headers, team):
+        resp = client.get(f"/api/v1/calendar/teams/{team.id}.ics", headers=parent_headers)
+        assert resp.status_code == 403
+
+
+class TestMySchedule:
+    def test_schedule(self, client, db, player_headers, player_profile, team, game, event_obj):
+        db.add(Event(
+            title="Team Meeting", team_id=team.id, event_type=EventType.MEETING,
+            start_time=datetime.utcnow() + timedelta(days=1),
+            end_time=datetime.utcnow() + timedelta(days=1, hours=1),
+        ))
+        db.commit()
+        resp = client.get("/api/v1/players/me/schedule", headers=player_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [g["id"] for g in data["upcoming_games"]] == [game.id]
+        assert data["upcoming_games"][0]["is_home"] is True
+        assert [e["title"] for e in data["upcoming_training"]] == ["Morning Training"]
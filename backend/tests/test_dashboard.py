@@ -0,0 +1,112 @@
+"""Tests for the dashboard statistics endpoints."""
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.player import Player
+from app.services import dashboard_stats
+from app.services.dashboard_stats import snapshot_cache
+
+
+class TestDashboardStats:
+    def test_stats_counts(self, client, coach_headers, player_user, player_profile, game, event_obj):
+        resp = client.get("/api/v1/dashboard/stats", headers=coach_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total_teams"] == 1
+        assert data["total_players"] == 1
+        assert data["total_users"] == 2
+        assert data["upcoming_games"] == 1
+        assert data["upcoming_events"] == 1
+        assert data["users_by_role"] == {"UserRole.COACH": 1, "UserRole.PLAYER": 1}
+        assert data["recent_activity"]["new_users_7d"] == 2
+
+    def test_stats_require_auth(self, client):
+        assert client.get("/api/v1/dashboard/stats").status_code == 401
+
+    def test_stats_computed_in_one_query(self, client, coach_headers, team, statement_log):
+        client.get("/api/v1/auth/me", headers=coach_headers)
+        with statement_log as statements:
+            client.get("/api/v1/dashboard/stats", headers=coach_headers)
+        assert len(statements) == 1
+
+    def test_snapshot_served_until_expiry(self, client, db, coach_headers, team, player_user, statement_log):
+        first = client.get("/api/v1/dashboard/stats", headers=coach_headers).json()
+        db.add(Player(user_id=player_user.id, team_id=team.id))
+        db.commit()
+
+        with statement_log as statements:
+            cached = client.get("/api/v1/dashboard/stats", headers=coach_headers).json()
+        assert statements == []
+        assert cached["total_players"] == first["total_players"]
+
+        snapshot_cache.clear()
+        fresh = client.get("/api/v1/dashboard/stats", headers=coach_headers).json()
+        assert fresh["total_players"] == first["total_players"] + 1
+
+
+class TestAdminDashboardSummary:
+    def test_summary(self, client, admin_headers, team, player_profile, game, event_obj):
+        resp = client.get("/api/v1/dashboard/admin/summary", headers=admin_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["counts"] == {
+            "teams": 1,
+            "players": 1,
+            "games": 1,
+            "events": 1,
+            "users": 3,
+            "active_users": 3,
+        }
+        assert data["upcoming"] == {"games_30d": 1, "events_30d": 1}
+        assert data["issues"] == {
+            "teams_without_coach": 0,
+            "players_without_team": 0,
+            "active_games": 1,
+        }
+
+    def test_summary_admin_only(self, client, coach_headers):
+        resp = client.get("/api/v1/dashboard/admin/summary", headers=coach_headers)
+        assert resp.status_code == 403
+
+
+class _RecordingConnection:
+    dialect = postgresql.dialect()
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+
+
+class TestMaterializedView:
+    def test_view_has_unique_index_for_concurrent_refresh(self):
+        conn = _RecordingConnection()
+        dashboard_stats.create_materialized_view(conn)
+        create_view, create_index = conn.statements
+        assert create_view.startswith(f"CREATE MATERIALIZED VIEW {dashboard_stats.MATERIALIZED_VIEW} AS")
+        assert "refreshed_at" in create_view
+        assert create_index.startswith("CREATE UNIQUE INDEX")
+
+    @pytest.mark.asyncio
+    async def test_cancel_waits_for_running_refresh(self, monkeypatch):
+        started, finished = threading.Event(), threading.Event()
+
+        def slow_refresh(engine, max_age):
+            started.set()
+            time.sleep(0.2)
+            finished.set()
+
+        monkeypatch.setattr(dashboard_stats, "refresh_materialized_view", slow_refresh)
+        task = asyncio.create_task(dashboard_stats.refresh_materialized_view_forever(None, interval=0.01))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert finished.is_set()
@@ -0,0 +1,82 @@
+"""Tests for sparse fieldsets (fields=) and compact list responses."""
+from datetime import datetime, timedelta
+
+from app.models.game import Game, GameType
+
+
+def _player_page_selects(statements):
+    return [s for s in statements if "FROM players" in s and "ORDER BY players.id" in s]
+
+
+class TestSparseFields:
+    def test_returns_only_requested_fields(self, client, admin_headers, player_profile):
+        resp = client.get("/api/v1/players/?fields=jersey_number,position", headers=admin_headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total"] == 1
+        assert body["items"] == [{"id": player_profile.id, "jersey_number": 7, "position": "left_wing"}]
+
+    def test_selects_only_requested_columns(self, client, admin_headers, player_profile, statement_log):
+        with statement_log as statements:
+            resp = client.get(
+                "/api/v1/players/?fields=jersey_number&include_total=false", headers=admin_headers
+            )
+        assert resp.status_code == 200
+        [select] = _player_page_selects(statements)
+        assert "jersey_number" in select
+        assert "emergency_contact_name" not in select
+        assert "goals_scored" not in select
+        assert "JOIN users" not in select
+
+    def test_relation_field_keeps_nested_object(self, client, admin_headers, player_profile, player_user):
+        resp = client.get("/api/v1/players/?fields=user", headers=admin_headers)
+        assert resp.status_code == 200
+        [item] = resp.json()["items"]
+        assert set(item) == {"id", "user"}
+        assert item["user"]["email"] == player_user.email
+
+    def test_unknown_field_is_rejected(self, client, admin_headers):
+        resp = client.get("/api/v1/games/?fields=opponent,hashed_password", headers=admin_headers)
+        assert resp.status_code == 400
+        assert "hashed_password" in resp.json()["detail"]
+
+    def test_default_response_is_unchanged(self, client, admin_headers, player_profile):
+        resp = client.get("/api/v1/players/", headers=admin_headers)
+        [item] = resp.json()["items"]
+        assert "emergency_contact_name" in item
+        assert item["user"] is not None
+
+    def test_cursor_pages_with_sort_key_not_selected(self, client, db, admin_headers, team):
+        now = datetime.utcnow()
+        for i in range(3):
+            db.add(Game(
+                team_id=team.id, opponent=f"Opponent {i}", location="Arena",
+                scheduled_at=now + timedelta(days=i + 1), game_type=GameType.LEAGUE,
+            ))
+        db.commit()
+
+        seen, cursor = [], None
+        while True:
+            url = "/api/v1/games/?limit=2&fields=opponent"
+            if cursor:
+                url += f"&cursor={cursor}"
+            body = client.get(url, headers=admin_headers).json()
+            seen += [item["opponent"] for item in body["items"]]
+            assert all(set(item) == {"id", "opponent"} for item in body["items"])
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        assert seen == ["Opponent 0", "Opponent 1", "Opponent 2"]
+
+
+class TestCompact:
+    def test_compact_uses_endpoint_defaults(self, client, admin_headers, game):
+        resp = client.get("/api/v1/games/?compact=true", headers=admin_headers)
+        assert resp.status_code == 200
+        [item] = resp.json()["items"]
+        assert set(item) == {"id", "team_id", "opponent", "scheduled_at", "status", "is_home_game"}
+
+    def test_fields_override_compact(self, client, admin_headers, news_item):
+        resp = client.get("/api/v1/news/?compact=true&fields=title", headers=admin_headers)
+        [item] = resp.json()["items"]
+        assert set(item) == {"id", "title"}
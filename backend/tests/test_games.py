@@ -21,6 +21,46 @@ class TestGetGames:
         assert resp.status_code == 401
 
 
+class TestGamesCursorPagination:
+    def _seed(self, db, team, count):
+        from app.models.game import Game
+
+        # Two games share each kickoff time so the id tie-breaker is exercised
+        base = datetime.utcnow() + timedelta(days=1)
+        for i in range(count):
+            db.add(Game(
+                team_id=team.id, opponent=f"Opp {i}", location="Arena",
+                scheduled_at=base + timedelta(hours=i // 2),
+            ))
+        db.commit()
+
+    def test_cursor_walks_all_rows_once(self, client, db, admin_headers, team):
+        self._seed(db, team, 7)
+        seen, cursor = [], None
+        while True:
+            url = "/api/v1/games/?limit=3&include_total=false"
+            if cursor:
+                url += f"&cursor={cursor}"
+            body = client.get(url, headers=admin_headers).json()
+            assert body["total"] is None
+            seen.extend(g["id"] for g in body["items"])
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+
+    def test_offset_mode_keeps_total(self, client, db, admin_headers, team):
+        self._seed(db, team, 4)
+        body = client.get("/api/v1/games/?limit=2", headers=admin_headers).json()
+        assert body["total"] == 4
+        assert body["next_cursor"] is not None
+
+    def test_invalid_cursor(self, client, admin_headers):
+        resp = client.get("/api/v1/games/?cursor=not-a-cursor", headers=admin_headers)
+        assert resp.status_code == 400
+
+
 class TestCreateGame:
     def test_coach_creates_game(self, client, coach_headers, team):
         future = (datetime.utcnow() + timedelta(days=7)).isoformat()
@@ -1,4 +1,8 @@
 """Tests for health-check endpoints."""
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.db.pool_metrics import InstrumentedQueuePool, PoolMetrics, pool_metrics
 
 
 class TestHealth:
@@ -25,3 +29,44 @@ class TestHealth:
         body = resp.json()
         assert body["status"] == "ready"
         assert body["database"] == "connected"
+
+
+class TestPoolMetrics:
+    def test_pool_endpoint_admin_only(self, client, admin_headers, coach_headers):
+        assert client.get("/api/v1/health/pool", headers=coach_headers).status_code == 403
+        resp = client.get("/api/v1/health/pool", headers=admin_headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["pgbouncer_mode"] is False
+        assert {"pool_class", "checkouts", "timeouts", "wait"} <= body["pool"].keys()
+
+    def test_counts_checkouts_waits_and_timeouts(self, tmp_path):
+        pool_metrics.reset()
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        metrics = PoolMetrics()
+        metrics.attach(engine)
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                with pytest.raises(exc.TimeoutError):
+                    engine.connect()
+                snapshot = metrics.snapshot(engine.pool)
+                assert snapshot["checked_out"] == 1
+            snapshot = metrics.snapshot(engine.pool)
+            assert snapshot["checkouts"] == 1
+            assert snapshot["checkins"] == 1
+            assert snapshot["connects"] == 1
+
+            waits = pool_metrics.snapshot(engine.pool)
+            assert waits["timeouts"] == 1
+            assert waits["wait"]["checkouts"] == 2
+            assert waits["wait"]["count"] == 1
+            assert waits["wait"]["max_seconds"] >= 0.05
+        finally:
+            engine.dispose()
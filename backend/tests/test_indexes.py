@@ -0,0 +1,74 @@
+"""The hot list queries must be served by the access-path indexes."""
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+
+from app.db.session import Base
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.game import Game
+from app.models.news import News
+from app.models.parent_child import ParentChild
+from app.models.player import Player
+from app.models.user_activity import UserActivity
+
+NOW = datetime(2026, 1, 1)
+
+HOT_QUERIES = [
+    ("ix_players_team_id", select(Player).where(Player.team_id == 1)),
+    ("ix_attendance_game_id", select(Attendance).where(Attendance.game_id == 1)),
+    ("ix_attendance_event_id", select(Attendance).where(Attendance.event_id == 1)),
+    (
+        "ix_games_team_id_scheduled_at",
+        select(Game).where(Game.team_id == 1, Game.scheduled_at >= NOW).order_by(Game.scheduled_at),
+    ),
+    (
+        "ix_events_team_id_start_time",
+        select(Event).where(Event.team_id == 1, Event.start_time >= NOW).order_by(Event.start_time),
+    ),
+    (
+        "ix_news_team_id_is_published_created_at",
+        select(News)
+        .where(News.team_id == 1, News.is_published.is_(True))
+        .order_by(News.created_at.desc()),
+    ),
+    ("ix_parent_children_parent_id", select(ParentChild).where(ParentChild.parent_id == 1)),
+    ("ix_parent_children_child_id", select(ParentChild).where(ParentChild.child_id == 1)),
+    (
+        "ix_user_activities_user_id_created_at",
+        select(UserActivity)
+        .where(UserActivity.user_id == 1)
+        .order_by(UserActivity.created_at.desc()),
+    ),
+]
+
+
+def _query_plan(db, stmt):
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+    return " | ".join(row[-1] for row in rows)
+
+
+class TestAccessPathIndexes:
+    @pytest.mark.parametrize("index_name,stmt", HOT_QUERIES, ids=[name for name, _ in HOT_QUERIES])
+    def test_hot_query_uses_index(self, db, index_name, stmt):
+        plan = _query_plan(db, stmt)
+        assert f"INDEX {index_name}" in plan, plan
+
+    def test_migration_matches_models(self):
+        path = Path(__file__).parents[1] / "alembic" / "versions" / "005_access_path_indexes.py"
+        spec = importlib.util.spec_from_file_location("migration_005", path)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+
+        model_indexes = {
+            (index.name, table.name, tuple(column.name for column in index.columns))
+            for table in Base.metadata.tables.values()
+            for index in table.indexes
+        }
+        for name, table, columns in migration.INDEXES:
+            assert (name, table, tuple(columns)) in model_indexes
@@ -4,8 +4,12 @@ This is the authorization logic reused by GET /teams/{id} (#86) and the
 WebSocket subscribe_team handler (#87), so unit-testing it directly covers
 the security-critical path for both fixes.
 """
+import json
+
+from app.core.access_scope import resolve_access_scope
 from app.core.permissions import can_access_team
-from app.models.user import UserRole
+from app.models.parent_child import ParentChild
+from app.models.user import User, UserRole
 from tests.conftest import _make_user
 
 
@@ -36,3 +40,77 @@ class TestCanAccessTeam:
 
     def test_unrelated_parent_denied(self, db, parent_user, team):
         assert can_access_team(parent_user, team.id, db) is False
+
+
+class TestAccessScope:
+    def test_resolves_memberships(self, db, coach_user, player_user, parent_user, team, parent_child_link):
+        player_id = parent_child_link.child_id
+        assert resolve_access_scope(coach_user, db).coached_team_ids == {team.id}
+
+        player_scope = resolve_access_scope(player_user, db)
+        assert player_scope.player_id == player_id
+        assert player_scope.player_team_id == team.id
+
+        parent_scope = resolve_access_scope(parent_user, db)
+        assert parent_scope.child_player_ids == {player_id}
+        assert parent_scope.visible_team_ids == {team.id}
+
+    def test_scope_is_cached(self, db, coach_user, team):
+        first = resolve_access_scope(coach_user, db)
+        assert resolve_access_scope(coach_user, db) is first
+
+    def test_membership_change_invalidates(self, db, parent_user, team, player_profile):
+        assert can_access_team(parent_user, team.id, db) is False
+        db.add(ParentChild(parent_id=parent_user.id, child_id=player_profile.id))
+        db.commit()
+        assert can_access_team(parent_user, team.id, db) is True
+
+    def test_team_reassignment_invalidates(self, db, player_user, team, player_profile):
+        assert can_access_team(player_user, team.id, db) is True
+        player_profile.team_id = None
+        db.commit()
+        assert can_access_team(player_user, team.id, db) is False
+
+
+class TestUserRoles:
+    def _user(self, role=UserRole.COACH, roles=None):
+        return User(role=role, roles_data=json.dumps(roles) if roles is not None else None)
+
+    def test_falls_back_to_primary_role(self):
+        user = self._user()
+        assert user.roles == [UserRole.COACH]
+        assert user.has_role(UserRole.COACH)
+        assert user.has_role("coach")
+        assert not user.has_role(UserRole.PARENT)
+
+    def test_any_and_all_roles(self):
+        user = self._user(roles=["coach", "parent", "bogus"])
+        assert user.roles == [UserRole.COACH, UserRole.PARENT]
+        assert user.has_any_role([UserRole.ADMIN, "parent"])
+        assert not user.has_any_role([UserRole.ADMIN, UserRole.PLAYER])
+        assert user.has_all_roles([UserRole.COACH, "parent"])
+        assert not user.has_all_roles([UserRole.COACH, UserRole.ADMIN])
+        assert not user.has_all_roles(["coach", "bogus"])
+
+    def test_memo_follows_attribute_changes(self):
+        user = self._user(roles=["player"])
+        assert user.has_role(UserRole.PLAYER)
+        user.roles_data = json.dumps(["admin"])
+        assert user.roles == [UserRole.ADMIN]
+        assert not user.has_role(UserRole.PLAYER)
+        user.roles_data = None
+        user.role = UserRole.PARENT
+        assert user.roles == [UserRole.PARENT]
+
+    def test_roles_parsed_once(self, monkeypatch):
+        user = self._user(roles=["coach", "player"])
+        calls = []
+        real_loads = json.loads
+        monkeypatch.setattr(
+            "app.models.user.json.loads",
+            lambda raw: calls.append(raw) or real_loads(raw),
+        )
+        for _ in range(5):
+            user.has_role(UserRole.ADMIN)
+            user.has_any_role([UserRole.PLAYER, UserRole.PARENT])
+        assert len(calls) == 1
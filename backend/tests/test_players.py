@@ -59,6 +59,43 @@ class TestGetPlayer:
         resp = client.get("/api/v1/players/99999", headers=coach_headers)
         assert resp.status_code == 404
 
+    def test_detail_includes_team_and_parents(self, client, coach_headers, parent_user, parent_child_link):
+        resp = client.get(f"/api/v1/players/{parent_child_link.child_id}", headers=coach_headers)
+        data = resp.json()
+        assert data["team_name"] == "Test Handball FC"
+        assert data["user"]["first_name"]
+        assert [p["id"] for p in data["parents"]] == [parent_user.id]
+
+    def test_detail_costs_two_statements(self, client, coach_headers, parent_child_link, statement_log):
+        url = f"/api/v1/players/{parent_child_link.child_id}"
+        client.get(url, headers=coach_headers)  # warm the principal / scope caches
+        with statement_log as statements:
+            resp = client.get(url, headers=coach_headers)
+        assert resp.status_code == 200
+        assert len(statements) <= 2
+
+    def test_parent_sees_child_and_teammates_only(self, client, db, parent_headers, parent_child_link, team):
+        teammate = Player(user_id=_make_user(db, email="mate@test.com", role=UserRole.PLAYER).id, team_id=team.id)
+        outsider = Player(user_id=_make_user(db, email="out@test.com", role=UserRole.PLAYER).id, team_id=None)
+        db.add_all([teammate, outsider])
+        db.commit()
+
+        assert client.get(f"/api/v1/players/{parent_child_link.child_id}", headers=parent_headers).status_code == 200
+        assert client.get(f"/api/v1/players/{teammate.id}", headers=parent_headers).status_code == 200
+        assert client.get(f"/api/v1/players/{outsider.id}", headers=parent_headers).status_code == 403
+
+    def test_update_my_contact_info(self, client, player_headers, player_profile):
+        resp = client.put(
+            "/api/v1/players/me/contacts",
+            headers=player_headers,
+            json={"emergency_contact_name": "Mum", "position": "goalkeeper"},
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["emergency_contact_name"] == "Mum"
+        assert data["position"] == "left_wing"
+        assert data["team_name"] == "Test Handball FC"
+
 
 class TestUpdatePlayer:
     def test_coach_updates_player(self, client, coach_headers, player_profile):
@@ -0,0 +1,47 @@
+"""Tests for the principal cache behind get_current_user."""
+from app.core.principal import principal_cache
+
+
+def _users_selects(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT") and "FROM users" in s]
+
+
+class TestPrincipalCache:
+    def test_second_request_skips_users_lookup(self, client, coach_user, coach_headers, statement_log):
+        client.get("/api/v1/auth/me", headers=coach_headers)
+        assert principal_cache.get(coach_user.email) is not None
+
+        with statement_log as statements:
+            resp = client.get("/api/v1/auth/me", headers=coach_headers)
+        assert resp.status_code == 200
+        assert resp.json()["email"] == coach_user.email
+        assert _users_selects(statements) == []
+
+    def test_deactivation_invalidates(self, client, admin_headers, player_user, player_headers):
+        assert client.get("/api/v1/auth/me", headers=player_headers).status_code == 200
+        assert principal_cache.get(player_user.email) is not None
+
+        resp = client.delete(f"/api/v1/users/{player_user.id}", headers=admin_headers)
+        assert resp.status_code == 204
+        assert principal_cache.get(player_user.email) is None
+        assert client.get("/api/v1/auth/me", headers=player_headers).status_code == 401
+
+    def test_update_user_invalidates(self, client, admin_headers, player_user, player_headers):
+        client.get("/api/v1/auth/me", headers=player_headers)
+        client.put(
+            f"/api/v1/users/{player_user.id}",
+            headers=admin_headers,
+            json={"first_name": "Renamed"},
+        )
+        resp = client.get("/api/v1/auth/me", headers=player_headers)
+        assert resp.json()["first_name"] == "Renamed"
+
+    def test_change_password_invalidates(self, client, coach_user, coach_headers):
+        client.get("/api/v1/auth/me", headers=coach_headers)
+        resp = client.post(
+            "/api/v1/auth/change-password",
+            headers=coach_headers,
+            json={"old_password": "testpassword123", "new_password": "newpassword456"},
+        )
+        assert resp.status_code == 200
+        assert principal_cache.get(coach_user.email) is None
@@ -0,0 +1,136 @@
+"""Tests for read-replica routing in app.db.session."""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core import deps
+from app.core.access_scope import resolve_access_scope, scope_cache
+from app.core.deps import get_replica_db
+from app.db import session as db_session
+from app.db.session import (
+    RedisRecentWriters, ReplicaRouter, RoutingSession, primary_reads, recent_writers,
+)
+from tests.conftest import test_engine
+
+
+def _make_db(path, name):
+    url = f"sqlite:///{path / name}.db"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE marker (name TEXT)"))
+        conn.execute(text("INSERT INTO marker VALUES (:name)"), {"name": name})
+    engine.dispose()
+    return url
+
+
+@pytest.fixture()
+def databases(tmp_path, monkeypatch):
+    primary = create_engine(_make_db(tmp_path, "primary"))
+    router = ReplicaRouter(
+        [_make_db(tmp_path, "replica1"), _make_db(tmp_path, "replica2")], retry_after=60
+    )
+    monkeypatch.setattr(db_session, "replica_router", router)
+    monkeypatch.setattr(deps, "replica_router", router)
+    factory = sessionmaker(bind=primary, class_=RoutingSession)
+    yield factory, router
+    router.dispose()
+    primary.dispose()
+
+
+def _request(**state):
+    return Request({"type": "http", "state": state})
+
+
+def _read_marker(factory, use_replica=True):
+    db = factory()
+    try:
+        db.info["use_replica"] = use_replica
+        return db.execute(text("SELECT name FROM marker")).scalar()
+    finally:
+        db.close()
+
+
+class TestReplicaRouting:
+    def test_round_robin(self, databases):
+        factory, _ = databases
+        assert {_read_marker(factory) for _ in range(4)} == {"replica1", "replica2"}
+
+    def test_unflagged_session_uses_primary(self, databases):
+        factory, _ = databases
+        assert _read_marker(factory, use_replica=False) == "primary"
+
+    def test_writes_go_to_primary(self, databases):
+        factory, _ = databases
+        db = factory()
+        db.info["use_replica"] = True
+        db.execute(text("INSERT INTO marker VALUES ('written')"))
+        db.commit()
+        db.close()
+        assert _read_marker(factory, use_replica=False) is not None
+
+    def test_unhealthy_replicas_skipped(self, databases):
+        factory, router = databases
+        router.mark_unhealthy(router.engines[0])
+        assert {_read_marker(factory) for _ in range(4)} == {"replica2"}
+
+        router.mark_unhealthy(router.engines[1])
+        assert _read_marker(factory) == "primary"
+
+        router.check_health()
+        assert {_read_marker(factory) for _ in range(4)} == {"replica1", "replica2"}
+
+    def test_primary_reads_block(self, databases):
+        factory, _ = databases
+        db = factory()
+        db.info["use_replica"] = True
+        with primary_reads(db):
+            assert db.execute(text("SELECT name FROM marker")).scalar() == "primary"
+        assert db.info["use_replica"] is True
+        db.close()
+
+
+class TestGetReplicaDb:
+    def test_recent_writer_stays_on_primary(self, db, coach_user, databases):
+        recent_writers.clear()
+        assert get_replica_db(_request(), db, coach_user).info.get("use_replica") is True
+
+        db.info.pop("use_replica")
+        db.info["user_id"] = coach_user.id
+        coach_user.first_name = "Changed"
+        db.commit()
+
+        assert get_replica_db(_request(), db, coach_user).info.get("use_replica") is None
+
+    def test_unreachable_redis_keeps_reads_on_primary(self):
+        writers = RedisRecentWriters("redis://127.0.0.1:1/0", ttl=5)
+        writers.set(1, True)
+        assert writers.get(1) is True
+
+    def test_disabled_without_replicas(self, db, coach_user):
+        assert get_replica_db(_request(), db, coach_user).info.get("use_replica") is None
+
+    def test_response_cache_miss_stays_on_primary(self, db, coach_user, databases):
+        recent_writers.clear()
+        request = _request(response_cache_key="key")
+        assert get_replica_db(request, db, coach_user).info.get("use_replica") is None
+
+    def test_flag_reset_for_next_batch_sub_request(self, db, coach_user, databases):
+        recent_writers.clear()
+        assert get_replica_db(_request(), db, coach_user).info.get("use_replica") is True
+        request = _request(response_cache_key="key")
+        assert get_replica_db(request, db, coach_user).info.get("use_replica") is None
+
+
+class TestSharedCachesReadPrimary:
+    def test_access_scope_resolved_on_primary(self, db, coach_user, team, databases):
+        # The marker replicas have no players/teams tables: any scope query
+        # routed to them would fail
+        session = RoutingSession(bind=test_engine)
+        session.info["use_replica"] = True
+        try:
+            scope_cache.clear()
+            scope = resolve_access_scope(coach_user, session)
+        finally:
+            session.close()
+        assert scope.coached_team_ids == frozenset({team.id})
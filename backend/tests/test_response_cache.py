@@ -0,0 +1,81 @@
+"""Tests for the ETag response cache on the hot GET endpoints."""
+from app.core.response_cache import MemoryResponseCache, response_cache
+
+
+class TestResponseCache:
+    def test_repeat_request_served_from_cache(self, client, coach_headers, game, statement_log):
+        first = client.get("/api/v1/games/", headers=coach_headers)
+        assert first.status_code == 200
+        assert first.headers["etag"]
+
+        with statement_log as statements:
+            second = client.get("/api/v1/games/", headers=coach_headers)
+        assert statements == []
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_if_none_match_returns_304(self, client, coach_headers, game):
+        etag = client.get(f"/api/v1/games/{game.id}", headers=coach_headers).headers["etag"]
+
+        resp = client.get(
+            f"/api/v1/games/{game.id}", headers={**coach_headers, "If-None-Match": etag}
+        )
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+    def test_stale_etag_gets_full_body(self, client, coach_headers, game):
+        resp = client.get("/api/v1/games/", headers={**coach_headers, "If-None-Match": '"stale"'})
+        assert resp.status_code == 200
+        assert resp.json()["items"]
+
+    def test_write_invalidates(self, client, coach_headers, game):
+        first = client.get(f"/api/v1/games/{game.id}", headers=coach_headers)
+
+        resp = client.put(
+            f"/api/v1/games/{game.id}", json={"opponent": "New Opponent"}, headers=coach_headers
+        )
+        assert resp.status_code == 200
+
+        second = client.get(
+            f"/api/v1/games/{game.id}",
+            headers={**coach_headers, "If-None-Match": first.headers["etag"]},
+        )
+        assert second.status_code == 200
+        assert second.json()["opponent"] == "New Opponent"
+        assert second.headers["etag"] != first.headers["etag"]
+
+    def test_team_invalidated_by_player_writes(self, client, db, coach_headers, team, player_profile):
+        before = client.get(f"/api/v1/teams/{team.id}", headers=coach_headers).json()
+        assert len(before["players"]) == 1
+
+        player_profile.team_id = None
+        db.commit()
+
+        after = client.get(f"/api/v1/teams/{team.id}", headers=coach_headers).json()
+        assert after["players"] == []
+
+    def test_callers_do_not_share_entries(self, client, coach_headers, parent_headers, game):
+        assert client.get("/api/v1/games/", headers=coach_headers).json()["items"]
+        # The parent has no children, so the coach's cached page must not leak
+        assert client.get("/api/v1/games/", headers=parent_headers).json()["items"] == []
+
+    def test_errors_not_cached(self, client, coach_headers):
+        assert client.get("/api/v1/games/999", headers=coach_headers).status_code == 404
+        assert "etag" not in client.get("/api/v1/games/999", headers=coach_headers).headers
+
+    def test_disabled_cache_passes_through(self, client, coach_headers, game, monkeypatch):
+        monkeypatch.setattr(response_cache, "_entries", MemoryResponseCache(0, 0)._entries)
+        resp = client.get("/api/v1/games/", headers=coach_headers)
+        assert resp.status_code == 200
+        assert "etag" not in resp.headers
+
+
+class TestMemoryResponseCache:
+    def test_bump_changes_only_written_tables(self):
+        cache = MemoryResponseCache(maxsize=8, ttl=60)
+        before = cache.versions(["games", "news"])
+        cache.bump(["games"])
+        after = cache.versions(["games", "news"])
+        assert after[0] != before[0]
+        assert after[1] == before[1]
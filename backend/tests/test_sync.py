@@ -0,0 +1,135 @@
+"""Tests for the /sync delta API and tombstones."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.attendance import Attendance
+from app.models.game import Game
+from app.models.team import Team
+from app.models.tombstone import Tombstone
+from app.services import sync as sync_service
+
+
+@pytest.fixture()
+def no_overlap(monkeypatch):
+    # Fixtures are created moments before the first sync; without the overlap
+    # only changes made after the token show up
+    monkeypatch.setattr(sync_service, "_OVERLAP", timedelta(0))
+
+
+def _sync(client, headers, token=None, **params):
+    if token:
+        params["since"] = token
+    resp = client.get("/api/v1/sync/", params=params, headers=headers)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+class TestFullSync:
+    def test_lists_visible_ids(self, client, coach_headers, team, player_profile, game,
+                               event_obj, news_item, attendance_record):
+        data = _sync(client, coach_headers)
+        assert data["full"] is True
+        changes = data["changes"]
+        assert changes["teams"]["upserted"] == [team.id]
+        assert changes["players"]["upserted"] == [player_profile.id]
+        assert changes["games"]["upserted"] == [game.id]
+        assert changes["events"]["upserted"] == [event_obj.id]
+        assert changes["news"]["upserted"] == [news_item.id]
+        assert changes["attendance"]["upserted"] == [attendance_record.id]
+
+    def test_scoped_by_visibility(self, client, parent_headers, game, event_obj, news_item):
+        changes = _sync(client, parent_headers)["changes"]
+        # No children linked: nothing team-bound is visible
+        assert changes["games"]["upserted"] == []
+        assert changes["teams"]["upserted"] == []
+        assert changes["news"]["upserted"] == []
+
+    def test_entity_filter(self, client, coach_headers, game):
+        data = _sync(client, coach_headers, entity=["games"])
+        assert list(data["changes"]) == ["games"]
+
+    def test_invalid_token(self, client, coach_headers):
+        resp = client.get("/api/v1/sync/?since=%%%", headers=coach_headers)
+        assert resp.status_code == 400
+
+
+@pytest.mark.usefixtures("no_overlap")
+class TestDeltaSync:
+    def test_only_changes_since_token(self, client, db, coach_headers, game, event_obj):
+        token = _sync(client, coach_headers)["sync_token"]
+        assert all(
+            c == {"upserted": [], "deleted": []}
+            for c in _sync(client, coach_headers, token)["changes"].values()
+        )
+
+        game.opponent = "Renamed FC"
+        db.commit()
+
+        data = _sync(client, coach_headers, token)
+        assert data["full"] is False
+        assert data["changes"]["games"] == {"upserted": [game.id], "deleted": []}
+        assert data["changes"]["events"] == {"upserted": [], "deleted": []}
+
+    def test_delete_reported_via_tombstone(self, client, db, coach_headers, game):
+        token = _sync(client, coach_headers)["sync_token"]
+        game_id = game.id
+        assert client.delete(f"/api/v1/games/{game_id}", headers=coach_headers).status_code == 204
+
+        tombstone = db.query(Tombstone).one()
+        assert (tombstone.entity, tombstone.entity_id) == ("games", game_id)
+        assert _sync(client, coach_headers, token)["changes"]["games"] == {
+            "upserted": [], "deleted": [game_id],
+        }
+
+    def test_team_delete_tombstones_bulk_deleted_rows(self, client, db, admin_headers, team,
+                                                       game, event_obj, news_item):
+        ids = {"teams": team.id, "games": game.id, "events": event_obj.id, "news": news_item.id}
+        token = _sync(client, admin_headers)["sync_token"]
+        assert client.delete(f"/api/v1/teams/{team.id}", headers=admin_headers).status_code == 204
+
+        changes = _sync(client, admin_headers, token)["changes"]
+        for entity, row_id in ids.items():
+            assert changes[entity]["deleted"] == [row_id]
+
+    def test_other_teams_deletions_hidden(self, client, db, parent_headers, coach_user, team):
+        other = Team(name="Other", coach_id=coach_user.id)
+        db.add(other)
+        db.commit()
+        doomed = Game(team_id=other.id, opponent="X", location="Y",
+                      scheduled_at=datetime.utcnow() + timedelta(days=1))
+        db.add(doomed)
+        db.commit()
+        token = _sync(client, parent_headers)["sync_token"]
+
+        db.delete(doomed)
+        db.commit()
+        assert _sync(client, parent_headers, token)["changes"]["games"]["deleted"] == []
+
+    def test_bulk_attendance_update_is_a_change(self, client, db, coach_headers,
+                                                player_profile, game, attendance_record):
+        token = _sync(client, coach_headers)["sync_token"]
+        resp = client.post(
+            f"/api/v1/attendance/bulk-update?game_id={game.id}",
+            json={"player_ids": [player_profile.id], "status": "present"},
+            headers=coach_headers,
+        )
+        assert resp.status_code == 200
+        assert _sync(client, coach_headers, token)["changes"]["attendance"]["upserted"] == [
+            attendance_record.id
+        ]
+
+    def test_initialized_attendance_has_updated_at(self, client, db, coach_headers,
+                                                   player_profile, event_obj):
+        resp = client.post(f"/api/v1/attendance/event/{event_obj.id}/initialize", headers=coach_headers)
+        assert resp.status_code == 201
+        assert db.query(Attendance).filter(Attendance.updated_at.is_(None)).count() == 0
+
+    def test_unpublished_news_dropped_for_players(self, client, db, player_headers,
+                                                  player_profile, news_item):
+        token = _sync(client, player_headers)["sync_token"]
+        news_item.is_published = False
+        db.commit()
+        assert _sync(client, player_headers, token)["changes"]["news"] == {
+            "upserted": [], "deleted": [news_item.id],
+        }
@@ -0,0 +1,366 @@
+"""Tests for the WebSocket ConnectionManager and its broker fan-out."""
+import asyncio
+import json
+import time
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.websocket.broker import InMemoryBroker
+from app.websocket.manager import ConnectionManager, manager as app_manager
+from tests.conftest import TestingSessionLocal, _auth_header, _make_user
+from app.models.user import UserRole
+
+
+class _Socket:
+    """Minimal stand-in for a connected WebSocket."""
+
+    def __init__(self, fail=False, delay=0.0):
+        self.sent = []
+        self.fail = fail
+        self.delay = delay
+        self.closed = False
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed = True
+
+
+def _attach(manager, user_id, team_id=None, **kwargs):
+    socket = _Socket(**kwargs)
+    socket.connection_id = manager.add_connection(socket, user_id)
+    if team_id is not None:
+        manager.subscribe_to_team(user_id, team_id)
+    return socket
+
+
+class TestBrokerFanOut:
+    @pytest.mark.asyncio
+    async def test_team_broadcast_reaches_every_process(self):
+        broker = InMemoryBroker()
+        worker_a, worker_b = ConnectionManager(broker), ConnectionManager(broker)
+        on_a = _attach(worker_a, 1, team_id=1)
+        on_b = _attach(worker_b, 2, team_id=1)
+        other_team = _attach(worker_b, 3, team_id=2)
+
+        await worker_a.broadcast_to_team({"type": "game_updated"}, 1)
+
+        assert on_a.sent == [{"type": "game_updated"}]
+        assert on_b.sent == [{"type": "game_updated"}]
+        assert other_team.sent == []
+
+    @pytest.mark.asyncio
+    async def test_personal_message_and_broadcast(self):
+        broker = InMemoryBroker()
+        worker_a, worker_b = ConnectionManager(broker), ConnectionManager(broker)
+        alice = _attach(worker_a, 1)
+        bob = _attach(worker_b, 2)
+
+        await worker_a.send_personal_message({"type": "hi"}, 2)
+        await worker_b.broadcast({"type": "all"})
+
+        assert alice.sent == [{"type": "all"}]
+        assert bob.sent == [{"type": "hi"}, {"type": "all"}]
+
+    @pytest.mark.asyncio
+    async def test_failed_socket_is_disconnected(self):
+        manager = ConnectionManager(InMemoryBroker())
+        _attach(manager, 4, team_id=1, fail=True)
+        healthy = _attach(manager, 5, team_id=1)
+
+        await manager.broadcast_to_team({"type": "news"}, 1)
+
+        assert 4 not in manager.active_connections
+        assert 4 not in manager.team_subscriptions[1]
+        assert 4 not in manager.user_subscriptions
+        assert healthy.sent == [{"type": "news"}]
+
+    @pytest.mark.asyncio
+    async def test_access_change_reaches_every_process(self):
+        broker = InMemoryBroker()
+        worker_a, worker_b = ConnectionManager(broker), ConnectionManager(broker)
+        calls = []
+
+        async def record(emails):
+            calls.append(emails)
+
+        worker_a.access_handler = worker_b.access_handler = record
+        await worker_a.publish_access_change({"b@test.com", "a@test.com"})
+        await worker_b.publish_access_change()
+
+        assert calls == [["a@test.com", "b@test.com"]] * 2 + [None] * 2
+
+
+class TestSubscriptionIndex:
+    def test_disconnect_only_touches_own_teams(self):
+        manager = ConnectionManager(InMemoryBroker())
+        _attach(manager, 1, team_id=1)
+        manager.subscribe_to_team(1, 2)
+        _attach(manager, 2, team_id=2)
+
+        manager.disconnect(1)
+
+        assert manager.team_subscriptions == {2: {2}}
+        assert manager.user_subscriptions == {2: {2}}
+
+    def test_unsubscribe_prunes_empty_entries(self):
+        manager = ConnectionManager(InMemoryBroker())
+        _attach(manager, 1, team_id=1)
+
+        manager.unsubscribe_from_team(1, 1)
+        manager.unsubscribe_from_team(1, 99)
+
+        assert manager.team_subscriptions == {}
+        assert manager.user_subscriptions == {}
+        assert 1 in manager.active_connections
+
+
+class TestMultipleConnections:
+    @pytest.mark.asyncio
+    async def test_fan_out_reaches_every_device(self):
+        manager = ConnectionManager(InMemoryBroker())
+        laptop = _attach(manager, 1, team_id=1)
+        phone = _attach(manager, 1)
+
+        await manager.broadcast_to_team({"type": "news"}, 1)
+        await manager.send_personal_message({"type": "hi"}, 1)
+
+        assert manager.connection_count == 2
+        assert laptop.sent == phone.sent == [{"type": "news"}, {"type": "hi"}]
+
+    def test_closing_one_device_keeps_the_others(self):
+        manager = ConnectionManager(InMemoryBroker())
+        laptop = _attach(manager, 1, team_id=1)
+        phone = _attach(manager, 1)
+
+        manager.disconnect(1, laptop.connection_id)
+        assert list(manager.active_connections[1]) == [phone.connection_id]
+        assert manager.team_subscriptions == {1: {1}}
+
+        manager.disconnect(1, phone.connection_id)
+        assert manager.active_connections == {}
+        assert manager.team_subscriptions == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_device_dropped_alone(self):
+        manager = ConnectionManager(InMemoryBroker())
+        _attach(manager, 1, team_id=1, fail=True)
+        phone = _attach(manager, 1)
+
+        await manager.broadcast_to_team({"type": "news"}, 1)
+
+        assert manager.connection_count == 1
+        assert phone.sent == [{"type": "news"}]
+
+
+class TestConcurrentFanOut:
+    @pytest.mark.asyncio
+    async def test_sends_concurrently(self):
+        manager = ConnectionManager(InMemoryBroker(), send_timeout=1.0)
+        sockets = [_attach(manager, 100 + i, team_id=1, delay=0.05) for i in range(50)]
+
+        started = time.monotonic()
+        await manager.broadcast_to_team({"type": "news"}, 1)
+
+        # 50 sequential sends would take ~2.5s
+        assert time.monotonic() - started < 1.0
+        assert all(s.sent == [{"type": "news"}] for s in sockets)
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_dropped(self):
+        manager = ConnectionManager(InMemoryBroker(), send_timeout=0.05)
+        slow = _attach(manager, 6, team_id=1, delay=1.0)
+        fast = _attach(manager, 7, team_id=1)
+
+        started = time.monotonic()
+        await manager.broadcast_to_team({"type": "news"}, 1)
+        elapsed = time.monotonic() - started
+
+        # The close task is held until it finishes, then released
+        assert len(manager._close_tasks) == 1
+        await asyncio.gather(*manager._close_tasks)
+        await asyncio.sleep(0)
+        assert not manager._close_tasks
+
+        assert elapsed < 0.5
+        assert fast.sent == [{"type": "news"}]
+        assert 6 not in manager.active_connections
+        assert slow.closed
+
+
+class TestDbExecutor:
+    @pytest.mark.asyncio
+    async def test_runs_on_db_pool(self):
+        import threading
+        from app.db.executor import run_in_db_thread
+
+        name = await run_in_db_thread(lambda: threading.current_thread().name)
+        assert name.startswith("db-executor")
+
+
+class TestWebSocketEndpoint:
+    @pytest.fixture(autouse=True)
+    def _ws_sessions(self, monkeypatch):
+        monkeypatch.setattr("app.websocket.auth.SessionLocal", TestingSessionLocal)
+
+    def test_connect_subscribe_and_ping(self, client, coach_user, coach_headers, team):
+        token = coach_headers["Authorization"].split()[1]
+        with client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"token": token}))
+            connected = ws.receive_json()
+            assert connected["type"] == "connected"
+            assert connected["user_id"] == coach_user.email
+            assert connected["connection_id"]
+
+            ws.send_text(json.dumps({"action": "subscribe_team", "team_id": team.id}))
+            assert ws.receive_json() == {"type": "subscribed", "team_id": team.id}
+
+            ws.send_text(json.dumps({"action": "ping"}))
+            assert ws.receive_json() == {"type": "pong"}
+
+    def test_unknown_user_rejected(self, client, db):
+        ghost = _make_user(db, email="ghost@test.com", role=UserRole.COACH)
+        headers = _auth_header(ghost)
+        db.delete(ghost)
+        db.commit()
+        with client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"token": headers["Authorization"].split()[1]}))
+            assert ws.receive_json() == {"type": "error", "message": "Invalid token"}
+
+    def test_subscribe_answered_from_cached_scope(self, client, coach_headers, team, statement_log):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"token": coach_headers["Authorization"].split()[1]}))
+            ws.receive_json()
+            with statement_log as statements:
+                ws.send_text(json.dumps({"action": "subscribe_team", "team_id": team.id}))
+                assert ws.receive_json()["type"] == "subscribed"
+                ws.send_text(json.dumps({"action": "subscribe_team", "team_id": team.id + 1}))
+                assert ws.receive_json()["type"] == "error"
+            assert statements == []
+
+    def test_membership_change_refreshes_scope(self, client, db, coach_headers, team):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"token": coach_headers["Authorization"].split()[1]}))
+            ws.receive_json()
+
+            team.coach_id = None
+            db.commit()
+
+            ws.send_text(json.dumps({"action": "subscribe_team", "team_id": team.id}))
+            assert ws.receive_json() == {
+                "type": "error",
+                "message": "Access denied to this team",
+                "team_id": team.id,
+            }
+
+    def test_revoked_membership_drops_subscription(self, client, db, coach_user, coach_headers, team):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"token": coach_headers["Authorization"].split()[1]}))
+            ws.receive_json()
+            ws.send_text(json.dumps({"action": "subscribe_team", "team_id": team.id}))
+            assert ws.receive_json()["type"] == "subscribed"
+
+            team.coach_id = None
+            db.commit()
+
+            assert ws.receive_json() == {
+                "type": "unsubscribed", "team_id": team.id, "reason": "access_revoked",
+            }
+            assert coach_user.id not in app_manager.team_subscriptions.get(team.id, set())
+
+    def test_demoted_admin_drops_subscription(self, client, db, admin_user, admin_headers, team):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"token": admin_headers["Authorization"].split()[1]}))
+            ws.receive_json()
+            ws.send_text(json.dumps({"action": "subscribe_team", "team_id": team.id}))
+            assert ws.receive_json()["type"] == "subscribed"
+
+            admin_user.role = UserRole.PARENT
+            db.commit()
+
+            assert ws.receive_json()["type"] == "unsubscribed"
+            ws.send_text(json.dumps({"action": "subscribe_team", "team_id": team.id}))
+            assert ws.receive_json()["type"] == "error"
+
+    def test_deactivated_user_is_disconnected(self, client, db, coach_user, coach_headers, team):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"token": coach_headers["Authorization"].split()[1]}))
+            ws.receive_json()
+            ws.send_text(json.dumps({"action": "subscribe_team", "team_id": team.id}))
+            ws.receive_json()
+
+            coach_user.is_active = False
+            db.commit()
+
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                ws.receive_json()
+            assert exc_info.value.code == 1008
+        assert coach_user.id not in app_manager.active_connections
+        assert coach_user.id not in app_manager.team_subscriptions.get(team.id, set())
+
+
+class TestDomainEvents:
+    @pytest.fixture()
+    def team_socket(self, client, team):
+        socket = _attach(app_manager, 999, team_id=team.id)
+        yield socket
+        app_manager.disconnect(999)
+
+    def _wait_for(self, socket, count=1):
+        deadline = time.monotonic() + 2
+        while len(socket.sent) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return socket.sent
+
+    def test_game_result_pushed_to_team(self, client, coach_headers, game, team_socket):
+        resp = client.patch(
+            f"/api/v1/games/{game.id}/result",
+            headers=coach_headers,
+            json={"home_score": 25, "away_score": 20, "status": "completed"},
+        )
+        assert resp.status_code == 200
+        (change,) = self._wait_for(team_socket)
+        assert change["type"] == "change"
+        assert (change["entity"], change["id"], change["team_id"]) == ("game", game.id, game.team_id)
+        assert isinstance(change["version"], int)
+
+    def test_bulk_attendance_pushed_to_team(self, client, coach_headers, game, player_profile, team_socket):
+        resp = client.post(
+            f"/api/v1/attendance/bulk-update?game_id={game.id}",
+            headers=coach_headers,
+            json={"player_ids": [player_profile.id], "status": "present"},
+        )
+        assert resp.status_code == 200
+        (change,) = self._wait_for(team_socket)
+        assert (change["entity"], change["id"]) == ("game_attendance", game.id)
+
+    def test_club_wide_event_pushed_to_everyone(self, client, admin_headers, team_socket):
+        resp = client.post(
+            "/api/v1/events/",
+            headers=admin_headers,
+            json={
+                "title": "Club Party",
+                "event_type": "meeting",
+                "visibility": "club_wide",
+                "start_time": "2030-06-01T18:00:00",
+                "end_time": "2030-06-01T22:00:00",
+            },
+        )
+        assert resp.status_code == 201
+        (change,) = self._wait_for(team_socket)
+        assert (change["entity"], change["id"], change["team_id"]) == ("event", resp.json()["id"], None)
+
+    def test_failed_write_publishes_nothing(self, client, player_headers, game, team_socket):
+        resp = client.patch(
+            f"/api/v1/games/{game.id}/result",
+            headers=player_headers,
+            json={"home_score": 1, "away_score": 0, "status": "completed"},
+        )
+        assert resp.status_code == 403
+        time.sleep(0.05)
+        assert team_socket.sent == []